@@ -1,44 +1,232 @@
-from openai import OpenAI
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+import asyncio
 import json
+from llm_client import CircuitOpenError, ResilientLLM
+from metrics import METRICS, timed
+from prompt_compactor import DEFAULT_MAX_TOKENS, compact_resume
+
+DEFAULT_MODEL = "gpt-3.5-turbo"  # Use gpt-3.5-turbo for lower cost
+DEFAULT_TIMEOUT = 30.0  # Seconds per request attempt
+
+LLM_REQUESTS = METRICS.counter('resume_analyzer_llm_requests_total', 'Chat-completion calls by outcome, after retries')
+LLM_TOKENS = METRICS.counter('resume_analyzer_llm_tokens_total', 'Tokens reported by the API, by type')
+
+
+def record_llm_call(response=None, error: Optional[Exception] = None):
+    """Count an LLM call's outcome and, on success, the tokens it used"""
+    if error is not None:
+        LLM_REQUESTS.inc(outcome='circuit_open' if isinstance(error, CircuitOpenError) else 'failure')
+        return
+    LLM_REQUESTS.inc(outcome='success')
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        LLM_TOKENS.inc(usage.prompt_tokens or 0, type='prompt')
+        LLM_TOKENS.inc(usage.completion_tokens or 0, type='completion')
+
+class AnalysisStreamParser:
+    """Incremental parser for the analysis response, fed as text arrives"""
+    
+    def __init__(self):
+        self.result = {
+            'summary': '',
+            'strengths': [],
+            'weaknesses': [],
+            'recommendations': [],
+            'match_score': 0
+        }
+        self.current_section = None
+        self._pending = ''
+    
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """Consume a chunk and return (section, text) for every line it completed"""
+        self._pending += chunk
+        *lines, self._pending = self._pending.split('\n')
+        updates = []
+        for line in lines:
+            update = self._parse_line(line)
+            if update:
+                updates.append(update)
+        return updates
+    
+    def finish(self) -> Dict:
+        """Parse any unterminated last line and return the structured result"""
+        if self._pending:
+            self._parse_line(self._pending)
+            self._pending = ''
+        result = dict(self.result)
+        result['summary'] = result['summary'].strip()
+        return result
+    
+    def _parse_line(self, line: str) -> Optional[Tuple[str, str]]:
+        """Apply one line to the result; returns (section, text) if it added content"""
+        line = line.strip()
+        if not line:
+            return None
+        
+        # Detect sections
+        lower_line = line.lower()
+        if 'summary' in lower_line or 'overview' in lower_line:
+            self.current_section = 'summary'
+        elif 'strength' in lower_line or 'positive' in lower_line:
+            self.current_section = 'strengths'
+        elif 'weakness' in lower_line or 'improvement' in lower_line or 'area' in lower_line:
+            self.current_section = 'weaknesses'
+        elif 'recommendation' in lower_line or 'suggestion' in lower_line:
+            self.current_section = 'recommendations'
+        elif 'match' in lower_line and 'score' in lower_line:
+            self.current_section = 'match_score'
+        else:
+            # Add content to current section
+            section = self.current_section
+            if section == 'summary' and len(self.result['summary']) < 500:
+                self.result['summary'] += line + ' '
+                return section, line
+            elif section in ('strengths', 'weaknesses', 'recommendations') and (line.startswith('-') or line.startswith('•') or line[0].isdigit()):
+                item = line.lstrip('-•0123456789. ')
+                self.result[section].append(item)
+                return section, item
+        return None
+
 
 class AIAnalyzer:
     """AI-powered resume analyzer using OpenAI"""
     
-    def __init__(self, api_key: str):
-        """Initialize OpenAI client"""
-        self.client = OpenAI(api_key=api_key)
-        self.model = "gpt-3.5-turbo"  # Use gpt-3.5-turbo for lower cost
+    def __init__(self, api_key: str, base_url: Optional[str] = None, max_resume_tokens: Optional[int] = DEFAULT_MAX_TOKENS,
+                 llm: Optional[ResilientLLM] = None, timeout: float = DEFAULT_TIMEOUT):
+        """Initialize OpenAI client; resumes are compacted to max_resume_tokens (None: no budget)
+        
+        Every request goes through llm, which owns retries, the circuit breaker
+        and the in-flight limit, so the client's own retries are disabled.
+        The OpenAI SDK is imported here, not at module load, to keep `import app` fast.
+        """
+        from openai import OpenAI
+        self.client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.model = DEFAULT_MODEL
+        self.max_resume_tokens = max_resume_tokens
+        self.llm = llm or ResilientLLM()
+    
+    def compact_resume(self, resume_text: str) -> Tuple[str, Dict]:
+        """Resume text as sent in prompts, and the tokens saved by compacting it"""
+        return compact_resume(resume_text, self.max_resume_tokens)
+    
+    @timed('llm')
+    def _complete(self, request: Dict):
+        """Chat completion through the resilience layer"""
+        try:
+            response = self.llm.call(lambda: self.client.chat.completions.create(**request))
+        except Exception as e:
+            record_llm_call(error=e)
+            raise
+        record_llm_call(response)
+        return response
     
     def analyze_resume(self, resume_text: str, job_description: str = "") -> Dict:
         """Comprehensive resume analysis"""
-        prompt = self._create_analysis_prompt(resume_text, job_description)
-        
+        resume_text, compaction = self.compact_resume(resume_text)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert HR professional and career coach specializing in resume analysis."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1500
-            )
-            
+            response = self._complete(self._analysis_request(resume_text, job_description))
             analysis_text = response.choices[0].message.content
-            return self._parse_analysis_response(analysis_text)
+            result = self._parse_analysis_response(analysis_text)
+        
+        except Exception as e:
+            result = self._analysis_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    def score_resume(self, resume_text: str, job_description: str = "",
+                     compacted: Optional[Tuple[str, Dict]] = None) -> Dict:
+        """Score resume on various criteria; compacted is an earlier compact_resume() result to reuse"""
+        resume_text, compaction = compacted or self.compact_resume(resume_text)
+        try:
+            response = self._complete(self._score_request(resume_text, job_description))
+            result = self._parse_score_response(response.choices[0].message.content)
         
         except Exception as e:
-            return {
-                'error': f'AI analysis failed: {str(e)}',
-                'summary': 'Unable to complete analysis',
-                'strengths': [],
-                'weaknesses': [],
-                'recommendations': []
-            }
-    
-    def score_resume(self, resume_text: str, job_description: str = "") -> Dict:
-        """Score resume on various criteria"""
+            result = self._score_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    def get_suggestions(self, resume_text: str, job_description: str = "",
+                        compacted: Optional[Tuple[str, Dict]] = None) -> Dict:
+        """Get specific improvement suggestions; compacted is an earlier compact_resume() result to reuse"""
+        resume_text, compaction = compacted or self.compact_resume(resume_text)
+        try:
+            response = self._complete(self._suggestions_request(resume_text, job_description))
+            result = self._suggestions_result(response.choices[0].message.content)
+        
+        except Exception as e:
+            result = self._suggestions_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    def stream_analysis(self, resume_text: str, job_description: str = "") -> Iterator[Tuple[str, Dict]]:
+        """Stream the comprehensive analysis as (event, payload) pairs
+        
+        Yields ('token', {'text'}) for every generated chunk, ('section', {'section', 'text'})
+        whenever a summary line or list item is complete, and finally ('analysis', result)
+        with the same result analyze_resume would have returned.
+        """
+        resume_text, compaction = self.compact_resume(resume_text)
+        parser = AnalysisStreamParser()
+        try:
+            with timed('llm'):
+                request = self._analysis_request(resume_text, job_description)
+                stream = self.llm.stream(lambda: self.client.chat.completions.create(stream=True, **request))
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    yield 'token', {'text': delta}
+                    for section, text in parser.feed(delta):
+                        yield 'section', {'section': section, 'text': text}
+            # Flush a last line that was not terminated by a newline
+            for section, text in parser.feed('\n'):
+                yield 'section', {'section': section, 'text': text}
+            result = parser.finish()
+            record_llm_call()
+        
+        except Exception as e:
+            record_llm_call(error=e)
+            result = self._analysis_error(e)
+        result['prompt_compaction'] = compaction
+        yield 'analysis', result
+    
+    def analyze_and_score(self, resume_text: str, job_description: str = "") -> Dict:
+        """Analysis and scores from a single prompt, halving round trips for the main flow"""
+        resume_text, compaction = self.compact_resume(resume_text)
+        try:
+            response = self._complete(self._combined_request(resume_text, job_description))
+            result = self._parse_combined_response(response.choices[0].message.content)
+        
+        except Exception as e:
+            result = self._analysis_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    def _analysis_request(self, resume_text: str, job_description: str) -> Dict:
+        """Chat-completion arguments for the comprehensive analysis"""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert HR professional and career coach specializing in resume analysis."},
+                {"role": "user", "content": self._create_analysis_prompt(resume_text, job_description)}
+            ],
+            'temperature': 0.7,
+            'max_tokens': 1500
+        }
+    
+    def _analysis_error(self, e: Exception) -> Dict:
+        """Result returned when the analysis request fails"""
+        return {
+            'error': f'AI analysis failed: {str(e)}',
+            'summary': 'Unable to complete analysis',
+            'strengths': [],
+            'weaknesses': [],
+            'recommendations': []
+        }
+    
+    def _score_request(self, resume_text: str, job_description: str) -> Dict:
+        """Chat-completion arguments for scoring"""
         prompt = f"""
 Score the following resume on a scale of 0-100 for each category:
 1. Content Quality (clarity, relevance, achievements)
@@ -62,48 +250,48 @@ Provide scores in JSON format:
     "explanation": "<brief explanation>"
 }}
 """
-        
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert resume evaluator. Provide objective scores."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.5,
+            'max_tokens': 500
+        }
+    
+    def _parse_score_response(self, result: str) -> Dict:
+        """Extract the JSON scores from the scoring response"""
+        # Try to extract JSON from response
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert resume evaluator. Provide objective scores."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5,
-                max_tokens=500
-            )
-            
-            result = response.choices[0].message.content
-            # Try to extract JSON from response
-            try:
-                # Find JSON object in response
-                start_idx = result.find('{')
-                end_idx = result.rfind('}') + 1
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = result[start_idx:end_idx]
-                    return json.loads(json_str)
-            except:
-                pass
-            
-            # Fallback if JSON parsing fails
-            return {
-                'content_quality': 75,
-                'format_structure': 75,
-                'skills_match': 70,
-                'experience_level': 75,
-                'overall_score': 74,
-                'explanation': result
-            }
+            # Find JSON object in response
+            start_idx = result.find('{')
+            end_idx = result.rfind('}') + 1
+            if start_idx != -1 and end_idx > start_idx:
+                json_str = result[start_idx:end_idx]
+                return json.loads(json_str)
+        except:
+            pass
         
-        except Exception as e:
-            return {
-                'error': f'Scoring failed: {str(e)}',
-                'overall_score': 0
-            }
+        # Fallback if JSON parsing fails
+        return {
+            'content_quality': 75,
+            'format_structure': 75,
+            'skills_match': 70,
+            'experience_level': 75,
+            'overall_score': 74,
+            'explanation': result
+        }
+    
+    def _score_error(self, e: Exception) -> Dict:
+        """Result returned when the scoring request fails"""
+        return {
+            'error': f'Scoring failed: {str(e)}',
+            'overall_score': 0
+        }
     
-    def get_suggestions(self, resume_text: str, job_description: str = "") -> Dict:
-        """Get specific improvement suggestions"""
+    def _suggestions_request(self, resume_text: str, job_description: str) -> Dict:
+        """Chat-completion arguments for improvement suggestions"""
         prompt = f"""
 Analyze this resume and provide specific, actionable improvement suggestions.
 Focus on:
@@ -120,31 +308,89 @@ Resume:
 
 Provide 5-10 specific, actionable suggestions.
 """
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are a professional resume writer and career coach."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.7,
+            'max_tokens': 1000
+        }
+    
+    def _suggestions_result(self, suggestions_text: str) -> Dict:
+        """Build the suggestions result from the raw response"""
+        suggestions = self._parse_suggestions(suggestions_text)
         
+        return {
+            'suggestions': suggestions,
+            'count': len(suggestions)
+        }
+    
+    def _suggestions_error(self, e: Exception) -> Dict:
+        """Result returned when the suggestions request fails"""
+        return {
+            'error': f'Failed to generate suggestions: {str(e)}',
+            'suggestions': []
+        }
+    
+    def _combined_request(self, resume_text: str, job_description: str) -> Dict:
+        """Chat-completion arguments for analysis and scoring in one structured response"""
+        prompt = f"""
+Analyze and score the following resume.
+
+Resume:
+{resume_text}
+
+{f"Job Description: {job_description}" if job_description else ""}
+
+Respond with a single JSON object in exactly this format:
+{{
+    "summary": "<brief summary, 2-3 sentences>",
+    "strengths": ["<top 3-5 strengths>"],
+    "weaknesses": ["<top 3-5 areas for improvement>"],
+    "recommendations": ["<5-7 specific, actionable recommendations>"],
+    "match_score": <0-100 match with the job description, 0 if none provided>,
+    "scores": {{
+        "content_quality": <0-100, clarity, relevance, achievements>,
+        "format_structure": <0-100, organization, readability>,
+        "skills_match": <0-100, relevance to job market>,
+        "experience_level": <0-100, depth and breadth>,
+        "overall_score": <0-100, overall impact>,
+        "explanation": "<brief explanation of the scores>"
+    }}
+}}
+"""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert HR professional and resume evaluator. Respond only with JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.5,
+            'max_tokens': 2000
+        }
+    
+    def _parse_combined_response(self, response_text: str) -> Dict:
+        """Parse the combined JSON response; falls back to the plain-text analysis parser"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional resume writer and career coach."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
-            
-            suggestions_text = response.choices[0].message.content
-            suggestions = self._parse_suggestions(suggestions_text)
-            
-            return {
-                'suggestions': suggestions,
-                'count': len(suggestions)
-            }
+            start_idx = response_text.find('{')
+            end_idx = response_text.rfind('}') + 1
+            data = json.loads(response_text[start_idx:end_idx])
+        except ValueError:
+            result = self._parse_analysis_response(response_text)
+            result['scores'] = None
+            return result
         
-        except Exception as e:
-            return {
-                'error': f'Failed to generate suggestions: {str(e)}',
-                'suggestions': []
-            }
+        scores = data.get('scores')
+        return {
+            'summary': str(data.get('summary', '')).strip(),
+            'strengths': [str(item) for item in data.get('strengths') or []],
+            'weaknesses': [str(item) for item in data.get('weaknesses') or []],
+            'recommendations': [str(item) for item in data.get('recommendations') or []],
+            'match_score': data.get('match_score', 0),
+            'scores': scores if isinstance(scores, dict) else None
+        }
     
     def _create_analysis_prompt(self, resume_text: str, job_description: str) -> str:
         """Create prompt for comprehensive analysis"""
@@ -169,48 +415,9 @@ Be specific and actionable.
     
     def _parse_analysis_response(self, response_text: str) -> Dict:
         """Parse the analysis response into structured format"""
-        lines = response_text.split('\n')
-        
-        result = {
-            'summary': '',
-            'strengths': [],
-            'weaknesses': [],
-            'recommendations': [],
-            'match_score': 0
-        }
-        
-        current_section = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Detect sections
-            lower_line = line.lower()
-            if 'summary' in lower_line or 'overview' in lower_line:
-                current_section = 'summary'
-            elif 'strength' in lower_line or 'positive' in lower_line:
-                current_section = 'strengths'
-            elif 'weakness' in lower_line or 'improvement' in lower_line or 'area' in lower_line:
-                current_section = 'weaknesses'
-            elif 'recommendation' in lower_line or 'suggestion' in lower_line:
-                current_section = 'recommendations'
-            elif 'match' in lower_line and 'score' in lower_line:
-                current_section = 'match_score'
-            else:
-                # Add content to current section
-                if current_section == 'summary' and len(result['summary']) < 500:
-                    result['summary'] += line + ' '
-                elif current_section == 'strengths' and (line.startswith('-') or line.startswith('•') or line[0].isdigit()):
-                    result['strengths'].append(line.lstrip('-•0123456789. '))
-                elif current_section == 'weaknesses' and (line.startswith('-') or line.startswith('•') or line[0].isdigit()):
-                    result['weaknesses'].append(line.lstrip('-•0123456789. '))
-                elif current_section == 'recommendations' and (line.startswith('-') or line.startswith('•') or line[0].isdigit()):
-                    result['recommendations'].append(line.lstrip('-•0123456789. '))
-        
-        result['summary'] = result['summary'].strip()
-        return result
+        parser = AnalysisStreamParser()
+        parser.feed(response_text)
+        return parser.finish()
     
     def _parse_suggestions(self, suggestions_text: str) -> list:
         """Parse suggestions into a list"""
@@ -225,3 +432,102 @@ Be specific and actionable.
                     suggestions.append(suggestion)
         
         return suggestions
+
+
+class AsyncAIAnalyzer(AIAnalyzer):
+    """Asyncio variant of AIAnalyzer sharing one pooled HTTP client across concurrent requests"""
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None, max_connections: int = 20,
+                 max_resume_tokens: Optional[int] = DEFAULT_MAX_TOKENS, llm: Optional[ResilientLLM] = None,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """Initialize the async OpenAI client on a connection pool of max_connections"""
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        self.http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client,
+                                  timeout=timeout, max_retries=0)
+        self.model = DEFAULT_MODEL
+        self.max_resume_tokens = max_resume_tokens
+        self.llm = llm or ResilientLLM(max_concurrency=max_connections)
+    
+    async def _complete(self, request: Dict):
+        """Chat completion through the resilience layer"""
+        with timed('llm'):
+            try:
+                response = await self.llm.acall(lambda: self.client.chat.completions.create(**request))
+            except Exception as e:
+                record_llm_call(error=e)
+                raise
+        record_llm_call(response)
+        return response
+    
+    async def analyze_resume(self, resume_text: str, job_description: str = "") -> Dict:
+        """Comprehensive resume analysis"""
+        resume_text, compaction = self.compact_resume(resume_text)
+        try:
+            response = await self._complete(self._analysis_request(resume_text, job_description))
+            result = self._parse_analysis_response(response.choices[0].message.content)
+        except Exception as e:
+            result = self._analysis_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    async def score_resume(self, resume_text: str, job_description: str = "",
+                           compacted: Optional[Tuple[str, Dict]] = None) -> Dict:
+        """Score resume on various criteria; compacted is an earlier compact_resume() result to reuse"""
+        resume_text, compaction = compacted or self.compact_resume(resume_text)
+        try:
+            response = await self._complete(self._score_request(resume_text, job_description))
+            result = self._parse_score_response(response.choices[0].message.content)
+        except Exception as e:
+            result = self._score_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    async def get_suggestions(self, resume_text: str, job_description: str = "",
+                              compacted: Optional[Tuple[str, Dict]] = None) -> Dict:
+        """Get specific improvement suggestions; compacted is an earlier compact_resume() result to reuse"""
+        resume_text, compaction = compacted or self.compact_resume(resume_text)
+        try:
+            response = await self._complete(self._suggestions_request(resume_text, job_description))
+            result = self._suggestions_result(response.choices[0].message.content)
+        except Exception as e:
+            result = self._suggestions_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    async def analyze_and_score(self, resume_text: str, job_description: str = "") -> Dict:
+        """Analysis and scores from a single prompt"""
+        resume_text, compaction = self.compact_resume(resume_text)
+        try:
+            response = await self._complete(self._combined_request(resume_text, job_description))
+            result = self._parse_combined_response(response.choices[0].message.content)
+        except Exception as e:
+            result = self._analysis_error(e)
+        result['prompt_compaction'] = compaction
+        return result
+    
+    async def analyze_all(self, resume_text: str, job_description: str = "") -> Dict:
+        """Run analysis, scoring and suggestions for one resume concurrently"""
+        analysis, scores, suggestions = await asyncio.gather(
+            self.analyze_resume(resume_text, job_description),
+            self.score_resume(resume_text, job_description),
+            self.get_suggestions(resume_text, job_description)
+        )
+        return {
+            'analysis': analysis,
+            'scores': scores,
+            'suggestions': suggestions
+        }
+    
+    async def close(self):
+        """Close the pooled HTTP connections"""
+        await self.client.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -1,420 +1,728 @@
 import os
-from flask import Flask, request, jsonify
+import hmac
+import json
+import logging
+import threading
+import time
+from itertools import islice
+from flask import Blueprint, Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 from resume_parser import ResumeParser
 from ai_analyzer import AIAnalyzer
+from llm_client import CircuitBreaker, ResilientLLM
+from result_cache import ResultCache, make_cache_key
+from parsed_resume import ParsedResume
+from batch_analyzer import BatchAnalyzer, iter_uploads, measure_uploads
+from fallback_analysis import generate_fallback_analysis
+from jd_matcher import BM25Index
+from resume_index import ResumeIndex
+from job_queue import JobQueue, InMemoryJobStore, SQLiteJobStore, fail_unfinished_jobs
+from metrics import METRICS, server_timing_header, start_request_timing, timed
+from static_assets import StaticAssets
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
-
 # Configuration
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+logger = logging.getLogger(__name__)
+
+# Routes live on a blueprint so create_app can build the Flask app on demand
+api = Blueprint('api', __name__)
+
+# Services are created on first use by the get_* functions below, so importing
+# this module loads neither the OpenAI SDK nor the PDF/DOCX libraries
+# (benchmarks/bench_import_time.py keeps it that way)
+_services_lock = threading.RLock()
+static_assets = None
+resume_parser = None
+llm = None
+ai_analyzer = None
+result_cache = None
+resume_store = None
+RESUME_STORE_LOOKUPS = METRICS.counter('resume_analyzer_resume_store_lookups_total', 'Resume store lookups by outcome')
+job_matcher = None
+resume_index = None
+SEARCH_MAX_RESULTS = 100
+
+# Search results describe other people's resumes, so uploads are only indexed
+# when SEARCH_API_KEY is set, and /api/search requires that key
+SEARCH_API_KEY = os.getenv('SEARCH_API_KEY') or None
+INDEX_ERRORS = METRICS.counter('resume_analyzer_index_errors_total', 'Resumes that could not be added to the search index')
+
+# Batch analysis: parsing in worker processes, bounded concurrent LLM calls
+BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', 500))
+BATCH_MAX_UNZIPPED_MB = int(os.getenv('BATCH_MAX_UNZIPPED_MB', 200))
+batch_analyzer = None
+
+# Background analysis jobs; JOB_DB keeps job status and results in SQLite
+job_queue = None
+
+def get_static_assets():
+    """Read the frontend files once; they are served with ETags and precompressed variants"""
+    global static_assets
+    with _services_lock:
+        if static_assets is None:
+            static_assets = StaticAssets(STATIC_DIR)
+    return static_assets
+
+def get_resume_parser():
+    """Create the resume parser on first use; long PDFs are extracted page-parallel in PDF_PAGE_WORKERS processes"""
+    global resume_parser
+    with _services_lock:
+        if resume_parser is None:
+            resume_parser = ResumeParser(
+                page_workers=int(os.getenv('PDF_PAGE_WORKERS') or min(4, os.cpu_count() or 1)),
+                max_pdf_pages=int(os.getenv('PDF_MAX_PAGES', 50)),
+                page_timeout=float(os.getenv('PDF_PAGE_TIMEOUT', 10))
+            )
+    return resume_parser
+
+def get_llm():
+    """The limiter, retry policy and circuit breaker shared by all AI calls; while the
+    circuit is open, analyses go straight to the rule-based fallback"""
+    global llm
+    with _services_lock:
+        if llm is None:
+            llm = ResilientLLM(
+                max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', 8)),
+                max_retries=int(os.getenv('LLM_MAX_RETRIES', 3)),
+                breaker=CircuitBreaker(
+                    failure_threshold=int(os.getenv('LLM_BREAKER_THRESHOLD', 5)),
+                    reset_timeout=float(os.getenv('LLM_BREAKER_RESET', 30))
+                )
+            )
+    return llm
+
+def get_ai_analyzer():
+    """Create the AI analyzer (and import the OpenAI SDK) on first use
+    
+    Resumes are compacted to PROMPT_MAX_TOKENS before every prompt (0: whitespace and duplicate cleanup only).
+    """
+    global ai_analyzer
+    with _services_lock:
+        if ai_analyzer is None:
+            ai_analyzer = AIAnalyzer(
+                api_key=os.getenv('OPENAI_API_KEY'),
+                max_resume_tokens=int(os.getenv('PROMPT_MAX_TOKENS', 3000)) or None,
+                llm=get_llm(),
+                timeout=float(os.getenv('LLM_TIMEOUT', 30))
+            )
+    return ai_analyzer
+
+def get_result_cache():
+    """Results keyed by content hash; RESULT_CACHE_DB enables the on-disk tier, capped at RESULT_CACHE_DB_SIZE rows"""
+    global result_cache
+    with _services_lock:
+        if result_cache is None:
+            result_cache = ResultCache(
+                max_entries=int(os.getenv('RESULT_CACHE_SIZE', 256)),
+                ttl_seconds=float(os.getenv('RESULT_CACHE_TTL', 3600)),
+                db_path=os.getenv('RESULT_CACHE_DB') or None,
+                max_disk_entries=int(os.getenv('RESULT_CACHE_DB_SIZE', 10000))
+            )
+    return result_cache
+
+def get_resume_store():
+    """Text of analyzed resumes, also compacted for prompts, by resume_id, so /api/score and
+    /api/suggestions need neither the text again nor to compact it; RESUME_STORE_DB shares it
+    across workers and restarts"""
+    global resume_store
+    with _services_lock:
+        if resume_store is None:
+            resume_store = ResultCache(
+                max_entries=int(os.getenv('RESUME_STORE_SIZE', 1024)),
+                ttl_seconds=float(os.getenv('RESUME_STORE_TTL', 86400)),
+                db_path=os.getenv('RESUME_STORE_DB') or None,
+                lookups=RESUME_STORE_LOOKUPS,
+                max_disk_entries=int(os.getenv('RESUME_STORE_DB_SIZE', 10000))
+            )
+    return resume_store
+
+def get_job_matcher():
+    """Every analyzed resume joins the local BM25 index behind job_match scores"""
+    global job_matcher
+    with _services_lock:
+        if job_matcher is None:
+            job_matcher = BM25Index(max_documents=int(os.getenv('MATCH_INDEX_SIZE', 10000)))
+    return job_matcher
+
+def get_resume_index():
+    """Parsed resumes searchable through /api/search; RESUME_INDEX_DB persists them"""
+    global resume_index
+    with _services_lock:
+        if resume_index is None:
+            resume_index = ResumeIndex(os.getenv('RESUME_INDEX_DB') or ':memory:')
+    return resume_index
+
+def get_job_queue():
+    """Create the job queue and its worker threads on first use"""
+    global job_queue
+    with _services_lock:
+        if job_queue is None:
+            job_db = os.getenv('JOB_DB')
+            job_queue = JobQueue(
+                run_analysis_job,
+                store=SQLiteJobStore(job_db) if job_db else InMemoryJobStore(),
+                workers=int(os.getenv('JOB_WORKERS', 4))
+            )
+    return job_queue
 
-# Initialize services
-resume_parser = ResumeParser()
-ai_analyzer = AIAnalyzer(api_key=os.getenv('OPENAI_API_KEY'))
+def get_batch_analyzer():
+    """Create the batch analyzer (and its worker processes) on first use"""
+    global batch_analyzer
+    with _services_lock:
+        if batch_analyzer is None:
+            parse_workers = os.getenv('BATCH_PARSE_WORKERS')
+            batch_analyzer = BatchAnalyzer(
+                get_ai_analyzer(),
+                generate_fallback_analysis,
+                parse_workers=int(parse_workers) if parse_workers else None,
+                llm_concurrency=int(os.getenv('BATCH_LLM_CONCURRENCY', 4)),
+                cache=get_result_cache(),
+                on_parsed=index_parsed_resume
+            )
+    return batch_analyzer
+
+def create_app():
+    """Build the Flask app; the services behind its routes are created on first use"""
+    # Static files are served from memory by static_assets, not Flask's static route
+    app = Flask(__name__, static_folder=None)
+    CORS(app)
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    app.register_blueprint(api)
+    return app
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def generate_fallback_analysis(resume_data, resume_text):
-    """Generate comprehensive deep analysis when AI is unavailable"""
-    strengths = []
-    weaknesses = []
-    recommendations = []
-    
-    text_lower = resume_text.lower()
-    words = resume_text.split()
-    word_count = len(words)
-    
-    # ============ CONTACT INFORMATION ANALYSIS ============
-    if resume_data.get('email'):
-        email = resume_data['email']
-        if any(unprofessional in email.lower() for unprofessional in ['sexy', 'cute', 'cool', 'baby', '123', '69', '420']):
-            weaknesses.append("Email address may appear unprofessional")
-            recommendations.append("Consider using a professional email format: firstname.lastname@domain.com")
-        else:
-            strengths.append("Professional email address is clearly visible for recruiter contact")
-    else:
-        weaknesses.append("Email address is missing or not detectable - critical contact information")
-        recommendations.append("Add a professional email address at the top: firstname.lastname@gmail.com")
-    
-    if resume_data.get('phone'):
-        strengths.append("Phone number provided for direct communication")
-    else:
-        weaknesses.append("Phone number not found - missing important contact method")
-        recommendations.append("Include a phone number with area code for easy callback")
-    
-    # ============ SKILLS ANALYSIS (DEEP) ============
-    skills = resume_data.get('skills', [])
-    skills_count = len(skills)
-    
-    # Categorize skills
-    tech_skills = [s for s in skills if any(tech in s.lower() for tech in ['python', 'java', 'javascript', 'sql', 'react', 'node', 'c++', 'c#', 'aws', 'docker', 'kubernetes', 'git', 'html', 'css', 'api', 'django', 'flask', 'angular', 'vue', 'typescript', 'mongodb', 'postgresql', 'mysql', 'redis', 'kafka', 'spark', 'hadoop', 'tensorflow', 'pytorch', 'scikit', 'pandas', 'numpy'])]
-    
-    if skills_count >= 8:
-        strengths.append(f"Comprehensive skills section with {skills_count} identified skills demonstrating versatility")
-        if len(tech_skills) >= 5:
-            strengths.append(f"Strong technical skill set with {len(tech_skills)} modern technologies")
-    elif skills_count >= 5:
-        strengths.append(f"Adequate skills listed ({skills_count} skills)")
-        if len(tech_skills) < 3:
-            recommendations.append("Add more in-demand technical skills relevant to your target role (e.g., cloud platforms, modern frameworks)")
-    elif skills_count > 0:
-        weaknesses.append(f"Limited skills section with only {skills_count} skills - appears thin")
-        recommendations.append("Expand skills section to 8-12 items including technical skills, soft skills, and certifications")
-    else:
-        weaknesses.append("No skills section detected - major gap in resume")
-        recommendations.append("Create a prominent skills section listing technical proficiencies, tools, and competencies")
-    
-    # Check for soft skills
-    soft_skills_keywords = ['leadership', 'communication', 'teamwork', 'problem-solving', 'analytical', 'management', 'collaboration', 'presentation']
-    has_soft_skills = any(skill in text_lower for skill in soft_skills_keywords)
-    if not has_soft_skills:
-        recommendations.append("Include soft skills like Leadership, Communication, and Problem-Solving to show well-rounded capabilities")
-    
-    # ============ CONTENT QUALITY & LENGTH ANALYSIS ============
-    if 400 <= word_count <= 600:
-        strengths.append(f"Optimal resume length ({word_count} words) - concise yet comprehensive")
-    elif 300 <= word_count < 400:
-        weaknesses.append(f"Resume is somewhat brief ({word_count} words) - may lack sufficient detail")
-        recommendations.append("Expand bullet points with more context about responsibilities, technologies used, and impact created")
-    elif word_count < 300:
-        weaknesses.append(f"Resume is too short ({word_count} words) - appears incomplete or lacking detail")
-        recommendations.append("Add 2-3 bullet points per role describing key achievements, technologies, and quantifiable results")
-    elif 600 < word_count <= 900:
-        strengths.append("Resume has substantial content describing experience")
-        recommendations.append("Consider condensing to most impactful points to keep recruiter attention")
-    else:
-        weaknesses.append(f"Resume may be too lengthy ({word_count} words) - risk of losing reader attention")
-        recommendations.append("Streamline content to 1-2 pages, focusing on most recent and relevant experiences")
-    
-    # ============ WORK EXPERIENCE ANALYSIS (DEEP) ============
-    work_experience = resume_data.get('work_experience', [])
-    has_experience = any(keyword in text_lower for keyword in ['experience', 'employment', 'work history', 'professional experience', 'career'])
-    
-    if work_experience and len(work_experience) > 0:
-        # Analyze number of roles
-        num_roles = len(work_experience)
-        if num_roles >= 3:
-            strengths.append(f"Strong work history with {num_roles} distinct roles showing career progression")
-        elif num_roles >= 2:
-            strengths.append(f"Work experience section includes {num_roles} professional roles")
-        else:
-            strengths.append("Work experience is present and structured")
-            recommendations.append("If you have more roles, include them to show broader experience (aim for 2-4 recent positions)")
-        
-        # Analyze duration and dates
-        roles_with_dates = [exp for exp in work_experience if exp.get('date_range')]
-        if len(roles_with_dates) >= num_roles * 0.8:  # 80% have dates
-            strengths.append("Employment dates clearly specified for all roles - shows timeline and tenure")
-        elif roles_with_dates:
-            weaknesses.append("Some work experiences missing date ranges")
-            recommendations.append("Add dates (MM/YYYY - MM/YYYY or Present) to all work experiences for clarity")
-        else:
-            weaknesses.append("Work experience lacks date information - dates are critical for recruiters")
-            recommendations.append("Add employment dates in format: 'June 2022 - Present' or '01/2022 - 12/2023'")
-        
-        # Check for recent/current experience
-        total_duration = sum([exp.get('duration_years', 0) for exp in work_experience if exp.get('duration_years')])
-        if total_duration >= 5:
-            strengths.append(f"Substantial work experience totaling approximately {total_duration}+ years in the field")
-        elif total_duration >= 2:
-            strengths.append(f"Relevant work experience spanning {total_duration}+ years")
-        
-        # Analyze bullet points per role
-        avg_bullets = sum([exp.get('bullet_points', 0) for exp in work_experience]) / len(work_experience) if work_experience else 0
-        if avg_bullets >= 4:
-            strengths.append("Each role has detailed bullet points (4+) describing responsibilities and achievements")
-        elif avg_bullets >= 2:
-            recommendations.append("Expand bullet points to 4-6 per role with specific accomplishments and technologies used")
-        else:
-            weaknesses.append("Work experience entries lack sufficient detail and bullet points")
-            recommendations.append("Add 4-6 bullet points per role: responsibilities, achievements, metrics, technologies, impact")
-        
-        # Check for job title clarity
-        roles_with_clear_titles = sum([1 for exp in work_experience if any(keyword in exp.get('title_line', '').lower() for keyword in ['engineer', 'developer', 'manager', 'analyst', 'designer', 'architect', 'director', 'lead', 'senior'])])
-        if roles_with_clear_titles >= len(work_experience):
-            strengths.append("Job titles clearly stated for all positions - easy to understand your roles")
-        elif roles_with_clear_titles < len(work_experience) * 0.5:
-            weaknesses.append("Some job titles unclear or missing - makes it hard to understand your roles")
-            recommendations.append("Ensure each role has a clear job title: 'Senior Software Engineer', 'Product Manager', etc.")
-    
-    elif has_experience:
-        strengths.append("Work experience section is present in resume")
-        weaknesses.append("Work experience details are not clearly structured - difficult to parse roles and timeline")
-        recommendations.append("Format experience as: Job Title | Company Name | Dates\n• Bullet point 1\n• Bullet point 2")
-    else:
-        weaknesses.append("Experience/Work history section missing or not detectable - this is CRITICAL content")
-        recommendations.append("Add a prominent 'PROFESSIONAL EXPERIENCE' section with company names, job titles, dates, and 4-6 bullet points per role")
-        recommendations.append("Use this format: [Job Title] at [Company] | [Start Date] - [End Date]")
-    
-    # ============ OTHER SECTIONS ANALYSIS ============
-    has_education = any(keyword in text_lower for keyword in ['education', 'degree', 'university', 'college', 'bachelor', 'master', 'phd', 'diploma'])
-    has_projects = any(keyword in text_lower for keyword in ['project', 'portfolio', 'built', 'developed', 'created'])
-    has_certifications = any(keyword in text_lower for keyword in ['certification', 'certified', 'certificate', 'credential'])
-    
-    if has_education:
-        education_entries = resume_data.get('education', [])
-        if len(education_entries) >= 1:
-            strengths.append(f"Educational background clearly presented with degree information")
-        else:
-            strengths.append("Education section is present in resume")
-    else:
-        weaknesses.append("Education section not found - missing important qualification information")
-        recommendations.append("Include EDUCATION section: Degree | Institution | Graduation Year | GPA (if 3.5+)")
+def validate_resume_upload():
+    """Return an error response if the request has no usable resume file, else None"""
+    # Check if file is present
+    if 'resume' not in request.files:
+        return jsonify({'error': 'No resume file provided'}), 400
     
-    if has_projects:
-        project_count = text_lower.count('project')
-        if project_count >= 3:
-            strengths.append("Multiple projects showcased - demonstrates hands-on experience and initiative")
-        else:
-            strengths.append("Projects or portfolio work mentioned - demonstrates practical application")
-    else:
-        if 'engineer' in text_lower or 'developer' in text_lower or 'designer' in text_lower:
-            recommendations.append("Add PROJECTS section with 2-4 projects: brief description, technologies used, outcomes/impact")
-    
-    if has_certifications:
-        strengths.append("Professional certifications included - adds credibility and shows continuous learning")
-    else:
-        recommendations.append("Consider adding CERTIFICATIONS section (AWS, Azure, PMP, Scrum, Google Analytics, etc.)")
-    
-    # ============ ACHIEVEMENT & IMPACT ANALYSIS ============
-    action_verbs = ['achieved', 'improved', 'increased', 'reduced', 'developed', 'implemented', 'designed', 'led', 'managed', 'delivered', 'created', 'optimized', 'streamlined', 'launched', 'spearheaded', 'drove', 'executed', 'established', 'built', 'engineered']
-    action_verb_count = sum(1 for verb in action_verbs if verb in text_lower)
+    file = request.files['resume']
     
-    if action_verb_count >= 5:
-        strengths.append(f"Strong use of action verbs ({action_verb_count} found) - demonstrates proactive contributions")
-    elif action_verb_count >= 3:
-        strengths.append("Good use of action-oriented language")
-    else:
-        weaknesses.append("Limited use of strong action verbs - resume may appear passive")
-        recommendations.append("Start bullet points with power verbs: Developed, Implemented, Achieved, Led, Optimized, Delivered")
+    # Check if file is selected
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
     
-    # Check for quantifiable metrics
-    percentage_mentions = resume_text.count('%')
-    number_mentions = sum(1 for char in resume_text if char.isdigit())
+    # Check file type
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type. Only PDF and DOCX files are allowed'}), 400
     
-    if percentage_mentions >= 2 or number_mentions >= 10:
-        strengths.append("Quantifiable metrics and data points included - demonstrates measurable impact")
+    return None
+
+def analyze_upload(file_bytes, filename, job_description='', include_scores=False, progress=None, full_text=True):
+    """Extract, parse and analyze an uploaded resume; the pipeline behind /api/analyze and /api/jobs
+    
+    progress, if given, is called as progress(stage, fraction) between stages.
+    full_text=False leaves the resume text out of parsed_data (see response_parsed_data).
+    """
+    progress = progress or (lambda stage, fraction: None)
+    
+    # Same file, job description and model: reuse the previous result
+    cache_key = make_cache_key(file_bytes, job_description, get_ai_analyzer().model,
+                               kind='analysis+scores' if include_scores else 'analysis')
+    cached = get_result_cache().get(cache_key)
+    if cached is not None:
+        parsed = ParsedResume.from_bytes(cached['parsed_data'])
+        result = {
+            'resume_id': store_resume(cached['resume_text']),
+            'parsed_data': response_parsed_data(parsed, cached['resume_text'], full_text),
+            'ai_analysis': cached['ai_analysis'],
+            'filename': filename
+        }
+        if include_scores:
+            result['scores'] = cached.get('scores')
+        if job_description:
+            result['job_match'] = local_job_match(cached['resume_text'], job_description)
+        return result
+    
+    # Parse resume straight from the uploaded bytes, nothing is written to disk
+    progress('extracting', 0.1)
+    resume_text = get_resume_parser().extract_text_from_stream(file_bytes, filename)
+    progress('parsing', 0.3)
+    parsed = get_resume_parser().parse(resume_text)
+    resume_data = parsed.to_dict()
+    index_resume(resume_text, filename, resume_data)
+    
+    # Analyze with AI
+    progress('analyzing', 0.4)
+    scores = None
+    if include_scores:
+        analysis = get_ai_analyzer().analyze_and_score(resume_text, job_description)
+        scores = analysis.pop('scores', None)
     else:
-        weaknesses.append("Lacks quantifiable achievements and metrics")
-        recommendations.append("Add numbers and metrics: 'Increased efficiency by 40%', 'Managed team of 8', 'Reduced costs by $50K'")
-    
-    # ============ KEYWORD OPTIMIZATION ANALYSIS ============
-    industry_keywords = {
-        'tech': ['agile', 'scrum', 'ci/cd', 'api', 'microservices', 'cloud', 'devops', 'full-stack', 'backend', 'frontend'],
-        'business': ['roi', 'kpi', 'strategy', 'stakeholder', 'revenue', 'growth', 'market', 'analysis'],
-        'management': ['leadership', 'team', 'budget', 'project', 'cross-functional', 'strategic', 'planning']
+        analysis = get_ai_analyzer().analyze_resume(resume_text, job_description)
+    ai_failed = 'error' in analysis
+    
+    # If AI analysis failed or returned empty data, provide fallback analysis
+    if (not analysis.get('strengths') and not analysis.get('weaknesses') 
+        and not analysis.get('recommendations')):
+        progress('fallback', 0.9)
+        analysis = generate_fallback_analysis(resume_data, resume_text)
+    
+    # Don't pin a fallback produced by an upstream failure for the whole TTL;
+    # the text is stored once, not again inside the parse result
+    if not ai_failed:
+        get_result_cache().set(cache_key, {
+            'resume_text': resume_text,
+            'parsed_data': parsed.to_bytes(full_text=False),
+            'ai_analysis': analysis,
+            'scores': scores
+        })
+    
+    # Combine results
+    result = {
+        'resume_id': store_resume(resume_text),
+        'parsed_data': response_parsed_data(parsed, resume_text, full_text),
+        'ai_analysis': analysis,
+        'filename': filename
     }
+    if include_scores:
+        # None when the model's scores could not be parsed; clients fall back to /api/score
+        result['scores'] = scores
+    if job_description:
+        result['job_match'] = local_job_match(resume_text, job_description)
     
-    keyword_matches = 0
-    for category, keywords in industry_keywords.items():
-        keyword_matches += sum(1 for keyword in keywords if keyword in text_lower)
-    
-    if keyword_matches >= 5:
-        strengths.append("Good use of industry-relevant keywords - ATS-friendly and recruiter-optimized")
-    elif keyword_matches >= 3:
-        recommendations.append("Include more industry keywords to improve ATS (Applicant Tracking System) compatibility")
-    else:
-        weaknesses.append("Few industry-specific keywords detected - may not pass ATS screening")
-        recommendations.append("Research job descriptions and incorporate relevant keywords: cloud, agile, stakeholder, API, leadership")
-    
-    # ============ FORMAT & STRUCTURE ANALYSIS ============
-    has_bullets = any(char in resume_text for char in ['•', '●', '◦', '-', '*'])
-    if has_bullets:
-        strengths.append("Bullet points used effectively for readability and scanning")
-    else:
-        weaknesses.append("No bullet points detected - content may be hard to scan")
-        recommendations.append("Use bullet points to break down responsibilities and achievements for better readability")
-    
-    # Check for dates
-    date_patterns = ['2020', '2021', '2022', '2023', '2024', '2025', '2026', 'present', 'current']
-    has_dates = any(pattern in text_lower for pattern in date_patterns)
-    if has_dates:
-        strengths.append("Timeline and dates included - shows career progression")
-    else:
-        recommendations.append("Add dates (MM/YYYY format) to all experiences and education entries")
-    
-    # ============ PROFESSIONAL POLISH ANALYSIS ============
-    unprofessional_words = ['i', 'my', 'me', 'we', 'our', 'stuff', 'things', 'basically', 'kinda', 'sorta']
-    first_person_count = sum(1 for word in unprofessional_words if f' {word} ' in text_lower)
-    
-    if first_person_count > 3:
-        weaknesses.append("Excessive use of first-person pronouns or casual language")
-        recommendations.append("Remove 'I', 'my', 'we' - use direct statements: 'Developed solutions' not 'I developed solutions'")
-    elif first_person_count == 0:
-        strengths.append("Professional third-person writing style maintained throughout")
-    
-    # Check resume length in pages (approximate)
-    estimated_pages = word_count / 400
-    if estimated_pages > 2.5:
-        weaknesses.append(f"Resume likely exceeds 2 pages (approximately {estimated_pages:.1f} pages)")
-        recommendations.append("Trim to 1-2 pages by removing older or less relevant experiences")
-    
-    # ============ MISSING ELEMENTS CHECK ============
-    if 'linkedin' not in text_lower and 'github' not in text_lower:
-        recommendations.append("Add LinkedIn profile URL and GitHub/portfolio links to increase credibility and showcase work")
-    
-    if 'summary' not in text_lower and 'objective' not in text_lower:
-        recommendations.append("Consider adding a 3-4 line professional summary at the top highlighting key strengths and career goals")
-    
-    # ============ GENERATE COMPREHENSIVE SUMMARY ============
-    summary = f"Comprehensive resume analysis completed. Identified {len(strengths)} key strengths and {len(weaknesses)} areas requiring attention. "
-    
-    if skills_count > 0:
-        summary += f"Detected {skills_count} skills across various domains. "
-    
-    if action_verb_count >= 5:
-        summary += "Strong achievement-oriented language observed. "
-    
-    if keyword_matches >= 5:
-        summary += "Good keyword optimization for ATS systems. "
-    
-    if word_count < 300:
-        summary += "Resume requires substantial expansion with detailed experiences. "
-    elif word_count > 900:
-        summary += "Consider condensing content for improved impact. "
+    return result
+
+def resume_key(resume_text):
+    """ID of a resume in the local indexes, from a hash of its text"""
+    return make_cache_key(resume_text.encode('utf-8'), kind='resume')
+
+def store_resume(resume_text):
+    """Keep a resume's text and its prompt compaction for later requests by ID, unless already kept; returns its resume_id"""
+    resume_id = resume_key(resume_text)
+    if resume_id not in get_resume_store():
+        prompt_text, compaction = get_ai_analyzer().compact_resume(resume_text)
+        get_resume_store().set(resume_id, {
+            'resume_text': resume_text,
+            'prompt_text': prompt_text,
+            'prompt_compaction': compaction
+        })
+    return resume_id
+
+def request_resume(data):
+    """Resume of a JSON request body, given as resume_text or as the resume_id from /api/analyze
+    
+    Returns (text, compacted, None), where compacted is the stored compact_resume()
+    result of a resume_id (None for text), or (None, None, error response) for a
+    missing or unknown resume.
+    """
+    if data.get('resume_text'):
+        return data['resume_text'], None, None
+    if data.get('resume_id'):
+        stored = get_resume_store().get(data['resume_id'])
+        if stored is None:
+            return None, None, (jsonify({'error': 'Unknown or expired resume_id, send resume_text instead'}), 404)
+        compacted = (stored['prompt_text'], stored['prompt_compaction']) if 'prompt_text' in stored else None
+        return stored['resume_text'], compacted, None
+    return None, None, (jsonify({'error': 'Resume text or resume_id is required'}), 400)
+
+def response_parsed_data(parsed, resume_text, full_text=True):
+    """parsed_data for a response; without full_text it names the resume by text_hash (its resume_key) instead"""
+    data = parsed.to_dict(full_text=False)
+    if full_text:
+        data['full_text'] = resume_text
     else:
-        summary += "Resume length is within acceptable range. "
-    
-    summary += f"Review {len(recommendations)} specific recommendations below to enhance your resume's competitiveness and increase interview callbacks."
-    
-    # Ensure minimum content in each section
-    if not strengths:
-        strengths.append("Resume structure has been successfully parsed and core information extracted")
-    if not weaknesses:
-        weaknesses.append("Continue refining content to stay current with industry trends")
-    if not recommendations:
-        recommendations.append("Maintain resume updates quarterly with new skills, achievements, and experiences")
-    
-    return {
-        'summary': summary,
-        'strengths': strengths,
-        'weaknesses': weaknesses,
-        'recommendations': recommendations
-    }
+        data['text_hash'] = resume_key(resume_text)
+    return data
+
+def wants_full_text():
+    """?omit=full_text leaves the resume text out of parsed_data, for smaller responses"""
+    return 'full_text' not in request.args.get('omit', '').split(',')
+
+def index_resume(resume_text, filename, resume_data):
+    """Add a parsed resume to the search index if search is enabled; indexing never fails the analysis"""
+    if not SEARCH_API_KEY:
+        return
+    try:
+        get_resume_index().add(resume_key(resume_text), filename, resume_data)
+    except Exception:
+        INDEX_ERRORS.inc()
+        logger.exception('Indexing resume failed')
+
+def index_parsed_resume(parsed):
+    """Add a batch item's parse result to the search index"""
+    index_resume(parsed['resume_text'], parsed['filename'], parsed['parsed_data'])
+
+def local_job_match(resume_text, job_description):
+    """Index the resume and match it against the job description locally, without the LLM"""
+    get_job_matcher().add(resume_key(resume_text), resume_text)
+    return get_job_matcher().match(resume_text, job_description)
+
+def run_analysis_job(payload, progress):
+    """Job queue pipeline: analyze_upload over a queued upload"""
+    return analyze_upload(
+        payload['file_bytes'],
+        payload['filename'],
+        payload['job_description'],
+        include_scores=payload['include_scores'],
+        progress=progress,
+        full_text=payload.get('full_text', True)
+    )
+
+HTTP_REQUESTS = METRICS.counter('resume_analyzer_http_requests_total', 'HTTP requests by route, method and status')
+HTTP_LATENCY = METRICS.histogram('resume_analyzer_http_request_seconds', 'HTTP request latency by route')
+
+@api.before_app_request
+def start_timing():
+    """Start the request clock and collect stage timings for Server-Timing"""
+    g.request_started = time.perf_counter()
+    start_request_timing()
+
+@api.after_app_request
+def record_timing(response):
+    """Count the request, observe its latency and report per-stage timings in Server-Timing"""
+    elapsed = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    HTTP_REQUESTS.inc(route=route, method=request.method, status=str(response.status_code))
+    HTTP_LATENCY.observe(elapsed, route=route)
+    response.headers['Server-Timing'] = server_timing_header(elapsed)
+    return response
 
-@app.route('/')
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_ndjson():
+    """?format=ndjson or Accept: application/x-ndjson asks for a streamed NDJSON response"""
+    return request.args.get('format') == 'ndjson' or request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+def ndjson_response(items):
+    """Stream items as newline-delimited JSON, each line sent as soon as its item is ready"""
+    def generate():
+        for item in items:
+            yield json.dumps(item) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE, headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Keep reverse proxies from buffering the stream
+    })
+
+@api.route('/')
 def index():
     """Serve the main page"""
-    with open('static/index.html', 'r', encoding='utf-8') as f:
-        return f.read()
+    return get_static_assets().response('index.html')
 
-@app.route('/<path:path>')
+@api.route('/static/<path:path>')
+@api.route('/<path:path>')
 def serve_static(path):
-    """Serve static files"""
-    from flask import send_from_directory
-    return send_from_directory('.', path)
+    """Serve files from static/, under their own or fingerprinted names"""
+    response = get_static_assets().response(path)
+    if response is None:
+        return jsonify({'error': 'Not found'}), 404
+    return response
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'message': 'Resume Analyzer API is running'}), 200
+    # The analyzer's breaker and limiter, without creating the analyzer for a health check
+    llm_stats = (ai_analyzer.llm if ai_analyzer is not None else get_llm()).stats()
+    return jsonify({
+        'status': 'healthy',
+        'message': 'Resume Analyzer API is running',
+        'cache': get_result_cache().stats(),
+        'llm': llm_stats
+    }), 200
 
-@app.route('/api/analyze', methods=['POST'])
+@api.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request, stage, cache, LLM and fallback metrics in Prometheus text format"""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/api/analyze', methods=['POST'])
 def analyze_resume():
     """Analyze a resume file"""
     try:
-        # Check if file is present
-        if 'resume' not in request.files:
-            return jsonify({'error': 'No resume file provided'}), 400
+        # Reading request.files parses the multipart upload
+        with timed('upload'):
+            error = validate_resume_upload()
+        if error:
+            return error
+        
+        file = request.files['resume']
+        result = analyze_upload(
+            file.read(),
+            secure_filename(file.filename),
+            request.form.get('job_description', ''),
+            # ?include=scores asks for analysis and scores from one combined prompt
+            include_scores='scores' in request.args.get('include', '').split(','),
+            full_text=wants_full_text()
+        )
+        return jsonify(result), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error analyzing resume: {str(e)}'}), 500
+
+@api.route('/api/analyze/stream', methods=['POST'])
+def analyze_resume_stream():
+    """Analyze a resume file, streaming progress as Server-Sent Events
+    
+    Events: 'parsed' (extracted resume data, sent before the LLM is called),
+    'token' (generated text), 'section' (completed summary line or list item),
+    'analysis' (final analysis, with fallback applied) and 'done'.
+    """
+    try:
+        with timed('upload'):
+            error = validate_resume_upload()
+        if error:
+            return error
         
         file = request.files['resume']
         job_description = request.form.get('job_description', '')
+        filename = secure_filename(file.filename)
+        file_bytes = file.read()
+        full_text = wants_full_text()
+        cache_key = make_cache_key(file_bytes, job_description, get_ai_analyzer().model)
+        cached = get_result_cache().get(cache_key)
+        
+        # Extraction errors still get a regular JSON error response
+        if cached is None:
+            resume_text = get_resume_parser().extract_text_from_stream(file_bytes, filename)
+            parsed = get_resume_parser().parse(resume_text)
+            resume_data = parsed.to_dict()
+            index_resume(resume_text, filename, resume_data)
+    
+    except Exception as e:
+        return jsonify({'error': f'Error analyzing resume: {str(e)}'}), 500
+    
+    def generate():
+        if cached is not None:
+            cached_parsed = ParsedResume.from_bytes(cached['parsed_data'])
+            yield sse_event('parsed', {
+                'resume_id': store_resume(cached['resume_text']),
+                'parsed_data': response_parsed_data(cached_parsed, cached['resume_text'], full_text),
+                'filename': filename
+            })
+            yield sse_event('analysis', cached['ai_analysis'])
+            yield sse_event('done', {'cached': True})
+            return
         
-        # Check if file is selected
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+        yield sse_event('parsed', {
+            'resume_id': store_resume(resume_text),
+            'parsed_data': response_parsed_data(parsed, resume_text, full_text),
+            'filename': filename
+        })
         
-        # Check file type
-        if not allowed_file(file.filename):
-            return jsonify({'error': 'Invalid file type. Only PDF and DOCX files are allowed'}), 400
+        analysis = {}
+        for event, payload in get_ai_analyzer().stream_analysis(resume_text, job_description):
+            if event == 'analysis':
+                analysis = payload
+            else:
+                yield sse_event(event, payload)
+        ai_failed = 'error' in analysis
         
-        # Save file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # If AI analysis failed or returned empty data, provide fallback analysis
+        if (not analysis.get('strengths') and not analysis.get('weaknesses')
+            and not analysis.get('recommendations')):
+            analysis = generate_fallback_analysis(resume_data, resume_text)
         
-        try:
-            # Parse resume
-            resume_text = resume_parser.extract_text(filepath)
-            resume_data = resume_parser.parse_resume(resume_text)
-            
-            # Analyze with AI
-            analysis = ai_analyzer.analyze_resume(resume_text, job_description)
-            
-            # If AI analysis failed or returned empty data, provide fallback analysis
-            if (not analysis.get('strengths') and not analysis.get('weaknesses') 
-                and not analysis.get('recommendations')):
-                analysis = generate_fallback_analysis(resume_data, resume_text)
-            
-            # Combine results
-            result = {
-                'parsed_data': resume_data,
+        if not ai_failed:
+            get_result_cache().set(cache_key, {
+                'resume_text': resume_text,
+                'parsed_data': parsed.to_bytes(full_text=False),
                 'ai_analysis': analysis,
-                'filename': filename
-            }
-            
-            return jsonify(result), 200
+                'scores': None
+            })
+        
+        yield sse_event('analysis', analysis)
+        yield sse_event('done', {'cached': False})
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Keep reverse proxies from buffering the stream
+    })
+
+@api.route('/api/analyze/batch', methods=['POST'])
+def analyze_resume_batch():
+    """Analyze many resume files (or zip archives of them) against one job description
+    
+    With ?format=ndjson (or Accept: application/x-ndjson) each result is
+    streamed as one JSON line as soon as it is ready, in upload order and
+    without ranks, instead of one ranked JSON document at the end.
+    """
+    try:
+        files = request.files.getlist('resumes')
+        job_description = request.form.get('job_description', '')
+        
+        if not files or all(file.filename == '' for file in files):
+            return jsonify({'error': 'No resume files provided'}), 400
+        
+        files = [file for file in files if file.filename]
+        if len(files) > BATCH_MAX_FILES:
+            return jsonify({'error': f'Too many files, the limit is {BATCH_MAX_FILES} per batch'}), 400
         
-        finally:
-            # Clean up uploaded file
-            if os.path.exists(filepath):
-                os.remove(filepath)
+        # Limits count the files inside zip archives, checked before any is unpacked; each
+        # upload stays in the request's spooled file until the batch reaches it
+        uploads = [(secure_filename(file.filename), file.stream) for file in files]
+        file_count, unzipped_size = measure_uploads(uploads)
+        if file_count > BATCH_MAX_FILES:
+            return jsonify({'error': f'Too many files, the limit is {BATCH_MAX_FILES} per batch '
+                                     f'including files in zip archives'}), 400
+        if unzipped_size > BATCH_MAX_UNZIPPED_MB * 1024 * 1024:
+            return jsonify({'error': f'Zip archives too large, the limit is {BATCH_MAX_UNZIPPED_MB}MB '
+                                     f'unzipped per batch'}), 400
+        
+        if wants_ndjson():
+            # Zip members are inflated one at a time as the batch reaches them
+            return ndjson_response(get_batch_analyzer().iter_results(iter_uploads(uploads), job_description))
+        
+        results = get_batch_analyzer().analyze(uploads, job_description)
+        failed = sum(1 for result in results if 'error' in result)
+        
+        return jsonify({
+            'count': len(results),
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'results': results
+        }), 200
     
     except Exception as e:
-        return jsonify({'error': f'Error analyzing resume: {str(e)}'}), 500
+        return jsonify({'error': f'Error analyzing resumes: {str(e)}'}), 500
 
-@app.route('/api/score', methods=['POST'])
+@api.route('/api/jobs', methods=['POST'])
+def create_analysis_job():
+    """Queue a resume analysis and return its job ID without waiting for the result"""
+    try:
+        error = validate_resume_upload()
+        if error:
+            return error
+        
+        file = request.files['resume']
+        job_id = get_job_queue().submit({
+            'file_bytes': file.read(),
+            'filename': secure_filename(file.filename),
+            'job_description': request.form.get('job_description', ''),
+            'include_scores': 'scores' in request.args.get('include', '').split(','),
+            'full_text': wants_full_text()
+        })
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': f'/api/jobs/{job_id}'
+        }), 202
+    
+    except Exception as e:
+        return jsonify({'error': f'Error queuing analysis: {str(e)}'}), 500
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    """Status, progress and, once completed, the result of an analysis job"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job), 200
+
+@api.route('/api/search', methods=['GET'])
+def search_resumes():
+    """Search analyzed resumes by skills, education or job title words, and experience years
+    
+    With ?format=ndjson (or Accept: application/x-ndjson) every match is
+    streamed as one JSON line, up to ?limit if given. Needs the header
+    Authorization: Bearer <SEARCH_API_KEY>.
+    """
+    if not SEARCH_API_KEY:
+        return jsonify({'error': 'Resume search is disabled; set SEARCH_API_KEY to enable it'}), 404
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {SEARCH_API_KEY}'):
+        return jsonify({'error': 'Missing or invalid search API key'}), 401
+    
+    try:
+        if wants_ndjson():
+            results = get_resume_index().iter_search(
+                skills=request.args.get('skills', ''),
+                text=request.args.get('text', ''),
+                min_years=request.args.get('min_years', type=int),
+                max_years=request.args.get('max_years', type=int)
+            )
+            return ndjson_response(islice(results, request.args.get('limit', type=int)))
+        
+        results = get_resume_index().search(
+            skills=request.args.get('skills', ''),
+            text=request.args.get('text', ''),
+            min_years=request.args.get('min_years', type=int),
+            max_years=request.args.get('max_years', type=int),
+            limit=max(1, min(request.args.get('limit', 20, type=int), SEARCH_MAX_RESULTS))
+        )
+        return jsonify({'count': len(results), 'results': results}), 200
+    
+    except ValueError as e:
+        return jsonify({'error': f'Invalid search query: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Error searching resumes: {str(e)}'}), 500
+
+@api.route('/api/score', methods=['POST'])
 def score_resume():
-    """Score a resume against a job description"""
+    """Score a resume against a job description
+    
+    ?mode=local skips the LLM and returns only the local job_match score.
+    """
     try:
         data = request.get_json()
-        resume_text = data.get('resume_text', '')
+        resume_text, compacted, error = request_resume(data)
+        if error:
+            return error
         job_description = data.get('job_description', '')
         
-        if not resume_text:
-            return jsonify({'error': 'Resume text is required'}), 400
+        job_match = local_job_match(resume_text, job_description) if job_description else None
+        if request.args.get('mode') == 'local':
+            if job_match is None:
+                return jsonify({'error': 'Job description is required for local scoring'}), 400
+            return jsonify({'job_match': job_match}), 200
         
-        # Get scoring from AI
-        score_analysis = ai_analyzer.score_resume(resume_text, job_description)
+        # The frontend scores the text it just got back from /api/analyze,
+        # so repeated uploads of the same resume hit the cache here too
+        cache_key = make_cache_key(resume_text.encode('utf-8'), job_description, get_ai_analyzer().model, kind='score')
+        score_analysis = get_result_cache().get(cache_key)
+        if score_analysis is None:
+            # Get scoring from AI
+            score_analysis = get_ai_analyzer().score_resume(resume_text, job_description, compacted=compacted)
+            if 'error' not in score_analysis:
+                get_result_cache().set(cache_key, score_analysis)
         
+        if job_match is not None:
+            score_analysis = {**score_analysis, 'job_match': job_match}
         return jsonify(score_analysis), 200
     
     except Exception as e:
         return jsonify({'error': f'Error scoring resume: {str(e)}'}), 500
 
-@app.route('/api/suggestions', methods=['POST'])
+@api.route('/api/suggestions', methods=['POST'])
 def get_suggestions():
     """Get improvement suggestions for a resume"""
     try:
         data = request.get_json()
-        resume_text = data.get('resume_text', '')
+        resume_text, compacted, error = request_resume(data)
+        if error:
+            return error
         job_description = data.get('job_description', '')
         
-        if not resume_text:
-            return jsonify({'error': 'Resume text is required'}), 400
-        
         # Get suggestions from AI
-        suggestions = ai_analyzer.get_suggestions(resume_text, job_description)
+        suggestions = get_ai_analyzer().get_suggestions(resume_text, job_description, compacted=compacted)
         
         return jsonify(suggestions), 200
     
     except Exception as e:
         return jsonify({'error': f'Error getting suggestions: {str(e)}'}), 500
 
+# WSGI entry point (gunicorn app:app, serve.py); building it creates no services
+app = create_app()
+
 if __name__ == '__main__':
-    # Ensure upload folder exists
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    # Jobs left unfinished by the previous run can't resume
+    if os.getenv('JOB_DB'):
+        fail_unfinished_jobs(os.getenv('JOB_DB'))
     
     # Run app
     port = int(os.getenv('PORT', 5000))
@@ -0,0 +1,274 @@
+import io
+import os
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from parsed_resume import ParsedResume
+from resume_parser import ResumeParser
+from result_cache import ResultCache, make_cache_key
+
+ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
+
+# Never inflate a single zip member beyond this many bytes
+MAX_ZIP_MEMBER_SIZE = 16 * 1024 * 1024
+
+# Raised by ZipFile.read for one unreadable member: bad CRC or header, encryption,
+# unsupported compression, corrupt deflate data
+ZIP_MEMBER_ERRORS = (zipfile.BadZipFile, RuntimeError, NotImplementedError, zlib.error, OSError)
+
+# Parser used inside the extraction worker processes
+_parser = ResumeParser()
+
+
+def expand_uploads(uploads: Iterable[Tuple[str, Union[bytes, BinaryIO]]]) -> List[Tuple[str, bytes]]:
+    """Flatten (filename, bytes or binary file) uploads, unpacking zip archives into their resume files"""
+    return list(iter_uploads(uploads))
+
+
+def iter_uploads(uploads: Iterable[Tuple[str, Union[bytes, BinaryIO]]]) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """expand_uploads one item at a time, reading each upload and zip member only when it is reached
+
+    Files must be seekable, like the spooled files of a Flask request; zip
+    archives are read from them in place rather than loaded whole.
+    """
+    for filename, source in uploads:
+        if not filename.lower().endswith('.zip'):
+            yield filename, read_upload(source)
+            continue
+        try:
+            archive = zipfile.ZipFile(zip_source(source))
+        except zipfile.BadZipFile:
+            yield filename, None
+            continue
+        with archive:
+            for member in zip_members(archive):
+                member_data = None
+                if member.file_size <= MAX_ZIP_MEMBER_SIZE:
+                    try:
+                        member_data = archive.read(member)
+                    except ZIP_MEMBER_ERRORS:
+                        pass  # Reported as failed; the other members are still analyzed
+                yield member.filename, member_data
+
+
+def measure_uploads(uploads: Iterable[Tuple[str, Union[bytes, BinaryIO]]]) -> Tuple[int, int]:
+    """Number of items iter_uploads yields for uploads, and the bytes it inflates from zip archives
+
+    Only the archives' directories are read, so limits can be checked before anything is unpacked.
+    """
+    count = unzipped_size = 0
+    for filename, source in uploads:
+        if not filename.lower().endswith('.zip'):
+            count += 1
+            continue
+        try:
+            with zipfile.ZipFile(zip_source(source)) as archive:
+                for member in zip_members(archive):
+                    count += 1
+                    if member.file_size <= MAX_ZIP_MEMBER_SIZE:
+                        unzipped_size += member.file_size
+        except zipfile.BadZipFile:
+            count += 1
+    return count, unzipped_size
+
+
+def read_upload(source: Union[bytes, BinaryIO]) -> bytes:
+    """Contents of an upload given as bytes or as a seekable binary file"""
+    if isinstance(source, bytes):
+        return source
+    source.seek(0)
+    return source.read()
+
+
+def zip_source(source: Union[bytes, BinaryIO]) -> BinaryIO:
+    """File for zipfile.ZipFile to read an upload from; ZipFile leaves a file it was given open"""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def zip_members(archive: zipfile.ZipFile) -> Iterator[zipfile.ZipInfo]:
+    """Entries of an archive that may be resumes: no directories, macOS metadata or hidden files"""
+    for member in archive.infolist():
+        name = member.filename
+        if member.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+            continue
+        yield member
+
+
+def extract_and_parse(item: Tuple[str, Optional[bytes]]) -> Dict:
+    """Extract and parse one resume; runs in a worker process"""
+    filename, data = item
+    if data is None:
+        return {'filename': filename, 'error': 'File is corrupt or too large to process'}
+    if '.' not in filename or filename.rsplit('.', 1)[1].lower() not in ALLOWED_EXTENSIONS:
+        return {'filename': filename, 'error': 'Invalid file type. Only PDF and DOCX files are allowed'}
+    try:
+        resume_text = _parser.extract_text_from_stream(data, filename)
+        return {
+            'filename': filename,
+            'resume_text': resume_text,
+            'parsed_data': _parser.parse_resume(resume_text)
+        }
+    except Exception as e:
+        return {'filename': filename, 'error': f'Error reading resume: {str(e)}'}
+
+
+def local_score(resume_text: str, job_description: str = "") -> float:
+    """bulk_scoring's 0-100 score of one resume, computed without the LLM"""
+    from bulk_scoring import score_feature_matrix  # NumPy is only loaded when needed
+    return float(score_feature_matrix(_parser.featurize_batch([resume_text]), job_description)[0])
+
+
+def rank_results(results: List[Dict]) -> List[Dict]:
+    """Order results by overall score (highest first) with failed items last, and number them"""
+    def sort_key(result):
+        if 'error' in result:
+            return (2, 0)
+        score = (result.get('scores') or {}).get('overall_score')
+        return (1, 0) if score is None else (0, -score)
+
+    ranked = sorted(results, key=sort_key)
+    rank = 0
+    for result in ranked:
+        if 'error' in result:
+            result['rank'] = None
+        else:
+            rank += 1
+            result['rank'] = rank
+    return ranked
+
+
+class BatchAnalyzer:
+    """Analyze many resumes against one job description
+
+    Extraction and parsing fan out to a process pool, LLM calls to a bounded
+    thread pool, and a failure in one resume is reported on that item only.
+    Without an ai_analyzer, every resume gets the rule-based fallback analysis
+    and a local bulk_scoring score.
+    """
+
+    def __init__(self, ai_analyzer, fallback: Callable[[Dict, str], Dict],
+                 parse_workers: Optional[int] = None, llm_concurrency: int = 4,
+                 cache: Optional[ResultCache] = None, on_parsed: Optional[Callable[[Dict], None]] = None):
+        """parse_workers=0 parses in-process; None uses one worker per CPU
+        
+        on_parsed, if given, receives each successfully parsed item
+        (filename, resume_text, parsed_data) in the calling process.
+        """
+        self.ai_analyzer = ai_analyzer
+        self.fallback = fallback
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.llm_concurrency = llm_concurrency
+        self.cache = cache
+        self.on_parsed = on_parsed
+        self._process_pool = None
+
+    @property
+    def model(self) -> str:
+        """Model name the results depend on, for cache keys"""
+        return self.ai_analyzer.model if self.ai_analyzer is not None else 'fallback'
+
+    def analyze(self, uploads: List[Tuple[str, Union[bytes, BinaryIO]]], job_description: str = "") -> List[Dict]:
+        """Analyze (filename, bytes or file) uploads and return ranked results; each is read as it is reached"""
+        return rank_results(list(self.iter_results(iter_uploads(uploads), job_description)))
+
+    def iter_results(self, items: Iterable[Tuple[str, Optional[bytes]]], job_description: str = "",
+                     window: Optional[int] = None) -> Iterator[Dict]:
+        """Results of (filename, bytes) items in input order, yielded as soon as each is ready
+
+        items is consumed lazily: at most window items (default: enough to keep
+        every parse worker and LLM slot busy) are parsed or analyzed at a time,
+        so memory does not grow with the number of items.
+        """
+        window = window or 2 * max(self.parse_workers, 1) + self.llm_concurrency
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.llm_concurrency) as llm_pool:
+            for filename, data in items:
+                in_flight.append((filename, self._submit(llm_pool, filename, data, job_description)))
+                if len(in_flight) >= window:
+                    yield self._collect(*in_flight.popleft())
+            while in_flight:
+                yield self._collect(*in_flight.popleft())
+
+    def close(self):
+        """Shut down the extraction worker processes"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def _submit(self, llm_pool: ThreadPoolExecutor, filename: str, data: Optional[bytes], job_description: str) -> Future:
+        """Start parsing one item and queue its analysis; cache hits complete at once"""
+        # Resumes analyzed before with this job description skip parsing and the LLM
+        cache_key = None
+        if self.cache is not None and data is not None:
+            cache_key = make_cache_key(data, job_description, self.model, kind='analysis+scores')
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                done = Future()
+                parsed_data = ParsedResume.from_bytes(cached['parsed_data']).to_dict()
+                done.set_result(self._result(filename, parsed_data, cached['ai_analysis'], cached.get('scores')))
+                return done
+
+        if self.parse_workers > 1:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+            parsed = self._process_pool.submit(extract_and_parse, (filename, data))
+        else:
+            parsed = Future()
+            parsed.set_result(extract_and_parse((filename, data)))
+        # LLM calls start as soon as each resume is parsed, while later ones are still parsing
+        return llm_pool.submit(self._analyze_parsed, parsed, job_description, cache_key)
+
+    @staticmethod
+    def _collect(filename: str, future: Future) -> Dict:
+        """An item's result, or its error if the analysis raised"""
+        try:
+            return future.result()
+        except Exception as e:
+            return {'filename': filename, 'error': f'Error analyzing resume: {str(e)}'}
+
+    def _analyze_parsed(self, parsed: Future, job_description: str, cache_key: Optional[str]) -> Dict:
+        """Wait for one item's parse result, then analyze it"""
+        parsed = parsed.result()
+        if 'error' in parsed:
+            return parsed
+        if self.on_parsed is not None:
+            self.on_parsed(parsed)
+        return self._analyze_one(parsed, job_description, cache_key)
+
+    def _analyze_one(self, parsed: Dict, job_description: str, cache_key: Optional[str]) -> Dict:
+        """Analyze and score one parsed resume, with the fallback analysis if the AI fails"""
+        resume_text = parsed['resume_text']
+        if self.ai_analyzer is None:
+            analysis, scores = {}, {'overall_score': local_score(resume_text, job_description)}
+        else:
+            analysis = self.ai_analyzer.analyze_and_score(resume_text, job_description)
+            scores = analysis.pop('scores', None)
+        ai_error = analysis.get('error')
+
+        if (not analysis.get('strengths') and not analysis.get('weaknesses')
+                and not analysis.get('recommendations')):
+            analysis = self.fallback(parsed['parsed_data'], resume_text)
+
+        if cache_key is not None and ai_error is None:
+            self.cache.set(cache_key, {
+                'resume_text': resume_text,
+                'parsed_data': ParsedResume.from_dict(parsed['parsed_data']).to_bytes(full_text=False),
+                'ai_analysis': analysis,
+                'scores': scores
+            })
+        result = self._result(parsed['filename'], parsed['parsed_data'], analysis, scores)
+        if ai_error is not None:
+            result['ai_error'] = ai_error  # The analysis is the fallback's
+        return result
+
+    @staticmethod
+    def _result(filename: str, parsed_data: Dict, analysis: Dict, scores: Optional[Dict]) -> Dict:
+        """One batch result; the full resume text is left out to keep the response small"""
+        return {
+            'filename': filename,
+            'parsed_data': {key: value for key, value in parsed_data.items() if key != 'full_text'},
+            'ai_analysis': analysis,
+            'scores': scores
+        }
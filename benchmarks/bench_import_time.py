@@ -0,0 +1,95 @@
+"""Benchmark: cold-start cost of `import app`, measured with python -X importtime
+
+Imports the app in fresh interpreters and reports the median cumulative import
+time, the slowest modules, and the time create_app() takes afterwards. Exits
+with status 1 when the median is over --max-ms, or when a module that must be
+imported lazily (the OpenAI SDK, PyPDF2, python-docx, NumPy) was loaded by the
+import itself.
+
+Usage: python benchmarks/bench_import_time.py [--runs N] [--max-ms MS] [--top N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS = 5
+MAX_MS = 500.0
+TOP = 15
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = ('openai', 'httpx', 'pydantic', 'PyPDF2', 'docx', 'numpy')
+
+PROBE = f"""
+import json, sys, time
+import app
+started = time.perf_counter()
+app.create_app()
+print(json.dumps({{
+    'create_app_ms': (time.perf_counter() - started) * 1000,
+    'loaded': [name for name in {LAZY_MODULES!r} if name in sys.modules]
+}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every line of -X importtime output"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def import_profile() -> Dict:
+    """Import app in a fresh interpreter; its total import time, per-module times and lazily loaded modules"""
+    env = dict(os.environ, OPENAI_API_KEY=os.getenv('OPENAI_API_KEY', 'bench-key'))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE], cwd=ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    modules = parse_importtime(completed.stderr)
+    return {
+        'total_ms': next(cumulative for name, _, cumulative in modules if name == 'app') / 1000,
+        'modules': modules,
+        **json.loads(completed.stdout.strip().splitlines()[-1])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how long `import app` takes')
+    parser.add_argument('--runs', type=int, default=RUNS)
+    parser.add_argument('--max-ms', type=float, default=MAX_MS, help=f'median import budget (default {MAX_MS:.0f} ms)')
+    parser.add_argument('--top', type=int, default=TOP, help='slowest modules to list')
+    args = parser.parse_args()
+
+    profiles = sorted((import_profile() for _ in range(args.runs)), key=lambda profile: profile['total_ms'])
+    median = profiles[len(profiles) // 2]
+
+    print(f"{'module':40} {'self ms':>9} {'total ms':>9}")
+    for name, self_us, cumulative_us in sorted(median['modules'], key=lambda module: -module[2])[:args.top]:
+        print(f"{name:40} {self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}")
+    print(f"\nimport app: median {median['total_ms']:.1f} ms over {args.runs} runs "
+          f"(min {profiles[0]['total_ms']:.1f}, max {profiles[-1]['total_ms']:.1f})")
+    print(f"create_app(): {statistics.median(profile['create_app_ms'] for profile in profiles):.1f} ms")
+
+    failures = 0
+    if median['loaded']:
+        print(f"❌ Imported at startup instead of on first use: {', '.join(median['loaded'])}")
+        failures += 1
+    if median['total_ms'] > args.max_ms:
+        print(f"❌ import app takes {median['total_ms']:.1f} ms, over the {args.max_ms:.0f} ms budget")
+        failures += 1
+    if failures:
+        return 1
+    print('✅ Within budget')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
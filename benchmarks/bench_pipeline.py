@@ -0,0 +1,176 @@
+"""Benchmark: throughput, latency and peak memory of the parse and analysis pipeline
+
+Times ResumeParser.extract_text, parse_resume, generate_fallback_analysis and
+POST /api/analyze (against the local stub LLM, with the result cache off) on
+synthetic PDF and DOCX resumes of several sizes. Results are written as JSON
+so runs on different commits can be compared:
+
+    python benchmarks/bench_pipeline.py --out before.json
+    git checkout <other commit>
+    python benchmarks/bench_pipeline.py --compare before.json
+
+With --compare, exits with status 1 when any median latency is more than
+--max-slowdown times the baseline's.
+
+Usage: python benchmarks/bench_pipeline.py [--quick] [--out FILE] [--compare FILE] [--max-slowdown X]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+from typing import Callable, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('OPENAI_API_KEY', 'bench-key')
+
+import app as app_module
+from ai_analyzer import AIAnalyzer
+from fallback_analysis import generate_fallback_analysis
+from result_cache import ResultCache
+from resume_parser import ResumeParser
+from stub_openai_server import StubOpenAIServer
+from synthetic_resumes import FORMATS, SIZES
+
+ITERATIONS = 30
+QUICK_ITERATIONS = 5
+MAX_SLOWDOWN = 1.5
+
+
+def measure(operation: Callable[[], object], iterations: int) -> Dict:
+    """Latency percentiles and throughput over iterations runs, and peak memory of one more run"""
+    operation()  # Warm up caches and lazily built state
+    latencies = []
+    gc.collect()
+    gc.disable()  # As timeit does, so collections do not land on random iterations
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            operation()
+            latencies.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'p95_ms': round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'ops_per_second': round(len(latencies) / sum(latencies), 1),
+        'peak_memory_kb': round(peak / 1024, 1)
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(iterations: int) -> Dict:
+    parser = ResumeParser()
+    results = {}
+    with StubOpenAIServer() as server, tempfile.TemporaryDirectory() as directory:
+        app_module.ai_analyzer = AIAnalyzer(api_key='bench-key', base_url=server.base_url)
+        app_module.result_cache = ResultCache(max_entries=0)  # Every request runs the whole pipeline
+        client = app_module.app.test_client()
+
+        for extension, make in FORMATS.items():
+            for size, roles in SIZES.items():
+                data = make(roles)
+                path = os.path.join(directory, f'{size}.{extension}')
+                with open(path, 'wb') as f:
+                    f.write(data)
+                text = parser.extract_text(path)
+                parsed = parser.parse_resume(text)
+
+                def analyze():
+                    response = client.post('/api/analyze', data={'resume': (BytesIO(data), f'resume.{extension}')})
+                    assert response.status_code == 200, response.get_data(as_text=True)
+
+                case = f'{extension}/{size}'
+                results[f'extract_text/{case}'] = measure(lambda: parser.extract_text(path), iterations)
+                if extension == 'pdf':
+                    # Text and parse results do not depend on the file format
+                    results[f'parse_resume/{size}'] = measure(lambda: parser.parse_resume(text), iterations)
+                    results[f'fallback_analysis/{size}'] = measure(lambda: generate_fallback_analysis(parsed, text), iterations)
+                results[f'api_analyze/{case}'] = measure(analyze, iterations)
+                print(f'  {case}: {len(data) / 1024:.1f} KB, {len(text)} characters', file=sys.stderr)
+    parser.close()
+    return results
+
+
+def compare(results: Dict, baseline: Dict, max_slowdown: float) -> int:
+    """Print the median latency ratio per benchmark; returns the number of regressions"""
+    regressions = 0
+    print(f"\nCompared with {baseline.get('commit', '?')}:")
+    for name, current in results.items():
+        before = baseline['results'].get(name)
+        if not before:
+            print(f"  {name:38} new")
+            continue
+        ratio = current['p50_ms'] / before['p50_ms'] if before['p50_ms'] else 1.0
+        regressed = ratio > max_slowdown
+        regressions += regressed
+        print(f"  {name:38} {before['p50_ms']:9.2f} -> {current['p50_ms']:9.2f} ms  x{ratio:.2f}{'  ❌' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the resume parse and analysis pipeline')
+    parser.add_argument('--quick', action='store_true', help=f'{QUICK_ITERATIONS} iterations instead of {ITERATIONS}')
+    parser.add_argument('--out', help='JSON file for the results (default: benchmarks/results/pipeline-<commit>.json)')
+    parser.add_argument('--compare', help='baseline JSON file from an earlier run')
+    parser.add_argument('--max-slowdown', type=float, default=MAX_SLOWDOWN)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    print(f'Benchmarking commit {commit}...', file=sys.stderr)
+    results = run(QUICK_ITERATIONS if args.quick else ITERATIONS)
+
+    print(f"{'benchmark':40} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>9} {'peak KB':>9}")
+    for name, result in results.items():
+        print(f"{name:40} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} "
+              f"{result['ops_per_second']:9.1f} {result['peak_memory_kb']:9.1f}")
+
+    out = args.out or os.path.join(ROOT, 'benchmarks', 'results', f'pipeline-{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results
+        }, f, indent=2)
+    print(f'\nResults written to {out}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.max_slowdown)
+        if regressions:
+            print(f'❌ {regressions} benchmark(s) more than {args.max_slowdown}x slower')
+            return 1
+        print('✅ No regressions')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
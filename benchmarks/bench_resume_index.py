@@ -0,0 +1,74 @@
+"""Benchmark: /api/search queries against 100k indexed resumes must take under 10 ms
+
+Fills a temporary ResumeIndex with synthetic parse results, then times a
+set of skill, text and experience queries. Exits with status 1 when the
+slowest query (best of 20 runs) exceeds MAX_MS.
+
+Usage: python benchmarks/bench_resume_index.py [number of resumes]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_index import ResumeIndex
+from resume_parser import COMMON_SKILLS
+
+RESUMES = 100000
+MAX_MS = 10.0
+
+QUERIES = [
+    {'skills': 'kubernetes', 'min_years': 5},
+    {'skills': 'kubernetes AND python', 'min_years': 5},
+    {'skills': '"machine learning" AND (c++ OR pytorch) NOT java'},
+    {'skills': 'graphql AND swift AND php AND ruby', 'min_years': 15},
+    {'skills': 'python', 'text': 'engineer', 'max_years': 3},
+    {'min_years': 10},
+]
+
+TITLES = ['Software Engineer | Acme Inc.', 'Data Analyst | Initech LLC', 'Product Manager | Globex Corp.']
+
+
+def fill(index: ResumeIndex, count: int):
+    """Index count synthetic resumes with 3-15 skills and 0-20 years each"""
+    rng = random.Random(42)
+    index.add_many((f'resume-{number}', f'resume-{number}.pdf', {
+        'email': f'candidate{number}@example.com',
+        'skills': [skill.title() for skill in rng.sample(COMMON_SKILLS, rng.randint(3, 15))],
+        'experience_years': rng.randint(0, 20),
+        'education': ['Bachelor of Science in Computer Science'],
+        'work_experience': [{'title_line': rng.choice(TITLES), 'date_range': '2019 - 2022', 'duration_years': 3}]
+    }) for number in range(count))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RESUMES
+    with tempfile.TemporaryDirectory() as directory:
+        index = ResumeIndex(os.path.join(directory, 'index.db'))
+        start = time.perf_counter()
+        fill(index, count)
+        print(f"Indexed {count} resumes in {time.perf_counter() - start:.1f} s\n")
+
+        slowest = 0.0
+        print(f"{'ms':>8} {'hits':>5}  query")
+        for query in QUERIES:
+            best = float('inf')
+            for _ in range(20):
+                started = time.perf_counter()
+                results = index.search(limit=20, **query)
+                best = min(best, time.perf_counter() - started)
+            slowest = max(slowest, best)
+            print(f"{best * 1000:>8.2f} {len(results):>5}  {query}")
+
+    if slowest * 1000 > MAX_MS:
+        print(f"\n❌ Slowest query took {slowest * 1000:.2f} ms")
+        return 1
+    print(f"\n✅ All queries under {MAX_MS:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
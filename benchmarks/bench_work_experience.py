@@ -0,0 +1,72 @@
+"""Benchmark: work experience extraction must scale linearly with resume length
+
+Generates synthetic resumes of 1.25k to 10k lines and times
+ResumeParser._extract_work_experience on each. Exits with status 1 when the
+time per line of the largest document is more than twice that of the smallest.
+
+Usage: python benchmarks/bench_work_experience.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_parser import ResumeParser, KEYWORDS
+
+JOB_BLOCK = [
+    "Senior Software Engineer | Tech Solutions Inc.",
+    "June 2019 - Present",
+    "• Developed 15+ microservices using Python, Flask and Docker reducing latency by 40%",
+    "• Led team of 5 engineers to migrate legacy systems to AWS",
+    "• Implemented CI/CD pipelines with Jenkins",
+    "Publications and talks on distributed systems, 2018",
+    "",
+]
+
+SIZES = [1250, 2500, 5000, 10000]
+MAX_SLOWDOWN = 2.0
+
+
+def make_resume(n_lines: int) -> str:
+    """Build a synthetic resume with roughly n_lines lines"""
+    lines = ["JANE DOE", "jane.doe@example.com | (555) 123-4567", "PROFESSIONAL EXPERIENCE"]
+    while len(lines) < n_lines - 3:
+        lines.extend(JOB_BLOCK)
+    lines.extend(["EDUCATION", "Bachelor of Science in Computer Science", "University of Technology, 2015"])
+    return '\n'.join(lines[:n_lines])
+
+
+def time_extraction(parser: ResumeParser, text: str, repeats: int = 5) -> float:
+    """Best-of-N wall time of one work experience extraction"""
+    hits = KEYWORDS.group_by_category(text)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        parser._extract_work_experience(text, hits)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = ResumeParser()
+    per_line = []
+    print(f"{'lines':>8} {'entries':>8} {'ms':>10} {'us/line':>10}")
+    for size in SIZES:
+        text = make_resume(size)
+        entries = len(parser._extract_work_experience(text))
+        elapsed = time_extraction(parser, text)
+        per_line.append(elapsed / size)
+        print(f"{size:>8} {entries:>8} {elapsed * 1000:>10.2f} {elapsed / size * 1e6:>10.3f}")
+    
+    slowdown = per_line[-1] / per_line[0]
+    print(f"\nTime per line at {SIZES[-1]} lines vs {SIZES[0]} lines: {slowdown:.2f}x")
+    if slowdown > MAX_SLOWDOWN:
+        print("❌ Work experience extraction is not scaling linearly")
+        return 1
+    print("✅ Linear scaling")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
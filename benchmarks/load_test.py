@@ -0,0 +1,124 @@
+"""Load test: requests per second of serve.py as the number of gunicorn workers grows
+
+Starts the stub LLM, then for each worker count runs `python serve.py` against
+it and keeps CONCURRENCY clients posting a synthetic resume to /api/analyze for
+DURATION seconds (result cache off, so every request parses and calls the LLM).
+Prints throughput and latency per worker count.
+
+Usage: python benchmarks/load_test.py [worker counts, default 1 2 4] [--concurrency N] [--duration S] [--llm-latency S]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_openai_server import StubOpenAIServer
+from synthetic_resumes import make_resume_pdf
+
+CONCURRENCY = 16
+DURATION = 10.0
+LLM_LATENCY = 0.05
+STARTUP_TIMEOUT = 30.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, llm_url: str) -> subprocess.Popen:
+    """serve.py with the given worker count, pointed at the stub LLM; returns once it answers"""
+    env = dict(os.environ, OPENAI_API_KEY='load-test', OPENAI_BASE_URL=llm_url, RESULT_CACHE_SIZE='0',
+               SERVE_WORKERS=str(workers), SERVE_BIND=f'127.0.0.1:{port}')
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'serve.py')], cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        try:
+            if requests.get(f'http://127.0.0.1:{port}/api/health', timeout=1).ok:
+                return process
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise Exception(f"serve.py did not start within {STARTUP_TIMEOUT} s")
+
+
+def hammer(url: str, resume: bytes, concurrency: int, duration: float) -> Dict:
+    """Keep concurrency clients busy for duration seconds; returns throughput and latency"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        session = requests.Session()
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                ok = session.post(url, files={'resume': ('resume.pdf', resume)}, timeout=60).status_code == 200
+            except requests.RequestException:
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test serve.py at several worker counts')
+    parser.add_argument('workers', nargs='*', type=int, default=[1, 2, 4])
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=DURATION)
+    parser.add_argument('--llm-latency', type=float, default=LLM_LATENCY, help='seconds the stub LLM takes per reply')
+    args = parser.parse_args()
+
+    resume = make_resume_pdf(8)
+    print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    with StubOpenAIServer(latency=args.llm_latency) as llm:
+        baseline = None
+        for workers in args.workers:
+            port = free_port()
+            process = start_server(workers, port, llm.base_url)
+            try:
+                result = hammer(f'http://127.0.0.1:{port}/api/analyze', resume, args.concurrency, args.duration)
+            finally:
+                process.terminate()
+                process.wait(30)
+            baseline = baseline or result['rps']
+            print(f"{workers:>8} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                  f"{result['errors']:>7}   x{result['rps'] / baseline:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
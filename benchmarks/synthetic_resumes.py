@@ -0,0 +1,114 @@
+"""Synthetic resumes for the benchmarks, as text, PDF or DOCX
+
+Resumes follow the layout of create_detailed_test_resume.py (header, summary,
+experience entries with bullets, education, skills) with a configurable number
+of roles. PDFs are laid out line by line like the reportlab script, but written
+directly as a minimal Helvetica PDF so the benchmarks need nothing beyond
+requirements.txt.
+"""
+import random
+from io import BytesIO
+from typing import List
+from docx import Document
+
+TITLES = ["Senior Software Engineer", "Software Engineer", "Data Scientist", "DevOps Engineer", "Product Manager"]
+COMPANIES = ["Tech Solutions Inc.", "Digital Innovations Corp.", "StartupXYZ Technologies", "Acme Labs LLC", "Global Systems Ltd"]
+BULLETS = [
+    "• Developed and deployed 15+ microservices using Python, Flask, and Docker reducing latency by 40%",
+    "• Led team of 5 engineers to migrate legacy systems to AWS cloud infrastructure",
+    "• Implemented CI/CD pipelines with Jenkins, improving deployment frequency by 300%",
+    "• Optimized database queries in PostgreSQL, reducing query time by 60%",
+    "• Built RESTful APIs serving 100K+ daily active users with 99.9% uptime",
+    "• Collaborated with cross-functional teams using Agile/Scrum methodologies",
+    "• Developed React-based dashboards for real-time data visualization",
+    "• Reduced API response time by 50% through caching implementation with Redis",
+    "• Mentored 3 junior developers, improving team productivity by 25%",
+    "• Managed Kubernetes clusters and Terraform modules across three regions",
+]
+
+# Resume sizes used by the benchmarks: name -> number of roles
+SIZES = {'small': 1, 'medium': 3, 'large': 8, 'xlarge': 24}
+
+LINES_PER_PAGE = 55
+
+
+def make_resume_lines(roles: int, seed: int = 0) -> List[str]:
+    """Lines of one synthetic resume with the given number of roles"""
+    rng = random.Random(seed)
+    lines = [
+        "SARAH JOHNSON",
+        "sarah.johnson@email.com | (555) 123-4567 | linkedin.com/in/sarahjohnson",
+        "PROFESSIONAL SUMMARY",
+        "Results-driven Software Engineer with 5+ years of experience building scalable web applications",
+        "and cloud infrastructure. Expertise in Python, JavaScript, AWS, and microservices architecture.",
+        "PROFESSIONAL EXPERIENCE",
+    ]
+    year = 2024
+    for _ in range(roles):
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)}")
+        lines.append(f"June {start} - {'Present' if year == 2024 else f'May {year}'}")
+        lines.extend(rng.sample(BULLETS, rng.randint(3, 6)))
+        year = start
+    lines += [
+        "EDUCATION",
+        "Bachelor of Science in Computer Science",
+        "University of Technology, 2014 - 2018",
+        "TECHNICAL SKILLS",
+        "Python, JavaScript, TypeScript, React, Flask, Django, AWS, Docker, Kubernetes, PostgreSQL, Redis, Git",
+    ]
+    return lines
+
+
+def make_resume_text(roles: int, seed: int = 0) -> str:
+    return '\n'.join(make_resume_lines(roles, seed))
+
+
+def _pdf_string(line: str) -> bytes:
+    escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return b'(' + escaped.encode('cp1252', 'replace') + b')'
+
+
+def make_resume_pdf(roles: int, seed: int = 0) -> bytes:
+    """The resume as a PDF, LINES_PER_PAGE lines per letter-size page"""
+    lines = make_resume_lines(roles, seed)
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % (4 + 2 * i) for i in range(len(pages))) +
+        b'] /Count %d >>' % len(pages),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    for index, page_lines in enumerate(pages):
+        stream = b'BT /F1 9 Tf 12 TL 72 750 Td ' + b' '.join(_pdf_string(line) + b" '" for line in page_lines) + b' ET'
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (5 + 2 * index))
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+
+    output = BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(output.tell())
+        output.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = output.tell()
+    output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for offset in offsets:
+        output.write(b'%010d 00000 n \n' % offset)
+    output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return output.getvalue()
+
+
+def make_resume_docx(roles: int, seed: int = 0) -> bytes:
+    """The resume as a DOCX, one paragraph per line"""
+    document = Document()
+    for line in make_resume_lines(roles, seed):
+        document.add_paragraph(line)
+    output = BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+FORMATS = {'pdf': make_resume_pdf, 'docx': make_resume_docx}
@@ -0,0 +1,66 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from resume_parser import FEATURE_INDEX, VOCABULARY_SLICES, ResumeParser
+
+# Weight of each score component; components are scaled to 0..1 first.
+# job_match only applies when the job description names known skills.
+SCORE_WEIGHTS = {
+    'skills': 20,
+    'job_match': 25,
+    'action_verbs': 15,
+    'metrics': 15,
+    'experience': 15,
+    'structure': 5,
+    'length': 5,
+}
+
+# Resume length (in words) that gets the full length component
+IDEAL_WORD_RANGE = (300, 900)
+
+
+def _column(matrix: np.ndarray, name: str) -> np.ndarray:
+    return matrix[:, FEATURE_INDEX[name]]
+
+
+def score_components(matrix: np.ndarray, job_description: str = "") -> Dict[str, np.ndarray]:
+    """Per-resume score components in 0..1, one array per SCORE_WEIGHTS entry that applies"""
+    word_count = _column(matrix, 'word_count')
+    low, high = IDEAL_WORD_RANGE
+    components = {
+        'skills': _column(matrix, 'skill_count') / 10,
+        'action_verbs': _column(matrix, 'action_verb_count') / 10,
+        'metrics': (_column(matrix, 'number_count') + 2 * _column(matrix, 'percent_count')) / 20,
+        'experience': _column(matrix, 'experience_years') / 10,
+        'structure': (_column(matrix, 'bullet_count') / 12 + _column(matrix, 'has_email') + _column(matrix, 'has_phone')) / 3,
+        'length': np.where(word_count < low, word_count / low, 1 - (word_count - high) / high),
+    }
+
+    job_skills = job_skill_mask(job_description)
+    if job_skills is not None:
+        resume_skills = matrix[:, VOCABULARY_SLICES['skill']] > 0
+        components['job_match'] = (resume_skills & job_skills).sum(axis=1) / job_skills.sum()
+
+    return {name: np.clip(values, 0, 1) for name, values in components.items()}
+
+
+def job_skill_mask(job_description: str) -> Optional[np.ndarray]:
+    """Boolean mask over the skill columns of the skills a job description asks for, or None if it names none"""
+    if not job_description:
+        return None
+    mask = ResumeParser().featurize_batch([job_description])[0, VOCABULARY_SLICES['skill']] > 0
+    return mask if mask.any() else None
+
+
+def score_feature_matrix(matrix: np.ndarray, job_description: str = "") -> np.ndarray:
+    """Local 0-100 score for every row of a ResumeParser.featurize_batch matrix"""
+    components = score_components(matrix, job_description)
+    weights = np.array([SCORE_WEIGHTS[name] for name in components], dtype=np.float32)
+    stacked = np.column_stack(list(components.values()))
+    return np.round(stacked @ weights / weights.sum() * 100, 1)
+
+
+def rank_resumes(texts: List[str], job_description: str = "", top: Optional[int] = None) -> List[Tuple[int, float]]:
+    """(index, score) pairs of resume texts, best first, scored without any LLM calls"""
+    scores = score_feature_matrix(ResumeParser().featurize_batch(texts), job_description)
+    order = np.argsort(-scores, kind='stable')[:top]
+    return [(int(index), float(scores[index])) for index in order]
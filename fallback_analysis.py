@@ -0,0 +1,363 @@
+import re
+from collections import namedtuple
+from typing import Dict, List
+from metrics import METRICS, timed
+from resume_parser import ACTION_VERBS
+
+FALLBACK_ANALYSES = METRICS.counter('resume_analyzer_fallback_analyses_total', 'Analyses produced by the rule-based fallback')
+
+# Substring groups looked up once in the lowercased resume text; the feature
+# of the same name is shared by every rule that needs it
+TEXT_KEYWORDS = {
+    'soft_skills': ['leadership', 'communication', 'teamwork', 'problem-solving', 'analytical', 'management', 'collaboration', 'presentation'],
+    'experience_terms': ['experience', 'employment', 'work history', 'professional experience', 'career'],
+    'education_terms': ['education', 'degree', 'university', 'college', 'bachelor', 'master', 'phd', 'diploma'],
+    'project_terms': ['project', 'portfolio', 'built', 'developed', 'created'],
+    'builder_roles': ['engineer', 'developer', 'designer'],
+    'certification_terms': ['certification', 'certified', 'certificate', 'credential'],
+    'action_verbs': ACTION_VERBS,
+    'industry_keywords': [
+        # tech
+        'agile', 'scrum', 'ci/cd', 'api', 'microservices', 'cloud', 'devops', 'full-stack', 'backend', 'frontend',
+        # business
+        'roi', 'kpi', 'strategy', 'stakeholder', 'revenue', 'growth', 'market', 'analysis',
+        # management
+        'leadership', 'team', 'budget', 'project', 'cross-functional', 'strategic', 'planning'
+    ],
+    'bullets': ['•', '●', '◦', '-', '*'],
+    'date_terms': ['2020', '2021', '2022', '2023', '2024', '2025', '2026', 'present', 'current'],
+    'first_person': [' i ', ' my ', ' me ', ' we ', ' our ', ' stuff ', ' things ', ' basically ', ' kinda ', ' sorta '],
+    'profile_links': ['linkedin', 'github'],
+    'summary_terms': ['summary', 'objective'],
+}
+
+# Groups whose rules compare the number of distinct matches against a
+# threshold; for the others only presence matters, so their search stops at
+# the first hit
+COUNTED_GROUPS = {'action_verbs', 'industry_keywords', 'first_person'}
+
+TECH_SKILL_PATTERN = re.compile('|'.join(re.escape(tech) for tech in [
+    'python', 'java', 'javascript', 'sql', 'react', 'node', 'c++', 'c#', 'aws', 'docker', 'kubernetes', 'git', 'html', 'css', 'api', 'django', 'flask', 'angular', 'vue', 'typescript', 'mongodb', 'postgresql', 'mysql', 'redis', 'kafka', 'spark', 'hadoop', 'tensorflow', 'pytorch', 'scikit', 'pandas', 'numpy'
+]))
+UNPROFESSIONAL_EMAIL_PATTERN = re.compile('sexy|cute|cool|baby|123|69|420')
+CLEAR_TITLE_PATTERN = re.compile('engineer|developer|manager|analyst|designer|architect|director|lead|senior')
+
+# A rule adds its messages (formatted with the feature vector) when its
+# condition holds. Rules are grouped; within a group only the first rule whose
+# condition holds applies, like an if/elif chain.
+Rule = namedtuple('Rule', ['when', 'strengths', 'weaknesses', 'recommendations'], defaults=((), (), ()))
+
+RULES = [
+    # Contact information
+    [
+        Rule(lambda f: f['has_email'] and f['unprofessional_email'],
+             weaknesses=["Email address may appear unprofessional"],
+             recommendations=["Consider using a professional email format: firstname.lastname@domain.com"]),
+        Rule(lambda f: f['has_email'],
+             strengths=["Professional email address is clearly visible for recruiter contact"]),
+        Rule(lambda f: True,
+             weaknesses=["Email address is missing or not detectable - critical contact information"],
+             recommendations=["Add a professional email address at the top: firstname.lastname@gmail.com"]),
+    ],
+    [
+        Rule(lambda f: f['has_phone'],
+             strengths=["Phone number provided for direct communication"]),
+        Rule(lambda f: True,
+             weaknesses=["Phone number not found - missing important contact method"],
+             recommendations=["Include a phone number with area code for easy callback"]),
+    ],
+
+    # Skills
+    [
+        Rule(lambda f: f['skills_count'] >= 8 and f['tech_skills_count'] >= 5,
+             strengths=["Comprehensive skills section with {skills_count} identified skills demonstrating versatility",
+                        "Strong technical skill set with {tech_skills_count} modern technologies"]),
+        Rule(lambda f: f['skills_count'] >= 8,
+             strengths=["Comprehensive skills section with {skills_count} identified skills demonstrating versatility"]),
+        Rule(lambda f: f['skills_count'] >= 5 and f['tech_skills_count'] < 3,
+             strengths=["Adequate skills listed ({skills_count} skills)"],
+             recommendations=["Add more in-demand technical skills relevant to your target role (e.g., cloud platforms, modern frameworks)"]),
+        Rule(lambda f: f['skills_count'] >= 5,
+             strengths=["Adequate skills listed ({skills_count} skills)"]),
+        Rule(lambda f: f['skills_count'] > 0,
+             weaknesses=["Limited skills section with only {skills_count} skills - appears thin"],
+             recommendations=["Expand skills section to 8-12 items including technical skills, soft skills, and certifications"]),
+        Rule(lambda f: True,
+             weaknesses=["No skills section detected - major gap in resume"],
+             recommendations=["Create a prominent skills section listing technical proficiencies, tools, and competencies"]),
+    ],
+    [
+        Rule(lambda f: not f['soft_skills'],
+             recommendations=["Include soft skills like Leadership, Communication, and Problem-Solving to show well-rounded capabilities"]),
+    ],
+
+    # Content length
+    [
+        Rule(lambda f: 400 <= f['word_count'] <= 600,
+             strengths=["Optimal resume length ({word_count} words) - concise yet comprehensive"]),
+        Rule(lambda f: 300 <= f['word_count'] < 400,
+             weaknesses=["Resume is somewhat brief ({word_count} words) - may lack sufficient detail"],
+             recommendations=["Expand bullet points with more context about responsibilities, technologies used, and impact created"]),
+        Rule(lambda f: f['word_count'] < 300,
+             weaknesses=["Resume is too short ({word_count} words) - appears incomplete or lacking detail"],
+             recommendations=["Add 2-3 bullet points per role describing key achievements, technologies, and quantifiable results"]),
+        Rule(lambda f: 600 < f['word_count'] <= 900,
+             strengths=["Resume has substantial content describing experience"],
+             recommendations=["Consider condensing to most impactful points to keep recruiter attention"]),
+        Rule(lambda f: True,
+             weaknesses=["Resume may be too lengthy ({word_count} words) - risk of losing reader attention"],
+             recommendations=["Streamline content to 1-2 pages, focusing on most recent and relevant experiences"]),
+    ],
+
+    # Work experience: structured entries
+    [
+        Rule(lambda f: f['num_roles'] >= 3,
+             strengths=["Strong work history with {num_roles} distinct roles showing career progression"]),
+        Rule(lambda f: f['num_roles'] >= 2,
+             strengths=["Work experience section includes {num_roles} professional roles"]),
+        Rule(lambda f: f['num_roles'] >= 1,
+             strengths=["Work experience is present and structured"],
+             recommendations=["If you have more roles, include them to show broader experience (aim for 2-4 recent positions)"]),
+    ],
+    [
+        Rule(lambda f: f['num_roles'] and f['roles_with_dates'] >= f['num_roles'] * 0.8,
+             strengths=["Employment dates clearly specified for all roles - shows timeline and tenure"]),
+        Rule(lambda f: f['num_roles'] and f['roles_with_dates'],
+             weaknesses=["Some work experiences missing date ranges"],
+             recommendations=["Add dates (MM/YYYY - MM/YYYY or Present) to all work experiences for clarity"]),
+        Rule(lambda f: f['num_roles'],
+             weaknesses=["Work experience lacks date information - dates are critical for recruiters"],
+             recommendations=["Add employment dates in format: 'June 2022 - Present' or '01/2022 - 12/2023'"]),
+    ],
+    [
+        Rule(lambda f: f['num_roles'] and f['total_duration'] >= 5,
+             strengths=["Substantial work experience totaling approximately {total_duration}+ years in the field"]),
+        Rule(lambda f: f['num_roles'] and f['total_duration'] >= 2,
+             strengths=["Relevant work experience spanning {total_duration}+ years"]),
+    ],
+    [
+        Rule(lambda f: f['num_roles'] and f['avg_bullets'] >= 4,
+             strengths=["Each role has detailed bullet points (4+) describing responsibilities and achievements"]),
+        Rule(lambda f: f['num_roles'] and f['avg_bullets'] >= 2,
+             recommendations=["Expand bullet points to 4-6 per role with specific accomplishments and technologies used"]),
+        Rule(lambda f: f['num_roles'],
+             weaknesses=["Work experience entries lack sufficient detail and bullet points"],
+             recommendations=["Add 4-6 bullet points per role: responsibilities, achievements, metrics, technologies, impact"]),
+    ],
+    [
+        Rule(lambda f: f['num_roles'] and f['roles_with_clear_titles'] >= f['num_roles'],
+             strengths=["Job titles clearly stated for all positions - easy to understand your roles"]),
+        Rule(lambda f: f['num_roles'] and f['roles_with_clear_titles'] < f['num_roles'] * 0.5,
+             weaknesses=["Some job titles unclear or missing - makes it hard to understand your roles"],
+             recommendations=["Ensure each role has a clear job title: 'Senior Software Engineer', 'Product Manager', etc."]),
+    ],
+
+    # Work experience: no structured entries
+    [
+        Rule(lambda f: not f['num_roles'] and f['experience_terms'],
+             strengths=["Work experience section is present in resume"],
+             weaknesses=["Work experience details are not clearly structured - difficult to parse roles and timeline"],
+             recommendations=["Format experience as: Job Title | Company Name | Dates\n• Bullet point 1\n• Bullet point 2"]),
+        Rule(lambda f: not f['num_roles'],
+             weaknesses=["Experience/Work history section missing or not detectable - this is CRITICAL content"],
+             recommendations=["Add a prominent 'PROFESSIONAL EXPERIENCE' section with company names, job titles, dates, and 4-6 bullet points per role",
+                              "Use this format: [Job Title] at [Company] | [Start Date] - [End Date]"]),
+    ],
+
+    # Other sections
+    [
+        Rule(lambda f: f['education_terms'] and f['education_count'] >= 1,
+             strengths=["Educational background clearly presented with degree information"]),
+        Rule(lambda f: f['education_terms'],
+             strengths=["Education section is present in resume"]),
+        Rule(lambda f: True,
+             weaknesses=["Education section not found - missing important qualification information"],
+             recommendations=["Include EDUCATION section: Degree | Institution | Graduation Year | GPA (if 3.5+)"]),
+    ],
+    [
+        Rule(lambda f: f['project_terms'] and f['project_count'] >= 3,
+             strengths=["Multiple projects showcased - demonstrates hands-on experience and initiative"]),
+        Rule(lambda f: f['project_terms'],
+             strengths=["Projects or portfolio work mentioned - demonstrates practical application"]),
+        Rule(lambda f: f['builder_roles'],
+             recommendations=["Add PROJECTS section with 2-4 projects: brief description, technologies used, outcomes/impact"]),
+    ],
+    [
+        Rule(lambda f: f['certification_terms'],
+             strengths=["Professional certifications included - adds credibility and shows continuous learning"]),
+        Rule(lambda f: True,
+             recommendations=["Consider adding CERTIFICATIONS section (AWS, Azure, PMP, Scrum, Google Analytics, etc.)"]),
+    ],
+
+    # Achievements and impact
+    [
+        Rule(lambda f: f['action_verbs'] >= 5,
+             strengths=["Strong use of action verbs ({action_verbs} found) - demonstrates proactive contributions"]),
+        Rule(lambda f: f['action_verbs'] >= 3,
+             strengths=["Good use of action-oriented language"]),
+        Rule(lambda f: True,
+             weaknesses=["Limited use of strong action verbs - resume may appear passive"],
+             recommendations=["Start bullet points with power verbs: Developed, Implemented, Achieved, Led, Optimized, Delivered"]),
+    ],
+    [
+        Rule(lambda f: f['percent_count'] >= 2 or f['digit_count'] >= 10,
+             strengths=["Quantifiable metrics and data points included - demonstrates measurable impact"]),
+        Rule(lambda f: True,
+             weaknesses=["Lacks quantifiable achievements and metrics"],
+             recommendations=["Add numbers and metrics: 'Increased efficiency by 40%', 'Managed team of 8', 'Reduced costs by $50K'"]),
+    ],
+
+    # Keyword optimization
+    [
+        Rule(lambda f: f['industry_keywords'] >= 5,
+             strengths=["Good use of industry-relevant keywords - ATS-friendly and recruiter-optimized"]),
+        Rule(lambda f: f['industry_keywords'] >= 3,
+             recommendations=["Include more industry keywords to improve ATS (Applicant Tracking System) compatibility"]),
+        Rule(lambda f: True,
+             weaknesses=["Few industry-specific keywords detected - may not pass ATS screening"],
+             recommendations=["Research job descriptions and incorporate relevant keywords: cloud, agile, stakeholder, API, leadership"]),
+    ],
+
+    # Format and structure
+    [
+        Rule(lambda f: f['bullets'],
+             strengths=["Bullet points used effectively for readability and scanning"]),
+        Rule(lambda f: True,
+             weaknesses=["No bullet points detected - content may be hard to scan"],
+             recommendations=["Use bullet points to break down responsibilities and achievements for better readability"]),
+    ],
+    [
+        Rule(lambda f: f['date_terms'],
+             strengths=["Timeline and dates included - shows career progression"]),
+        Rule(lambda f: True,
+             recommendations=["Add dates (MM/YYYY format) to all experiences and education entries"]),
+    ],
+
+    # Professional polish
+    [
+        Rule(lambda f: f['first_person'] > 3,
+             weaknesses=["Excessive use of first-person pronouns or casual language"],
+             recommendations=["Remove 'I', 'my', 'we' - use direct statements: 'Developed solutions' not 'I developed solutions'"]),
+        Rule(lambda f: f['first_person'] == 0,
+             strengths=["Professional third-person writing style maintained throughout"]),
+    ],
+    [
+        Rule(lambda f: f['estimated_pages'] > 2.5,
+             weaknesses=["Resume likely exceeds 2 pages (approximately {estimated_pages:.1f} pages)"],
+             recommendations=["Trim to 1-2 pages by removing older or less relevant experiences"]),
+    ],
+
+    # Missing elements
+    [
+        Rule(lambda f: not f['profile_links'],
+             recommendations=["Add LinkedIn profile URL and GitHub/portfolio links to increase credibility and showcase work"]),
+    ],
+    [
+        Rule(lambda f: not f['summary_terms'],
+             recommendations=["Consider adding a 3-4 line professional summary at the top highlighting key strengths and career goals"]),
+    ],
+]
+
+
+def count_digits(text: str) -> int:
+    """Characters of text for which str.isdigit() holds; ASCII text is counted with str.count"""
+    if text.isascii():
+        return sum(map(text.count, '0123456789'))
+    return sum(char.isdigit() for char in text)
+
+
+def extract_features(resume_data: Dict, resume_text: str) -> Dict:
+    """Compute the feature vector every rule is evaluated against"""
+    text_lower = resume_text.lower()
+    features = {
+        group: sum(1 for keyword in keywords if keyword in text_lower) if group in COUNTED_GROUPS
+        else any(keyword in text_lower for keyword in keywords)
+        for group, keywords in TEXT_KEYWORDS.items()
+    }
+
+    email = resume_data.get('email')
+    skills = resume_data.get('skills', [])
+    work_experience = resume_data.get('work_experience', [])
+    word_count = len(resume_text.split())
+    num_roles = len(work_experience)
+
+    features.update({
+        'has_email': bool(email),
+        'unprofessional_email': bool(email) and UNPROFESSIONAL_EMAIL_PATTERN.search(email.lower()) is not None,
+        'has_phone': bool(resume_data.get('phone')),
+        'skills_count': len(skills),
+        'tech_skills_count': sum(1 for skill in skills if TECH_SKILL_PATTERN.search(skill.lower())),
+        'word_count': word_count,
+        'estimated_pages': word_count / 400,
+        'num_roles': num_roles,
+        'roles_with_dates': sum(1 for exp in work_experience if exp.get('date_range')),
+        'total_duration': sum(exp['duration_years'] for exp in work_experience if exp.get('duration_years')),
+        'avg_bullets': sum(exp.get('bullet_points', 0) for exp in work_experience) / num_roles if num_roles else 0,
+        'roles_with_clear_titles': sum(
+            1 for exp in work_experience if CLEAR_TITLE_PATTERN.search(exp.get('title_line', '').lower())
+        ),
+        'education_count': len(resume_data.get('education', [])),
+        'project_count': text_lower.count('project'),
+        'digit_count': count_digits(resume_text),
+        'percent_count': resume_text.count('%'),
+    })
+    return features
+
+
+def apply_rules(features: Dict, rules: List[List[Rule]] = RULES) -> Dict[str, List[str]]:
+    """Evaluate every rule group against the features and collect the messages"""
+    results = {'strengths': [], 'weaknesses': [], 'recommendations': []}
+    for group in rules:
+        for rule in group:
+            if rule.when(features):
+                for field in results:
+                    results[field].extend(message.format_map(features) for message in getattr(rule, field))
+                break
+    return results
+
+
+@timed('fallback')
+def generate_fallback_analysis(resume_data: Dict, resume_text: str) -> Dict:
+    """Generate comprehensive deep analysis when AI is unavailable"""
+    FALLBACK_ANALYSES.inc()
+    features = extract_features(resume_data, resume_text)
+    results = apply_rules(features)
+    strengths = results['strengths']
+    weaknesses = results['weaknesses']
+    recommendations = results['recommendations']
+    word_count = features['word_count']
+
+    summary = f"Comprehensive resume analysis completed. Identified {len(strengths)} key strengths and {len(weaknesses)} areas requiring attention. "
+
+    if features['skills_count'] > 0:
+        summary += f"Detected {features['skills_count']} skills across various domains. "
+
+    if features['action_verbs'] >= 5:
+        summary += "Strong achievement-oriented language observed. "
+
+    if features['industry_keywords'] >= 5:
+        summary += "Good keyword optimization for ATS systems. "
+
+    if word_count < 300:
+        summary += "Resume requires substantial expansion with detailed experiences. "
+    elif word_count > 900:
+        summary += "Consider condensing content for improved impact. "
+    else:
+        summary += "Resume length is within acceptable range. "
+
+    summary += f"Review {len(recommendations)} specific recommendations below to enhance your resume's competitiveness and increase interview callbacks."
+
+    # Ensure minimum content in each section
+    if not strengths:
+        strengths.append("Resume structure has been successfully parsed and core information extracted")
+    if not weaknesses:
+        weaknesses.append("Continue refining content to stay current with industry trends")
+    if not recommendations:
+        recommendations.append("Maintain resume updates quarterly with new skills, achievements, and experiences")
+
+    return {
+        'summary': summary,
+        'strengths': strengths,
+        'weaknesses': weaknesses,
+        'recommendations': recommendations
+    }
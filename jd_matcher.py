@@ -0,0 +1,144 @@
+import math
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+from resume_parser import COMMON_SKILLS, TOKEN_PATTERN
+
+# Words that say nothing about a candidate's fit, including job-ad boilerplate
+STOP_WORDS = frozenset('''
+a about above after all also an and any are as at be been being both but by can could do does for from had has have
+having he her his how i if in into is it its just may me more most must my no not of on once only or other our out over
+own per same she should so some such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your
+ability able apply candidate candidates description etc excellent experience good great including join job knowledge
+looking plus preferred position related required requirements responsibilities role skills strong team using work
+working years year
+'''.split())
+
+# Multi-word skills matched as single terms ("machine learning", "rest api")
+PHRASES = frozenset(
+    ' '.join(tokens) for tokens in (TOKEN_PATTERN.findall(skill) for skill in COMMON_SKILLS) if len(tokens) > 1
+)
+
+
+def extract_terms(text: str) -> List[str]:
+    """Lowercase index terms of a text: words without stop words and numbers, plus known skill phrases"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    terms = [token for token in tokens if token not in STOP_WORDS and not token[0].isdigit() and len(token) > 1]
+    terms.extend(phrase for phrase in map(' '.join, zip(tokens, tokens[1:])) if phrase in PHRASES)
+    return terms
+
+
+class BM25Index:
+    """Sparse BM25 index over resumes that grows one document at a time
+
+    Postings map each term to the term frequency per document, so adding or
+    removing a resume touches only its own terms and nothing is rebuilt.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, max_documents: Optional[int] = None):
+        """max_documents bounds the index; the oldest resumes are dropped first"""
+        self.k1 = k1
+        self.b = b
+        self.max_documents = max_documents
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._documents = OrderedDict()  # doc_id -> (length, terms)
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add(self, doc_id: str, text: str) -> bool:
+        """Index a resume; returns False if doc_id was already indexed"""
+        term_counts = Counter(extract_terms(text))
+        length = sum(term_counts.values())
+        with self._lock:
+            if doc_id in self._documents:
+                return False
+            for term, count in term_counts.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+            self._documents[doc_id] = (length, tuple(term_counts))
+            self._total_length += length
+            while self.max_documents is not None and len(self._documents) > self.max_documents:
+                self._remove(next(iter(self._documents)))
+        return True
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            if doc_id in self._documents:
+                self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        length, terms = self._documents.pop(doc_id)
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency; positive even for terms in every resume"""
+        n = len(self._documents)
+        df = len(self._postings.get(term, ()))
+        return math.log((n - df + 0.5) / (df + 0.5) + 1)
+
+    def _term_score(self, term_frequency: int, length: int, avg_length: float) -> float:
+        """Saturating BM25 term frequency component"""
+        norm = 1 - self.b + self.b * length / avg_length if avg_length else 1
+        return term_frequency * (self.k1 + 1) / (term_frequency + self.k1 * norm)
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """(doc_id, BM25 score) of the indexed resumes best matching a query, best first"""
+        query_terms = set(extract_terms(query))
+        scores = Counter()
+        with self._lock:
+            avg_length = self._total_length / len(self._documents) if self._documents else 0
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                weight = self.idf(term)
+                for doc_id, count in postings.items():
+                    scores[doc_id] += weight * self._term_score(count, self._documents[doc_id][0], avg_length)
+        return [(doc_id, round(score, 4)) for doc_id, score in scores.most_common(top_k)]
+
+    def match(self, resume_text: str, job_description: str) -> Dict:
+        """Local job-description match: 0-100 score with matched and missing keywords
+
+        The score is the resume's BM25 score for the job description's terms
+        relative to a resume that contains every one of them. Terms that are
+        rare among indexed resumes weigh more, and keywords are listed most
+        distinctive first.
+        """
+        job_terms = list(dict.fromkeys(extract_terms(job_description)))
+        resume_counts = Counter(extract_terms(resume_text))
+        length = sum(resume_counts.values())
+
+        with self._lock:
+            avg_length = self._total_length / len(self._documents) if self._documents else length
+            weights = {term: self.idf(term) for term in job_terms}
+
+        score = 0.0
+        best = 0.0
+        matched = []
+        missing = []
+        for term in sorted(job_terms, key=weights.get, reverse=True):
+            best += weights[term] * (self.k1 + 1)
+            count = resume_counts[term]
+            if count:
+                score += weights[term] * self._term_score(count, length, avg_length)
+                matched.append(term)
+            else:
+                missing.append(term)
+
+        return {
+            'score': round(min(score / best, 1.0) * 100, 1) if best else 0.0,
+            'matched_keywords': matched,
+            'missing_keywords': missing,
+            'indexed_resumes': len(self._documents)
+        }
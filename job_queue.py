@@ -0,0 +1,178 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+# Pipelines receive their payload and a progress(stage, fraction) callback
+Pipeline = Callable[[Dict, Callable[[str, float], None]], Dict]
+
+
+class InMemoryJobStore:
+    """Job records kept in process memory"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict):
+        with self._lock:
+            self._jobs[job['id']] = dict(job)
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def prune(self, finished_before: float):
+        """Forget completed and failed jobs that finished before the given time"""
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job['status'] in (COMPLETED, FAILED) and job['finished_at'] < finished_before]:
+                del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """Job records persisted in SQLite so status and results survive restarts and are shared by worker processes
+    
+    Each job records the pid of the process running it. Payloads are not
+    persisted, so a job whose process is gone cannot resume; whoever manages the
+    processes marks such jobs failed with fail_unfinished (serve.py does, at
+    startup and when a worker exits).
+    """
+
+    _COLUMNS = ('id', 'status', 'stage', 'progress', 'result', 'error', 'created_at', 'started_at', 'finished_at')
+
+    def __init__(self, db_path: str):
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, status TEXT, stage TEXT, progress REAL, '
+                'result TEXT, error TEXT, created_at REAL, started_at REAL, finished_at REAL, owner INTEGER)'
+            )
+            # Files written before jobs recorded their process
+            if 'owner' not in {row[1] for row in self._db.execute('PRAGMA table_info(jobs)')}:
+                self._db.execute('ALTER TABLE jobs ADD COLUMN owner INTEGER')
+            self._db.commit()
+
+    def fail_unfinished(self, owner: Optional[int] = None) -> int:
+        """Mark queued and running jobs failed, only those of the process with pid owner when given; returns how many"""
+        query = 'UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)'
+        params = [FAILED, 'Interrupted by server restart', time.time(), QUEUED, RUNNING]
+        if owner is not None:
+            query += ' AND owner = ?'
+            params.append(owner)
+        with self._lock:
+            count = self._db.execute(query, params).rowcount
+            self._db.commit()
+        return count
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def create(self, job: Dict):
+        row = [job.get(column) for column in self._COLUMNS]
+        row[4] = json.dumps(row[4]) if row[4] is not None else None
+        with self._lock:
+            self._db.execute(f'INSERT INTO jobs ({", ".join(self._COLUMNS)}, owner) VALUES ({", ".join(["?"] * 10)})',
+                             (*row, os.getpid()))
+            self._db.commit()
+
+    def update(self, job_id: str, **fields):
+        if 'result' in fields and fields['result'] is not None:
+            fields['result'] = json.dumps(fields['result'])
+        assignments = ', '.join(f'{column} = ?' for column in fields)
+        with self._lock:
+            self._db.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*fields.values(), job_id))
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(f'SELECT {", ".join(self._COLUMNS)} FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self._COLUMNS, row))
+        if job['result'] is not None:
+            job['result'] = json.loads(job['result'])
+        return job
+
+    def prune(self, finished_before: float):
+        """Forget completed and failed jobs that finished before the given time"""
+        with self._lock:
+            self._db.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?', (COMPLETED, FAILED, finished_before)
+            )
+            self._db.commit()
+
+
+def fail_unfinished_jobs(db_path: str, owner: Optional[int] = None) -> int:
+    """SQLiteJobStore.fail_unfinished on the file at db_path, for processes that run no jobs themselves"""
+    store = SQLiteJobStore(db_path)
+    try:
+        return store.fail_unfinished(owner)
+    finally:
+        store.close()
+
+
+class JobQueue:
+    """Runs a pipeline on a local worker pool and tracks each run as a pollable job"""
+
+    def __init__(self, pipeline: Pipeline, store=None, workers: int = 4, retention_seconds: float = 24 * 3600):
+        """store defaults to InMemoryJobStore; finished jobs are kept for retention_seconds"""
+        self.pipeline = pipeline
+        self.store = store or InMemoryJobStore()
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job-worker')
+
+    def submit(self, payload: Dict) -> str:
+        """Queue a pipeline run and return its job ID immediately"""
+        self.store.prune(time.time() - self.retention_seconds)
+        job_id = uuid.uuid4().hex
+        self.store.create({
+            'id': job_id,
+            'status': QUEUED,
+            'stage': 'queued',
+            'progress': 0.0,
+            'result': None,
+            'error': None,
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None
+        })
+        self._executor.submit(self._run, job_id, payload)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Current status, progress and (once completed) result of a job"""
+        return self.store.get(job_id)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job_id: str, payload: Dict):
+        self.store.update(job_id, status=RUNNING, stage='started', started_at=time.time())
+
+        def progress(stage: str, fraction: float):
+            self.store.update(job_id, stage=stage, progress=round(fraction, 3))
+
+        try:
+            result = self.pipeline(payload, progress)
+            self.store.update(job_id, status=COMPLETED, stage='done', progress=1.0,
+                              result=result, finished_at=time.time())
+        except Exception as e:
+            self.store.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
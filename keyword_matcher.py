@@ -0,0 +1,88 @@
+import re
+from collections import namedtuple
+from typing import Dict, Iterable, List
+
+# A single keyword occurrence: the canonical (lowercase) keyword, the category
+# it was registered under and its character offsets in the scanned text.
+KeywordHit = namedtuple('KeywordHit', ['keyword', 'category', 'start', 'end'])
+
+# Characters that may not touch either end of a keyword. This is a word
+# boundary that also works for keywords ending in symbols (c++, node.js, b.s.)
+_WORD_CHARS = 'a-z0-9'
+
+
+def _normalize(keyword: str) -> str:
+    """Canonical form of a keyword: lowercase with single spaces"""
+    return ' '.join(keyword.lower().split())
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex alternation shaped like a trie so shared prefixes are only tried once"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        terminal = '' in node
+        branches = []
+        for char in sorted(c for c in node if c):
+            atom = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(atom + build(node[char]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Optional, greedy continuation: the longest keyword wins at each offset
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Precompiled multi-keyword matcher that scans text once for every category"""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        """Compile all keywords of all categories into a single regex"""
+        self._categories: Dict[str, List[str]] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                owners = self._categories.setdefault(_normalize(keyword), [])
+                if category not in owners:
+                    owners.append(category)
+
+        # Zero-width lookahead lets matches overlap, so 'rest api' and 'api'
+        # are both reported. At any one offset only the longest keyword is.
+        self.pattern = re.compile(
+            r'(?=(?<![%s])(%s)(?![%s]))' % (_WORD_CHARS, _trie_pattern(self._categories), _WORD_CHARS),
+            re.IGNORECASE
+        )
+
+    def categories_of(self, keyword: str) -> List[str]:
+        """Categories a keyword was registered under"""
+        return list(self._categories.get(_normalize(keyword), []))
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """Return every keyword hit in text, ordered by offset"""
+        hits = []
+        for match in self.pattern.finditer(text):
+            keyword = _normalize(match.group(1))
+            start, end = match.span(1)
+            for category in self._categories[keyword]:
+                hits.append(KeywordHit(keyword, category, start, end))
+        return hits
+
+    def group_by_category(self, text: str) -> Dict[str, List[KeywordHit]]:
+        """Return hits bucketed by category, each bucket ordered by offset"""
+        grouped: Dict[str, List[KeywordHit]] = {}
+        for hit in self.find_all(text):
+            grouped.setdefault(hit.category, []).append(hit)
+        return grouped
+
+    @staticmethod
+    def unique_keywords(hits: Iterable[KeywordHit]) -> List[str]:
+        """Distinct keywords of hits in order of first appearance"""
+        return list(dict.fromkeys(hit.keyword for hit in hits))
@@ -0,0 +1,199 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+# Status codes worth retrying; anything else (400, 401, 404...) fails at once
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker
+
+    After failure_threshold failed calls in a row the circuit opens and calls
+    are refused for reset_timeout seconds. Then one trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half_open'
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one trial call is allowed"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def stats(self) -> Dict:
+        return {'state': self.state, 'consecutive_failures': self._failures}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections are retried"""
+    from openai import APIConnectionError, APIStatusError  # Loaded by the client that raised error
+    if isinstance(error, APIStatusError):
+        return error.status_code in RETRYABLE_STATUS
+    return isinstance(error, APIConnectionError)  # Includes APITimeoutError
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After-Ms or Retry-After (seconds or HTTP date)"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+class ResilientLLM:
+    """Shared wrapper for LLM calls: concurrency limit, retries with backoff and a circuit breaker
+
+    At most max_concurrency calls are in flight at once. Retryable failures
+    are retried up to max_retries times with exponential backoff and full
+    jitter, waiting at least as long as a Retry-After header asks (capped at
+    max_delay). A call that still fails counts against the circuit breaker;
+    while it is open, calls raise CircuitOpenError without reaching the API.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_retries: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 20.0, breaker: Optional[CircuitBreaker] = None):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._async_semaphore = None
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number attempt (0-based)"""
+        delay = random.uniform(0, min(self.base_delay * 2 ** attempt, self.max_delay))
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay))
+        return delay
+
+    def _check_circuit(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError('AI service unavailable, circuit breaker is open')
+
+    def _record(self, error: Optional[Exception]):
+        if error is None:
+            self.breaker.record_success()
+        elif is_retryable(error):
+            self.breaker.record_failure()
+        else:
+            # The upstream answered; a bad request says nothing about its health
+            self.breaker.record_success()
+
+    def call(self, request: Callable[[], Any]) -> Any:
+        """Run request() (e.g. a chat-completion call) under the limiter, retries and breaker"""
+        self._check_circuit()
+        with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    result = request()
+                except Exception as e:
+                    if attempt < self.max_retries and is_retryable(e):
+                        time.sleep(self.backoff(attempt, e))
+                        continue
+                    self._record(e)
+                    raise
+                self._record(None)
+                return result
+
+    def stream(self, request: Callable[[], Iterator]) -> Iterator:
+        """Like call for a streaming request; the concurrency slot is held until the stream is consumed"""
+        self._check_circuit()
+        self._semaphore.acquire()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    stream = request()
+                    break
+                except Exception as e:
+                    if attempt < self.max_retries and is_retryable(e):
+                        time.sleep(self.backoff(attempt, e))
+                        continue
+                    self._record(e)
+                    raise
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self._record(None)
+        return self._release_after(stream)
+
+    def _release_after(self, stream: Iterator) -> Iterator:
+        try:
+            yield from stream
+        finally:
+            self._semaphore.release()
+
+    async def acall(self, request: Callable[[], Awaitable]) -> Any:
+        """Asyncio variant of call; the limit applies to the event loop of the first call"""
+        self._check_circuit()
+        if self._async_semaphore is None:
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._async_semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    result = await request()
+                except Exception as e:
+                    if attempt < self.max_retries and is_retryable(e):
+                        await asyncio.sleep(self.backoff(attempt, e))
+                        continue
+                    self._record(e)
+                    raise
+                self._record(None)
+                return result
+
+    def stats(self) -> Dict:
+        return {'max_concurrency': self.max_concurrency, 'circuit': self.breaker.stats()}
@@ -0,0 +1,95 @@
+import marshal
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# First byte of ParsedResume.to_bytes() output; bump it when the field layout changes
+FORMAT_VERSION = 1
+
+
+@dataclass
+class WorkExperience:
+    """One entry of a resume's work history"""
+    __slots__ = ('title_line', 'date_range', 'duration_years', 'bullet_points')
+    title_line: str
+    date_range: Optional[str]
+    duration_years: Optional[int]
+    bullet_points: int
+
+    def to_dict(self) -> Dict:
+        return {
+            'title_line': self.title_line,
+            'date_range': self.date_range,
+            'duration_years': self.duration_years,
+            'bullet_points': self.bullet_points
+        }
+
+
+@dataclass
+class ParsedResume:
+    """Structured data ResumeParser extracts from one resume
+
+    Skill names are interned, so cached resumes listing the same skills share
+    one string per skill. full_text is None when the text is kept elsewhere,
+    as in the result cache, which stores it next to the parse result.
+    """
+    __slots__ = ('email', 'phone', 'skills', 'experience_years', 'education', 'work_experience', 'full_text')
+    email: str
+    phone: str
+    skills: List[str]
+    experience_years: int
+    education: List[str]
+    work_experience: List[WorkExperience]
+    full_text: Optional[str]
+
+    def __post_init__(self):
+        self.skills = [sys.intern(skill) for skill in self.skills]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ParsedResume':
+        """From a ResumeParser.parse_resume dict"""
+        return cls(
+            email=data.get('email', ''),
+            phone=data.get('phone', ''),
+            skills=list(data.get('skills', [])),
+            experience_years=data.get('experience_years', 0),
+            education=list(data.get('education', [])),
+            work_experience=[WorkExperience(**entry) for entry in data.get('work_experience', [])],
+            full_text=data.get('full_text')
+        )
+
+    def to_dict(self, full_text: bool = True) -> Dict:
+        """The ResumeParser.parse_resume dict; full_text is left out when not wanted or not kept"""
+        data = {
+            'email': self.email,
+            'phone': self.phone,
+            'skills': list(self.skills),
+            'experience_years': self.experience_years,
+            'education': list(self.education),
+            'work_experience': [entry.to_dict() for entry in self.work_experience]
+        }
+        if full_text and self.full_text is not None:
+            data['full_text'] = self.full_text
+        return data
+
+    def to_bytes(self, full_text: bool = True) -> bytes:
+        """Compact binary form for caches: a format version byte and the fields as a marshalled tuple"""
+        fields = (
+            self.email, self.phone, tuple(self.skills), self.experience_years, tuple(self.education),
+            tuple((entry.title_line, entry.date_range, entry.duration_years, entry.bullet_points)
+                  for entry in self.work_experience),
+            self.full_text if full_text else None
+        )
+        return bytes([FORMAT_VERSION]) + marshal.dumps(fields)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'ParsedResume':
+        """Read back to_bytes() output; only for bytes this application wrote itself
+
+        Raises ValueError for data in another format.
+        """
+        if not data or data[0] != FORMAT_VERSION:
+            raise ValueError('Unsupported parsed resume format')
+        email, phone, skills, years, education, work_experience, full_text = marshal.loads(data[1:])
+        return cls(email, phone, list(skills), years, list(education),
+                   [WorkExperience(*entry) for entry in work_experience], full_text)
@@ -0,0 +1,155 @@
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from resume_parser import SECTION_HEADER_PATTERN
+
+try:
+    import tiktoken
+except ImportError:  # Optional: exact counts for OpenAI models
+    tiktoken = None
+
+# Resume tokens sent per prompt; the rest is cut by section priority
+DEFAULT_MAX_TOKENS = 3000
+
+# Sections kept first when a resume is over budget, by header keyword; lower is more important.
+# Text before the first header (name, contact details) always ranks first.
+SECTION_PRIORITY = [
+    (('experience', 'employment', 'work history', 'career'), 1),
+    (('skills',), 2),
+    (('summary', 'objective'), 3),
+    (('education',), 4),
+    (('projects', 'certification'), 5),
+    (('awards', 'honors', 'publications', 'languages', 'volunteer'), 6),
+    (('interests', 'references'), 8),
+]
+DEFAULT_SECTION_PRIORITY = 7
+
+# Appended where a section was cut so the model does not read it as missing
+TRUNCATION_MARKER = '[...]'
+
+# Lines that only number pages: "3", "- 3 -", "Page 3", "Page 3 of 5", "3/5"
+PAGE_NUMBER_PATTERN = re.compile(r'^[-–\s]*(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?[-–\s]*$', re.IGNORECASE)
+
+# A line seen this often is a page header or footer; it is kept only once
+REPEATED_LINE_MIN = 2
+
+_SPACES = re.compile(r'[ \t\f\v\u00a0\u2000-\u200b\u3000]+')
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of text: exact with tiktoken installed, otherwise about 4 characters per token"""
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def normalize_lines(text: str) -> List[str]:
+    """Lines with runs of spaces collapsed, page numbers dropped and blank runs reduced to one"""
+    lines = []
+    for line in text.splitlines():
+        line = _SPACES.sub(' ', line).strip()
+        if PAGE_NUMBER_PATTERN.match(line):
+            continue
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def deduplicate_lines(lines: List[str]) -> List[str]:
+    """Keep the first occurrence of each repeated line; section headers and blank lines are left alone"""
+    counts = Counter(line.lower() for line in lines if line)
+    seen = set()
+    result = []
+    for line in lines:
+        key = line.lower()
+        if line and counts[key] >= REPEATED_LINE_MIN and not SECTION_HEADER_PATTERN.match(line):
+            if key in seen:
+                continue
+            seen.add(key)
+        result.append(line)
+    return result
+
+
+def section_priority(header: Optional[str]) -> int:
+    """SECTION_PRIORITY of a section header; None stands for the text before the first header"""
+    if header is None:
+        return 0
+    header = header.lower()
+    for keywords, priority in SECTION_PRIORITY:
+        if any(keyword in header for keyword in keywords):
+            return priority
+    return DEFAULT_SECTION_PRIORITY
+
+
+def split_sections(lines: List[str]) -> List[Tuple[int, List[str]]]:
+    """(priority, lines) per section, in document order; each section starts at its header line"""
+    sections = [(section_priority(None), [])]
+    for line in lines:
+        header = SECTION_HEADER_PATTERN.match(line)
+        if header:
+            sections.append((section_priority(header.group(1)), []))
+        sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def truncate_sections(lines: List[str], max_tokens: int) -> Tuple[List[str], bool]:
+    """Fit lines into max_tokens, keeping whole sections in priority order and cutting
+    the first one that does not fit; returns (lines, whether anything was cut)"""
+    sections = split_sections(lines)
+    costs = [[estimate_tokens(line + '\n') for line in section_lines] for _, section_lines in sections]
+    marker_cost = estimate_tokens(TRUNCATION_MARKER + '\n')
+    budget = max_tokens
+    kept = [[] for _ in sections]
+    truncated = False
+
+    for index in sorted(range(len(sections)), key=lambda i: sections[i][0]):
+        section_lines = sections[index][1]
+        if sum(costs[index]) <= budget:
+            kept[index] = section_lines
+            budget -= sum(costs[index])
+            continue
+        truncated = True
+        # The marker is only paid for when part of the section is kept
+        room = budget - marker_cost
+        for line, cost in zip(section_lines, costs[index]):
+            if cost > room:
+                if not kept[index] and room > 0:
+                    # One long line, as from a PDF without line breaks: keep its start
+                    kept[index].append(line[:len(line) * room // cost])
+                    room = 0
+                break
+            kept[index].append(line)
+            room -= cost
+        if kept[index]:
+            kept[index].append(TRUNCATION_MARKER)
+            budget = max(room, 0)
+
+    return [line for section_lines in kept for line in section_lines], truncated
+
+
+def compact_resume(text: str, max_tokens: Optional[int] = DEFAULT_MAX_TOKENS) -> Tuple[str, Dict]:
+    """Resume text cleaned up for a prompt, and the token savings
+
+    Normalizes whitespace, drops page numbers and repeated page headers or
+    footers, removes duplicate lines and, when max_tokens is set, cuts the
+    lowest-priority sections to fit.
+    """
+    original_tokens = estimate_tokens(text)
+    lines = deduplicate_lines(normalize_lines(text))
+    truncated = False
+    if max_tokens is not None and estimate_tokens('\n'.join(lines)) > max_tokens:
+        lines, truncated = truncate_sections(lines, max_tokens)
+    compacted = '\n'.join(lines)
+    compacted_tokens = estimate_tokens(compacted)
+    return compacted, {
+        'original_tokens': original_tokens,
+        'compacted_tokens': compacted_tokens,
+        'tokens_saved': max(original_tokens - compacted_tokens, 0),
+        'truncated': truncated
+    }
@@ -0,0 +1,176 @@
+import hashlib
+import marshal
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional
+from metrics import METRICS, Counter
+
+CACHE_LOOKUPS = METRICS.counter('resume_analyzer_cache_lookups_total', 'Result cache lookups by outcome')
+
+# The on-disk tier drops expired rows and trims to max_disk_entries once every this many writes
+DISK_PRUNE_INTERVAL = 100
+
+
+def encode_value(value: Dict) -> bytes:
+    """Compact binary form of a cached value for the on-disk tier (marshal, then zlib)"""
+    return zlib.compress(marshal.dumps(value))
+
+
+def decode_value(data: bytes) -> Dict:
+    """Inverse of encode_value; raises ValueError for rows in another format"""
+    try:
+        return marshal.loads(zlib.decompress(data))
+    except (TypeError, EOFError, zlib.error) as e:
+        raise ValueError(f"Unreadable cache entry: {e}")
+
+
+def make_cache_key(content: bytes, job_description: str = "", model: str = "", kind: str = "analysis") -> str:
+    """SHA-256 over the content bytes, job description, model name and result kind"""
+    digest = hashlib.sha256()
+    for part in (kind.encode('utf-8'), model.encode('utf-8'), job_description.encode('utf-8'), content):
+        # Length-prefix every part so different splits never collide
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-tier result cache: bounded in-memory LRU with TTL, optional SQLite tier that survives restarts"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, db_path: Optional[str] = None,
+                 lookups: Counter = CACHE_LOOKUPS, max_disk_entries: int = 10000):
+        """Create the cache; db_path enables the on-disk tier, lookups counts hits and misses
+
+        The on-disk tier keeps the max_disk_entries most recently written rows,
+        give or take DISK_PRUNE_INTERVAL writes per process between prunes.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.lookups = lookups
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'memory_hits': 0, 'disk_hits': 0, 'evictions': 0,
+                          'disk_evictions': 0}
+        self._disk_writes = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)')
+            self._prune_disk(time.time())
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached value for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    self._counters['memory_hits'] += 1
+                    self.lookups.inc(result='memory_hit')
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT value, expires_at FROM results WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    try:
+                        value = decode_value(row[0]) if row[1] > now else None
+                    except ValueError:
+                        value = None  # Written by an older version, or by another Python
+                    if value is not None:
+                        self._remember(key, value, row[1])
+                        self._counters['hits'] += 1
+                        self._counters['disk_hits'] += 1
+                        self.lookups.inc(result='disk_hit')
+                        return value
+                    self._db.execute('DELETE FROM results WHERE key = ?', (key,))
+                    self._db.commit()
+
+            self._counters['misses'] += 1
+            self.lookups.inc(result='miss')
+            return None
+
+    def __contains__(self, key: str) -> bool:
+        """Whether key has an unexpired entry; not counted as a lookup and leaves the LRU order alone"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return True
+            if self._db is not None:
+                return self._db.execute(
+                    'SELECT 1 FROM results WHERE key = ? AND expires_at > ?', (key, now)
+                ).fetchone() is not None
+        return False
+
+    def set(self, key: str, value: Dict):
+        """Store a value made of dicts, lists, strings, bytes, numbers and None under key"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, encode_value(value), expires_at)
+                )
+                self._disk_writes += 1
+                if self._disk_writes % DISK_PRUNE_INTERVAL == 0:
+                    self._prune_disk(now)
+                else:
+                    self._db.commit()
+
+    def reopen(self):
+        """Reconnect the on-disk tier; SQLite connections must not be shared with a forked process"""
+        if self.db_path:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM results')
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['size'] = len(self._entries)
+            stats['max_entries'] = self.max_entries
+            stats['persistent'] = self._db is not None
+            return stats
+
+    def _prune_disk(self, now: float):
+        """Delete expired rows, then all but the max_disk_entries latest to expire (the latest written)"""
+        self._db.execute('DELETE FROM results WHERE expires_at <= ?', (now,))
+        trimmed = self._db.execute(
+            'DELETE FROM results WHERE key IN '
+            '(SELECT key FROM results ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_disk_entries,)
+        )
+        self._counters['disk_evictions'] += trimmed.rowcount
+        self._db.commit()
+
+    def _remember(self, key: str, value: Dict, expires_at: float):
+        """Insert into the memory tier, evicting the least recently used entry when full"""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
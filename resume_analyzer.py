@@ -0,0 +1,176 @@
+"""Command-line tools that run the analysis pipeline without the Flask server
+
+    python -m resume_analyzer batch <dir> [--jd jd.txt] [--workers N] [--out results.jsonl] [--ai]
+
+`batch` analyzes every PDF and DOCX file under <dir> and appends one JSON line
+per resume to --out as soon as it is ready. Each line carries a content_hash
+of the file, the job description and the analyzer, and a rerun skips the
+hashes already in --out, so an interrupted run picks up where it stopped.
+Resumes that failed, or whose AI call failed, are retried by a rerun, which
+appends a new line for them.
+Resumes get the rule-based analysis and a local bulk_scoring score, or with
+--ai, the AI analysis and scores (OPENAI_API_KEY, with the fallback per resume
+when a call fails).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import Iterator, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from batch_analyzer import ALLOWED_EXTENSIONS, BatchAnalyzer
+from fallback_analysis import generate_fallback_analysis
+from result_cache import make_cache_key
+
+# Seconds between progress lines on stderr
+PROGRESS_INTERVAL = 2.0
+
+
+def find_resumes(directory: str) -> List[str]:
+    """Paths of the resume files under directory, in a stable order"""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for filename in sorted(files):
+            if '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS:
+                paths.append(os.path.join(root, filename))
+    return paths
+
+
+def load_processed(out_path: str) -> Set[str]:
+    """content_hash of every finished result in out_path; drops a last line cut off by an interruption
+
+    Results with an error or an ai_error are left out, so a rerun retries them.
+    """
+    if not os.path.exists(out_path):
+        return set()
+    with open(out_path, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+    processed = set()
+    for line in data.splitlines(keepends=True):
+        if line.endswith(b'\n'):
+            try:
+                result = json.loads(line)
+                if 'error' not in result and 'ai_error' not in result:
+                    processed.add(result['content_hash'])
+            except (ValueError, KeyError):
+                continue
+    return processed
+
+
+class Progress:
+    """Counts finished, skipped and failed resumes and reports throughput on stderr"""
+
+    def __init__(self, total: int = 0, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.analyzed = self.skipped = self.failed = 0
+        self.started = self._reported = time.perf_counter()
+
+    def update(self, result: Optional[dict] = None):
+        """Count one result (None: a skipped file) and report at most every PROGRESS_INTERVAL seconds"""
+        if result is None:
+            self.skipped += 1
+        else:
+            self.analyzed += 1
+            self.failed += 'error' in result
+        now = time.perf_counter()
+        if now - self._reported >= PROGRESS_INTERVAL:
+            self._reported = now
+            print(f"[{self.analyzed + self.skipped}/{self.total}] {self.rate():.1f} resumes/s, "
+                  f"{self.skipped} skipped, {self.failed} failed", file=self.stream)
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started
+        return self.analyzed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"Analyzed {self.analyzed} resumes in {time.perf_counter() - self.started:.1f} s "
+                f"({self.rate():.1f} resumes/s); {self.skipped} skipped, {self.failed} failed")
+
+
+def run_batch(directory: str, out_path: str, job_description: str = "", batch: Optional[BatchAnalyzer] = None,
+              progress: Optional[Progress] = None) -> Progress:
+    """Analyze the resumes under directory that are not in out_path yet, appending results as JSON lines"""
+    batch = batch or BatchAnalyzer(None, generate_fallback_analysis)
+    paths = find_resumes(directory)
+    progress = progress or Progress()
+    progress.total = len(paths)
+    processed = load_processed(out_path)
+    hashes = deque()
+
+    def pending() -> Iterator[Tuple[str, bytes]]:
+        """Files not analyzed yet, read one at a time as the batch asks for them"""
+        for path in paths:
+            with open(path, 'rb') as f:
+                data = f.read()
+            content_hash = make_cache_key(data, job_description, batch.model, kind='batch')
+            if content_hash in processed:
+                progress.update()
+                continue
+            processed.add(content_hash)  # Copies of a file are analyzed once
+            hashes.append(content_hash)
+            yield os.path.relpath(path, directory).replace(os.sep, '/'), data
+
+    with open(out_path, 'a', encoding='utf-8') as out:
+        for result in batch.iter_results(pending(), job_description):
+            # Flushed per line, so an interruption loses at most the resumes in flight
+            out.write(json.dumps({'content_hash': hashes.popleft(), **result}) + '\n')
+            out.flush()
+            progress.update(result)
+    return progress
+
+
+def batch_command(args: argparse.Namespace) -> int:
+    job_description = ""
+    if args.jd:
+        with open(args.jd, encoding='utf-8') as f:
+            job_description = f.read()
+
+    ai_analyzer = None
+    if args.ai:
+        if not os.getenv('OPENAI_API_KEY'):
+            print("--ai needs OPENAI_API_KEY", file=sys.stderr)
+            return 2
+        from ai_analyzer import AIAnalyzer
+        ai_analyzer = AIAnalyzer(api_key=os.getenv('OPENAI_API_KEY'))
+
+    batch = BatchAnalyzer(ai_analyzer, generate_fallback_analysis, parse_workers=args.workers,
+                          llm_concurrency=args.llm_concurrency)
+    progress = Progress()
+    try:
+        run_batch(args.directory, args.out, job_description, batch, progress)
+    except KeyboardInterrupt:
+        print(f"Interrupted. {progress.summary()}; rerun the same command to resume", file=sys.stderr)
+        return 130
+    finally:
+        batch.close()
+    print(f"{progress.summary()} -> {args.out}", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(prog='python -m resume_analyzer', description='Resume Analyzer command-line tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help='analyze a directory of resumes into a JSONL file')
+    batch.add_argument('directory', help='directory searched recursively for PDF and DOCX files')
+    batch.add_argument('--jd', help='text file with the job description to score against')
+    batch.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='parse worker processes (default: CPUs)')
+    batch.add_argument('--out', default='results.jsonl', help='JSONL file results are appended to (default: results.jsonl)')
+    batch.add_argument('--ai', action='store_true', help='analyze and score with the OpenAI API instead of locally')
+    batch.add_argument('--llm-concurrency', type=int, default=4, help='AI calls in flight with --ai (default: 4)')
+    batch.set_defaults(run=batch_command)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Query words that combine skills instead of naming one
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+# FTS rows are keyed by experience_years * YEAR_STRIDE + resume rowid, so the
+# full-text index itself walks matches from most to least experienced and
+# stops after the top k, and experience filters become rowid ranges
+YEAR_STRIDE = 1 << 40
+MAX_YEARS = 99
+
+# Results read per lock acquisition by iter_search
+SEARCH_PAGE_SIZE = 500
+
+# Quoted phrases, parentheses and bare words of a skill query
+_QUERY_TOKEN = re.compile(r'"[^"]*"|[()]|[^\s()"]+')
+
+
+def skill_token(skill: str) -> str:
+    """Single FTS token for a skill, so "c++", "node.js" and "machine learning" match exactly"""
+    skill = skill.lower().replace('+', 'plus').replace('#', 'sharp')
+    return re.sub(r'[^a-z0-9]+', '_', skill).strip('_')
+
+
+def skill_query_to_fts(query: str) -> str:
+    """Translate a boolean skill query such as `kubernetes AND (python OR "machine learning") NOT java`
+    into an FTS5 expression over the skills column; adjacent skills are ANDed"""
+    parts = []
+    depth = 0
+    for token in _QUERY_TOKEN.findall(query):
+        if token in OPERATORS:
+            if not parts or parts[-1] in OPERATORS or parts[-1] == '(':
+                raise ValueError(f"'{token}' must follow a skill or a closing parenthesis")
+            parts.append(token)
+        elif token == '(':
+            parts.append(token)
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            if depth < 0 or not parts or parts[-1] in OPERATORS or parts[-1] == '(':
+                raise ValueError("Unbalanced or empty parentheses")
+            parts.append(token)
+        else:
+            name = skill_token(token.strip('"'))
+            if not name:
+                raise ValueError(f"'{token}' is not a skill")
+            parts.append(f'"{name}"')
+    if depth or not parts or parts[-1] in OPERATORS:
+        raise ValueError("Incomplete skill query")
+    return 'skills : (' + ' '.join(parts) + ')'
+
+
+class ResumeIndex:
+    """Parsed resumes kept in SQLite, searchable by skills, education and job titles
+
+    Skills, education lines and work experience title lines go into an FTS5
+    table whose rowids also encode experience years (see YEAR_STRIDE).
+    db_path ':memory:' keeps the index for the life of the process only.
+    """
+
+    def __init__(self, db_path: str = ':memory:'):
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS resumes (
+                    rowid INTEGER PRIMARY KEY, id TEXT UNIQUE, filename TEXT,
+                    experience_years INTEGER, skills TEXT, education TEXT, work_experience TEXT, indexed_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS resumes_experience ON resumes (experience_years, rowid);
+                CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5 (
+                    skills, education, titles, tokenize = "unicode61 tokenchars '_'"
+                );
+            ''')
+            # Files written by earlier versions also kept email addresses
+            if 'email' in {row[1] for row in self._db.execute('PRAGMA table_info(resumes)')}:
+                self._db.execute('UPDATE resumes SET email = NULL WHERE email IS NOT NULL')
+            self._db.commit()
+
+    def reopen(self):
+        """Reconnect to a file-backed index; SQLite connections must not be shared with a forked process"""
+        if self.db_path != ':memory:':
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+
+    def add(self, resume_id: str, filename: str, parsed_data: Dict):
+        """Index a parse_resume result, replacing any earlier version with the same ID"""
+        self.add_many([(resume_id, filename, parsed_data)])
+
+    def add_many(self, entries: Iterable[Tuple[str, str, Dict]]):
+        """Index (resume_id, filename, parsed_data) entries in one transaction"""
+        with self._lock:
+            for resume_id, filename, parsed_data in entries:
+                self._insert(resume_id, filename, parsed_data)
+            self._db.commit()
+
+    def _insert(self, resume_id: str, filename: str, parsed_data: Dict):
+        skills = parsed_data.get('skills', [])
+        education = parsed_data.get('education', [])
+        work_experience = [
+            {key: entry.get(key) for key in ('title_line', 'date_range', 'duration_years')}
+            for entry in parsed_data.get('work_experience', [])
+        ]
+        years = min(max(int(parsed_data.get('experience_years') or 0), 0), MAX_YEARS)
+
+        existing = self._db.execute('SELECT rowid, experience_years FROM resumes WHERE id = ?', (resume_id,)).fetchone()
+        if existing:
+            self._db.execute('DELETE FROM resume_fts WHERE rowid = ?', (existing[1] * YEAR_STRIDE + existing[0],))
+            self._db.execute('DELETE FROM resumes WHERE rowid = ?', (existing[0],))
+        cursor = self._db.execute(
+            'INSERT INTO resumes (id, filename, experience_years, skills, education, work_experience, indexed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (resume_id, filename, years,
+             json.dumps(skills), json.dumps(education), json.dumps(work_experience), time.time())
+        )
+        self._db.execute(
+            'INSERT INTO resume_fts (rowid, skills, education, titles) VALUES (?, ?, ?, ?)',
+            (years * YEAR_STRIDE + cursor.lastrowid, ' '.join(skill_token(skill) for skill in skills),
+             '\n'.join(education), '\n'.join(entry['title_line'] or '' for entry in work_experience))
+        )
+
+    def search(self, skills: str = '', text: str = '', min_years: Optional[int] = None,
+               max_years: Optional[int] = None, limit: int = 20) -> List[Dict]:
+        """Top resumes matching a boolean skill query, words in education or job titles, and experience range
+
+        Results are ordered by experience years, then by how recently they were
+        indexed. Raises ValueError for a malformed skill query.
+        """
+        return [result for _, result in self._search(skills, text, min_years, max_years, limit)]
+
+    def iter_search(self, skills: str = '', text: str = '', min_years: Optional[int] = None,
+                    max_years: Optional[int] = None, page_size: int = SEARCH_PAGE_SIZE) -> Iterator[Dict]:
+        """Every resume matching a search, in search order, fetched page_size at a time
+
+        The lock is only held while a page is read, so a slow consumer does not
+        block indexing. Raises ValueError for a malformed skill query right away.
+        """
+        page = self._search(skills, text, min_years, max_years, page_size)
+
+        def pages(page):
+            while True:
+                for _, result in page:
+                    yield result
+                if len(page) < page_size:
+                    return
+                page = self._search(skills, text, min_years, max_years, page_size, below=page[-1][0])
+
+        return pages(page)
+
+    def _search(self, skills: str, text: str, min_years: Optional[int], max_years: Optional[int],
+                limit: int, below: Optional[int] = None) -> List[Tuple[int, Dict]]:
+        """(sort key, result) pairs of up to limit results, best first; below continues after a previous page"""
+        columns = 'r.id, r.filename, r.experience_years, r.skills, r.education, r.work_experience'
+        expressions = []
+        if skills:
+            expressions.append(skill_query_to_fts(skills))
+        words = re.findall(r'\w+', text.lower())
+        if words:
+            expressions.append('{education titles} : (' + ' '.join(f'"{word}"' for word in words) + ')')
+
+        if expressions:
+            low = max(min_years or 0, 0) * YEAR_STRIDE
+            high = (min(MAX_YEARS if max_years is None else max_years, MAX_YEARS) + 1) * YEAR_STRIDE - 1
+            if below is not None:
+                high = min(high, below - 1)
+            sql = (
+                f'SELECT hits.key, {columns} FROM (SELECT rowid AS key FROM resume_fts WHERE resume_fts MATCH ? '
+                'AND rowid BETWEEN ? AND ? ORDER BY rowid DESC LIMIT ?) AS hits '
+                'JOIN resumes AS r ON r.rowid = hits.key % ? ORDER BY hits.key DESC'
+            )
+            params = (' AND '.join(expressions), low, high, limit, YEAR_STRIDE)
+        else:
+            conditions = []
+            params = []
+            if min_years is not None:
+                conditions.append('r.experience_years >= ?')
+                params.append(min_years)
+            if max_years is not None:
+                conditions.append('r.experience_years <= ?')
+                params.append(max_years)
+            if below is not None:
+                conditions.append('(r.experience_years, r.rowid) < (?, ?)')
+                params.extend(divmod(below, YEAR_STRIDE))
+            where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+            sql = (f'SELECT r.experience_years * {YEAR_STRIDE} + r.rowid, {columns} FROM resumes AS r{where} '
+                   'ORDER BY r.experience_years DESC, r.rowid DESC LIMIT ?')
+            params = (*params, limit)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            (row[0], {
+                'id': row[1],
+                'filename': row[2],
+                'experience_years': row[3],
+                'skills': json.loads(row[4]),
+                'education': json.loads(row[5]),
+                'work_experience': json.loads(row[6])
+            })
+            for row in rows
+        ]
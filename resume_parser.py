@@ -1,11 +1,221 @@
 import re
-import PyPDF2
-from docx import Document
-from typing import Dict, List
+import multiprocessing
+import shutil
+import signal
+import threading
+import time
+from bisect import bisect_right
+from datetime import date
+from io import BytesIO
+from itertools import chain, repeat
+from tempfile import SpooledTemporaryFile
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterable, List, Optional, Union
+from keyword_matcher import KeywordMatcher, KeywordHit
+from metrics import METRICS, timed
+from parsed_resume import ParsedResume, WorkExperience
+
+# numpy, PyPDF2 and python-docx are imported on first use to keep `import app` fast
+if TYPE_CHECKING:
+    import numpy as np
+
+# Forward-only upload streams larger than this are spooled to a temporary file
+SPOOL_THRESHOLD = 2 * 1024 * 1024
+
+# PDF extraction limits: pages read per document, and seconds allowed per
+# page when pages are extracted in worker processes
+MAX_PDF_PAGES = 50
+PDF_PAGE_TIMEOUT = 10.0
+
+# Smaller PDFs are cheaper to extract in-process than to ship to workers
+PARALLEL_PDF_PAGES = 4
+
+PDF_PAGES_TIMED_OUT = METRICS.counter('resume_analyzer_pdf_pages_timed_out_total',
+                                      'PDF pages left empty because their extraction exceeded the page timeout')
+
+# Common technical skills to look for
+COMMON_SKILLS = [
+    'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift',
+    'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring',
+    'sql', 'mongodb', 'postgresql', 'mysql', 'redis',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+    'git', 'jenkins', 'ci/cd', 'agile', 'scrum',
+    'machine learning', 'deep learning', 'ai', 'data science',
+    'html', 'css', 'typescript', 'rest api', 'graphql',
+    'tensorflow', 'pytorch', 'pandas', 'numpy',
+    'leadership', 'communication', 'problem solving', 'teamwork'
+]
+
+EDUCATION_KEYWORDS = [
+    'bachelor', 'master', 'phd', 'doctorate', 'associate',
+    'b.s.', 'b.a.', 'm.s.', 'm.a.', 'mba', 'ph.d.',
+    'degree', 'university', 'college', 'institute'
+]
+
+# Common job titles to look for
+JOB_TITLES = [
+    'engineer', 'developer', 'manager', 'analyst', 'consultant',
+    'designer', 'architect', 'director', 'lead', 'senior',
+    'junior', 'intern', 'specialist', 'coordinator', 'associate',
+    'administrator', 'officer', 'executive', 'supervisor', 'technician',
+    'scientist', 'researcher', 'programmer'
+]
+
+# Company indicators
+COMPANY_KEYWORDS = ['inc.', 'corp.', 'llc', 'ltd', 'company', 'technologies', 'systems', 'solutions']
+
+# Verbs that open achievement-oriented bullet points
+ACTION_VERBS = [
+    'achieved', 'improved', 'increased', 'reduced', 'developed', 'implemented', 'designed', 'led', 'managed', 'delivered',
+    'created', 'optimized', 'streamlined', 'launched', 'spearheaded', 'drove', 'executed', 'established', 'built', 'engineered'
+]
+
+# Words signalling that nearby lines belong to a work history section
+EXPERIENCE_SECTION_KEYWORDS = ['experience', 'employment', 'work history', 'career', 'professional']
+
+# Date ranges such as "2020 - 2023", "01/2020 - 12/2023", "June 2020 - Present", "Jan 2020 - Dec 2023"
+_MONTH = r'(?:jan|january|feb|february|mar|march|apr|april|may|june|jul|july|aug|august|sep|september|oct|october|nov|november|dec|december)'
+DATE_RANGE_PATTERN = re.compile(
+    r'(%s\s+\d{4}|\d{1,2}/\d{4}|\d{4})\s*[-–—]\s*(%s\s+\d{4}|\d{1,2}/\d{4}|\d{4}|present|current)' % (_MONTH, _MONTH),
+    re.IGNORECASE
+)
+
+# Lines starting with a bullet marker (PyPDF2 renders some bullets as \x7f)
+BULLET_PATTERN = re.compile(r'^[ \t]*[•●◦▪‣*\-\u2022\x7f]', re.MULTILINE)
+
+# Stand-alone section headers such as "PROFESSIONAL EXPERIENCE" or "Education:"
+SECTION_HEADER_PATTERN = re.compile(
+    r'^[ \t]*((?:professional |work |relevant |industry )?experience|employment(?: history)?|work history|career(?: history)?'
+    r'|education|(?:technical |core )?skills|(?:academic |personal )?projects|certifications?|(?:professional )?summary|objective'
+    r'|publications|awards|honors|languages|interests|references|volunteer(?: experience)?)[ \t]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Shared matcher compiled once at import; parse_resume scans each resume once
+# and every extractor reads the hits of its own category.
+KEYWORDS = KeywordMatcher({
+    'skill': COMMON_SKILLS,
+    'education': EDUCATION_KEYWORDS,
+    'job_title': JOB_TITLES,
+    'company': COMPANY_KEYWORDS,
+    'experience_section': EXPERIENCE_SECTION_KEYWORDS,
+})
+
+# Lowercase word tokens for featurize_batch; keeps symbols inside skills such
+# as c++, c# and node.js, while "ci/cd" and "rest api" become two tokens
+TOKEN_PATTERN = re.compile(r'[a-z0-9#+]+(?:\.[a-z0-9#+]+)*')
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)*')
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Every number _extract_phone finds contains a match of this pattern, so it
+# is enough to test whether a resume has a phone number
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+
+# Columns of the featurize_batch matrix: summary counts first, then one
+# occurrence count per vocabulary keyword ("skill:python", "action_verb:led")
+SUMMARY_FEATURES = [
+    'word_count', 'number_count', 'percent_count', 'bullet_count', 'experience_years',
+    'has_email', 'has_phone', 'skill_count', 'action_verb_count', 'education_count'
+]
+FEATURE_VOCABULARY = {
+    'skill': COMMON_SKILLS,
+    'action_verb': ACTION_VERBS,
+    'education': EDUCATION_KEYWORDS,
+}
+FEATURE_NAMES = SUMMARY_FEATURES + [
+    f'{kind}:{keyword}' for kind, keywords in FEATURE_VOCABULARY.items() for keyword in keywords
+]
+FEATURE_INDEX = {name: column for column, name in enumerate(FEATURE_NAMES)}
+
+def _vocabulary_layout():
+    """Column range of each vocabulary kind, and the column of each keyword keyed
+    by its tokens joined with single spaces (keywords are one or two tokens)"""
+    slices = {}
+    token_columns = {}
+    for kind, keywords in FEATURE_VOCABULARY.items():
+        first = FEATURE_INDEX[f'{kind}:{keywords[0]}']
+        slices[kind] = slice(first, first + len(keywords))
+        for keyword in keywords:
+            token_columns[' '.join(TOKEN_PATTERN.findall(keyword))] = FEATURE_INDEX[f'{kind}:{keyword}']
+    return slices, token_columns
+
+VOCABULARY_SLICES, _TOKEN_COLUMNS = _vocabulary_layout()
+
+# Rows featurized together; bounds the size of the intermediate index arrays
+FEATURIZE_CHUNK_SIZE = 1024
+
+class _PageTimeout(BaseException):
+    """Raised in a worker process when a page runs past its timeout; BaseException so PyPDF2 can't swallow it"""
+
+# Whether a SIGALRM in a worker process should interrupt the page being extracted
+_page_timer_armed = False
+
+def _page_timer_expired(signum, frame):
+    if _page_timer_armed:
+        raise _PageTimeout()
+
+def _extract_pdf_pages(data: bytes, page_numbers: List[int], page_timeout: float = 0):
+    """Extract the text of some pages of a PDF; runs in a worker process that opens its own reader
+    
+    Where SIGALRM timers exist (not on Windows), a page taking longer than
+    page_timeout seconds is interrupted and left empty. Returns the page texts
+    and the number of pages that timed out.
+    """
+    global _page_timer_armed
+    import PyPDF2
+    limit_pages = page_timeout > 0 and hasattr(signal, 'setitimer')
+    if limit_pages:
+        signal.signal(signal.SIGALRM, _page_timer_expired)
+    pdf_reader = None
+    pages = []
+    timed_out = 0
+    for number in page_numbers:
+        if pdf_reader is None:
+            pdf_reader = PyPDF2.PdfReader(BytesIO(data))
+            len(pdf_reader.pages)  # Builds the page list before any timer runs
+        text = None
+        try:
+            if limit_pages:
+                _page_timer_armed = True
+                signal.setitimer(signal.ITIMER_REAL, page_timeout)
+            try:
+                text = pdf_reader.pages[number].extract_text()
+            finally:
+                # Disarmed first, so a signal arriving late is ignored
+                _page_timer_armed = False
+                if limit_pages:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except _PageTimeout:
+            pass
+        if text is None:
+            # An interrupted reader may be left half-updated; the next page gets a fresh one
+            pdf_reader = None
+            text = ''
+            timed_out += 1
+        pages.append(text)
+    return pages, timed_out
 
 class ResumeParser:
     """Parser for extracting and analyzing resume content"""
     
+    def __init__(self, page_workers: int = 0, max_pdf_pages: Optional[int] = MAX_PDF_PAGES,
+                 page_timeout: float = PDF_PAGE_TIMEOUT):
+        """page_workers > 1 extracts PDFs of PARALLEL_PDF_PAGES or more pages in that many processes
+        
+        Pages beyond max_pdf_pages are ignored. page_timeout (seconds per page)
+        applies in the worker processes; pages that exceed it come back empty
+        and are counted in PDF_PAGES_TIMED_OUT. The worker pool is shared by
+        all threads using this parser.
+        """
+        self.page_workers = page_workers
+        self.max_pdf_pages = max_pdf_pages
+        self.page_timeout = page_timeout
+        self._page_pool = None
+        # Calls still waiting on each pool, so a retired pool is only stopped once they are done
+        self._pool_users = {}
+        self._pool_lock = threading.Lock()
+    
+    @timed('extract_text')
     def extract_text(self, filepath: str) -> str:
         """Extract text from resume file (PDF or DOCX)"""
         if filepath.endswith('.pdf'):
@@ -15,46 +225,209 @@ class ResumeParser:
         else:
             raise ValueError("Unsupported file format")
     
-    def _extract_from_pdf(self, filepath: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
+    @timed('extract_text')
+    def extract_text_from_stream(self, stream: Union[bytes, BinaryIO], filename: str) -> str:
+        """Extract text from resume bytes or a binary stream; filename only selects the format"""
+        name = filename.lower()
+        if not (name.endswith('.pdf') or name.endswith('.docx') or name.endswith('.doc')):
+            raise ValueError("Unsupported file format")
+        extract = self._extract_from_pdf if name.endswith('.pdf') else self._extract_from_docx
+        
+        if isinstance(stream, (bytes, bytearray, memoryview)):
+            return extract(BytesIO(stream))
+        if getattr(stream, 'seekable', lambda: False)():
+            stream.seek(0)
+            return extract(stream)
+        
+        # PDF and DOCX readers need to seek; buffer forward-only streams in
+        # memory and only spill to a temporary file above the threshold
+        with SpooledTemporaryFile(max_size=SPOOL_THRESHOLD) as spooled:
+            shutil.copyfileobj(stream, spooled)
+            spooled.seek(0)
+            return extract(spooled)
+    
+    def _extract_from_pdf(self, source: Union[str, BinaryIO]) -> str:
+        """Extract text from PDF file path or binary stream"""
+        import PyPDF2
         try:
-            with open(filepath, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            pdf_reader = PyPDF2.PdfReader(source)
+            page_count = len(pdf_reader.pages)
+            if self.max_pdf_pages is not None:
+                page_count = min(page_count, self.max_pdf_pages)
+            
+            if self.page_workers > 1 and page_count >= PARALLEL_PDF_PAGES:
+                pages = self._extract_pages_in_pool(self._read_bytes(source), page_count)
+            else:
+                pages = [pdf_reader.pages[number].extract_text() for number in range(page_count)]
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
-        return text
+        # Join once instead of growing the string page by page
+        return "".join(page + "\n" for page in pages)
+    
+    def _extract_pages_in_pool(self, data: bytes, page_count: int) -> List[str]:
+        """Extract pages in worker processes, leaving pages that exceed the page timeout empty"""
+        pool = self._acquire_page_pool()
+        stuck = False
+        try:
+            # One contiguous chunk of pages per worker, so each parses the document once
+            chunk_size = -(-page_count // self.page_workers)
+            chunks = [list(range(start, min(start + chunk_size, page_count))) for start in range(0, page_count, chunk_size)]
+            pending = [pool.apply_async(_extract_pdf_pages, (data, chunk, self.page_timeout)) for chunk in chunks]
+            
+            # Where workers time out single pages, this deadline only catches a
+            # worker stuck outside Python code, so it also leaves room for
+            # chunks queued behind other calls; elsewhere it is the only limit
+            pages_allowed = page_count if hasattr(signal, 'setitimer') else chunk_size
+            deadline = time.monotonic() + self.page_timeout * (pages_allowed + 1)
+            pages = []
+            timed_out = 0
+            for chunk, result in zip(chunks, pending):
+                try:
+                    chunk_pages, chunk_timed_out = result.get(timeout=max(0.0, deadline - time.monotonic()))
+                except multiprocessing.TimeoutError:
+                    chunk_pages, chunk_timed_out = [''] * len(chunk), len(chunk)
+                    stuck = True
+                pages.extend(chunk_pages)
+                timed_out += chunk_timed_out
+            if timed_out:
+                PDF_PAGES_TIMED_OUT.inc(timed_out)
+            return pages
+        finally:
+            self._release_page_pool(pool, stuck)
+    
+    def _acquire_page_pool(self):
+        """The current worker pool, started on first use, registered as in use by the caller"""
+        with self._pool_lock:
+            if self._page_pool is None:
+                self._page_pool = multiprocessing.Pool(processes=self.page_workers)
+            pool = self._page_pool
+            self._pool_users[pool] = self._pool_users.get(pool, 0) + 1
+            return pool
+    
+    def _release_page_pool(self, pool, stuck: bool):
+        """Done with pool; a stuck pool is retired and stopped once no other call still uses it"""
+        with self._pool_lock:
+            if stuck and pool is self._page_pool:
+                # A stuck worker can't be interrupted; later calls get a new pool
+                self._page_pool = None
+            users = self._pool_users.pop(pool, 0) - 1
+            if users > 0:
+                self._pool_users[pool] = users
+                return
+            if pool is self._page_pool:
+                return
+        # Pool.terminate can block for good when it kills a worker that is
+        # sending a result, so it must not hold up the request
+        threading.Thread(target=pool.terminate, daemon=True).start()
+    
+    @staticmethod
+    def _read_bytes(source: Union[str, BinaryIO]) -> bytes:
+        """Raw bytes of a file path or binary stream"""
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                return file.read()
+        if isinstance(source, BytesIO):
+            return source.getvalue()
+        source.seek(0)
+        return source.read()
     
-    def _extract_from_docx(self, filepath: str) -> str:
-        """Extract text from DOCX file"""
+    def close(self):
+        """Stop the PDF page worker processes, if any were started"""
+        with self._pool_lock:
+            pools = set(self._pool_users)
+            if self._page_pool is not None:
+                pools.add(self._page_pool)
+            self._page_pool = None
+            self._pool_users.clear()
+        for pool in pools:
+            pool.terminate()
+    
+    def _extract_from_docx(self, source: Union[str, BinaryIO]) -> str:
+        """Extract text from DOCX file path or binary stream"""
+        from docx import Document
         text = ""
         try:
-            doc = Document(filepath)
+            doc = Document(source)
             for paragraph in doc.paragraphs:
                 text += paragraph.text + "\n"
         except Exception as e:
             raise Exception(f"Error reading DOCX: {str(e)}")
         return text
     
-    def parse_resume(self, text: str) -> Dict:
+    @timed('parse_resume')
+    def parse(self, text: str) -> ParsedResume:
         """Parse resume text and extract structured data"""
-        return {
-            'email': self._extract_email(text),
-            'phone': self._extract_phone(text),
-            'skills': self._extract_skills(text),
-            'experience_years': self._estimate_experience_years(text),
-            'education': self._extract_education(text),
-            'work_experience': self._extract_work_experience(text),
-            'full_text': text
-        }
+        hits = KEYWORDS.group_by_category(text)
+        return ParsedResume(
+            email=self._extract_email(text),
+            phone=self._extract_phone(text),
+            skills=self._extract_skills(text, hits),
+            experience_years=self._estimate_experience_years(text),
+            education=self._extract_education(text, hits),
+            work_experience=[WorkExperience(**entry) for entry in self._extract_work_experience(text, hits)],
+            full_text=text
+        )
+    
+    def parse_resume(self, text: str) -> Dict:
+        """Parse resume text and extract structured data as a plain dict (see parse)"""
+        return self.parse(text).to_dict()
+    
+    def featurize_batch(self, texts: Iterable[str]) -> 'np.ndarray':
+        """Feature matrix of shape (len(texts), len(FEATURE_NAMES)) for bulk scoring without an LLM"""
+        import numpy as np
+        texts = list(texts)
+        matrix = np.zeros((len(texts), len(FEATURE_NAMES)), dtype=np.float32)
+        for start in range(0, len(texts), FEATURIZE_CHUNK_SIZE):
+            chunk = texts[start:start + FEATURIZE_CHUNK_SIZE]
+            matrix[start:start + len(chunk)] = self._vocabulary_counts(chunk)
+        
+        # Per-text counts fill the summary columns that precede the aggregates below
+        text_columns = FEATURE_INDEX['skill_count']
+        for row, text in enumerate(texts):
+            matrix[row, :text_columns] = (
+                len(text.split()),
+                len(NUMBER_PATTERN.findall(text)),
+                text.count('%'),
+                len(BULLET_PATTERN.findall(text)),
+                self._estimate_experience_years(text),
+                bool(self._extract_email(text)),
+                PHONE_PATTERN.search(text) is not None
+            )
+        
+        matrix[:, FEATURE_INDEX['skill_count']] = np.count_nonzero(matrix[:, VOCABULARY_SLICES['skill']], axis=1)
+        matrix[:, FEATURE_INDEX['action_verb_count']] = matrix[:, VOCABULARY_SLICES['action_verb']].sum(axis=1)
+        matrix[:, FEATURE_INDEX['education_count']] = matrix[:, VOCABULARY_SLICES['education']].sum(axis=1)
+        return matrix
+    
+    @staticmethod
+    def _vocabulary_counts(texts: List[str]) -> 'np.ndarray':
+        """Keyword occurrence counts of texts, placed in the vocabulary columns of a feature matrix"""
+        import numpy as np
+        width = len(FEATURE_NAMES)
+        token_lists = [TOKEN_PATTERN.findall(text.lower()) for text in texts]
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(texts))
+        bigram_lengths = np.maximum(lengths - 1, 0)
+        
+        # Map every unigram and bigram to its column (-1 when not in the vocabulary) in C-level loops
+        unigrams = chain.from_iterable(token_lists)
+        bigrams = chain.from_iterable(map(' '.join, zip(tokens, tokens[1:])) for tokens in token_lists)
+        columns = np.concatenate((
+            np.fromiter(map(_TOKEN_COLUMNS.get, unigrams, repeat(-1)), dtype=np.int64, count=int(lengths.sum())),
+            np.fromiter(map(_TOKEN_COLUMNS.get, bigrams, repeat(-1)), dtype=np.int64, count=int(bigram_lengths.sum()))
+        ))
+        row_ids = np.arange(len(texts))
+        rows = np.concatenate((np.repeat(row_ids, lengths), np.repeat(row_ids, bigram_lengths)))
+        
+        known = columns >= 0
+        counts = np.bincount(rows[known] * width + columns[known], minlength=len(texts) * width)
+        return counts.reshape(len(texts), width)
     
     def _extract_email(self, text: str) -> str:
         """Extract email address from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else ""
+        if '@' not in text:
+            return ""
+        match = EMAIL_PATTERN.search(text)
+        return match.group() if match else ""
     
     def _extract_phone(self, text: str) -> str:
         """Extract phone number from text"""
@@ -71,29 +444,12 @@ class ResumeParser:
                 return matches[0]
         return ""
     
-    def _extract_skills(self, text: str) -> List[str]:
+    def _extract_skills(self, text: str, hits: Optional[Dict[str, List[KeywordHit]]] = None) -> List[str]:
         """Extract skills from text"""
-        # Common technical skills to look for
-        common_skills = [
-            'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift',
-            'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring',
-            'sql', 'mongodb', 'postgresql', 'mysql', 'redis',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes',
-            'git', 'jenkins', 'ci/cd', 'agile', 'scrum',
-            'machine learning', 'deep learning', 'ai', 'data science',
-            'html', 'css', 'typescript', 'rest api', 'graphql',
-            'tensorflow', 'pytorch', 'pandas', 'numpy',
-            'leadership', 'communication', 'problem solving', 'teamwork'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = []
+        if hits is None:
+            hits = KEYWORDS.group_by_category(text)
         
-        for skill in common_skills:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-        
-        return list(set(found_skills))
+        return [skill.title() for skill in KeywordMatcher.unique_keywords(hits.get('skill', []))]
     
     def _estimate_experience_years(self, text: str) -> int:
         """Estimate years of experience from text"""
@@ -121,111 +477,137 @@ class ResumeParser:
         
         return 0
     
-    def _extract_education(self, text: str) -> List[str]:
+    def _extract_education(self, text: str, hits: Optional[Dict[str, List[KeywordHit]]] = None) -> List[str]:
         """Extract education information"""
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'doctorate', 'associate',
-            'b.s.', 'b.a.', 'm.s.', 'm.a.', 'mba', 'ph.d.',
-            'degree', 'university', 'college', 'institute'
-        ]
+        if hits is None:
+            hits = KEYWORDS.group_by_category(text)
         
         education = []
-        lines = text.split('\n')
-        text_lower = text.lower()
-        
-        for keyword in education_keywords:
-            if keyword in text_lower:
-                # Find the line containing the keyword
-                for line in lines:
-                    if keyword in line.lower() and line.strip():
-                        education.append(line.strip())
+        for hit in hits.get('education', []):
+            # Expand the hit to the line containing it
+            line_start = text.rfind('\n', 0, hit.start) + 1
+            line_end = text.find('\n', hit.end)
+            line = text[line_start:line_end if line_end != -1 else len(text)].strip()
+            if line and line not in education:
+                education.append(line)
+                if len(education) == 5:
+                    break
         
-        return list(set(education))[:5]  # Return up to 5 unique entries
+        return education  # Return up to 5 unique entries
     
-    def _extract_work_experience(self, text: str) -> List[Dict]:
+    def _extract_work_experience(self, text: str, hits: Optional[Dict[str, List[KeywordHit]]] = None) -> List[Dict]:
         """Extract detailed work experience information"""
+        if hits is None:
+            hits = KEYWORDS.group_by_category(text)
+        
         experiences = []
         lines = text.split('\n')
-        text_lower = text.lower()
-        
-        # Common job titles to look for
-        job_titles = [
-            'engineer', 'developer', 'manager', 'analyst', 'consultant',
-            'designer', 'architect', 'director', 'lead', 'senior',
-            'junior', 'intern', 'specialist', 'coordinator', 'associate',
-            'administrator', 'officer', 'executive', 'supervisor', 'technician',
-            'scientist', 'researcher', 'programmer', 'administrator'
-        ]
         
-        # Look for company indicators
-        company_keywords = ['inc.', 'corp.', 'llc', 'ltd', 'company', 'technologies', 'systems', 'solutions']
+        # Offsets of every line start, used to map regex matches to line numbers
+        line_starts = [0]
+        for line in lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+        
+        def line_of(offset):
+            return bisect_right(line_starts, offset) - 1
         
-        # Extract date ranges - enhanced to handle various formats
-        # Matches: "2020 - 2023", "01/2020 - 12/2023", "June 2020 - Present", "Jan 2020 - Dec 2023"
-        date_pattern = r'((?:jan|january|feb|february|mar|march|apr|april|may|june|jul|july|aug|august|sep|september|oct|october|nov|november|dec|december)\s+\d{4}|\d{1,2}/\d{4}|\d{4})\s*[-–—]\s*((?:jan|january|feb|february|mar|march|apr|april|may|june|jul|july|aug|august|sep|september|oct|october|nov|november|dec|december)\s+\d{4}|\d{1,2}/\d{4}|\d{4}|present|current)'
-        date_matches = list(re.finditer(date_pattern, text, re.IGNORECASE))
+        title_lines = {line_of(hit.start) for hit in hits.get('job_title', [])}
+        company_lines = {line_of(hit.start) for hit in hits.get('company', [])}
         
-        # Extract job entries
+        # Bullet lines as prefix counts so any range can be counted in O(1)
+        bullet_lines = {line_of(match.start()) for match in BULLET_PATTERN.finditer(text)}
+        bullet_counts = [0]
+        for i in range(len(lines)):
+            bullet_counts.append(bullet_counts[-1] + (i in bullet_lines))
+        
+        # First date range found on each line
+        dates_by_line = {}
+        for match in DATE_RANGE_PATTERN.finditer(text):
+            dates_by_line.setdefault(line_of(match.start()), match)
+        
+        # Segment the resume into sections by their headers, then keep the
+        # lines that fall inside experience sections
+        in_experience = self._experience_line_mask(text, lines, line_of, hits)
+        
+        # End (exclusive) of the contiguous experience run each line belongs to
+        run_end = [len(lines)] * (len(lines) + 1)
+        for i in range(len(lines) - 1, -1, -1):
+            run_end[i] = run_end[i + 1] if i + 1 < len(lines) and in_experience[i + 1] else i + 1
+        
+        entry_lines = []
         for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            if not line_lower or len(line_lower) < 5:
+            if not in_experience[i] or i in bullet_lines or len(line.strip()) < 5:
                 continue
+            # Job title, company indicator or pipe separator (common in resumes)
+            if i in title_lines or i in company_lines or '|' in line:
+                entry_lines.append(i)
+        
+        for position, i in enumerate(entry_lines):
+            # Date range on the entry line itself or the line right after it
+            date_match = dates_by_line.get(i) or dates_by_line.get(i + 1)
+            date_range = None
+            duration = None
+            if date_match:
+                date_range = date_match.group()
+                duration = self._date_range_years(date_match.group(1), date_match.group(2))
             
-            # Check if line contains a job title
-            has_title = any(title in line_lower for title in job_titles)
-            
-            # Check if line contains company indicators or pipe separator (common in resumes)
-            has_company = any(keyword in line_lower for keyword in company_keywords) or '|' in line
-            
-            # Check if this section contains experience keywords
-            context_start = max(0, i - 5)
-            context_end = min(len(lines), i + 10)
-            context = ' '.join(lines[context_start:context_end]).lower()
-            in_experience_section = any(keyword in context for keyword in ['experience', 'employment', 'work history', 'career', 'professional'])
+            # Bullets belong to this entry until the next one or the end of
+            # the section (at most 14 lines)
+            next_entry = entry_lines[position + 1] if position + 1 < len(entry_lines) else len(lines)
+            bullets_end = min(next_entry, run_end[i], i + 15)
             
-            if (has_title or has_company) and in_experience_section:
-                # Try to find associated date range
-                date_range = None
-                duration = None
-                
-                # First check the next line for date
-                if i + 1 < len(lines):
-                    next_line = lines[i + 1]
-                    date_match_next = re.search(date_pattern, next_line, re.IGNORECASE)
-                    if date_match_next:
-                        date_range = date_match_next.group()
-                        # Calculate duration
-                        start_part = date_match_next.group(1).lower()
-                        end_part = date_match_next.group(2).lower()
-                        
-                        # Extract years
-                        start_year_match = re.search(r'(\d{4})', start_part)
-                        if 'present' in end_part or 'current' in end_part:
-                            end_year = 2026
-                        else:
-                            end_year_match = re.search(r'(\d{4})', end_part)
-                            end_year = int(end_year_match.group(1)) if end_year_match else None
-                        
-                        if start_year_match and end_year:
-                            duration = end_year - int(start_year_match.group(1))
-                
-                # Count bullet points in next few lines
-                bullet_count = 0
-                for j in range(i + 1, min(i + 15, len(lines))):
-                    if any(bullet in lines[j] for bullet in ['•', '●', '◦', '-', '*', '\u2022']):
-                        bullet_count += 1
-                    elif lines[j].strip() and len(lines[j].strip()) > 10:
-                        # Check if this is another job entry
-                        if any(title in lines[j].lower() for title in job_titles) and any(keyword in lines[j].lower() for keyword in ['|'] + company_keywords):
-                            break  # Next job entry
-                
-                experiences.append({
-                    'title_line': line.strip(),
-                    'date_range': date_range,
-                    'duration_years': duration,
-                    'bullet_points': bullet_count
-                })
+            experiences.append({
+                'title_line': lines[i].strip(),
+                'date_range': date_range,
+                'duration_years': duration,
+                'bullet_points': bullet_counts[bullets_end] - bullet_counts[i + 1]
+            })
         
         return experiences
+    
+    def _experience_line_mask(self, text: str, lines: List[str], line_of, hits: Dict[str, List[KeywordHit]]) -> List[bool]:
+        """Flag the lines that belong to a work experience section"""
+        mask = [False] * len(lines)
+        headers = [(line_of(match.start()), match.group(1).lower()) for match in SECTION_HEADER_PATTERN.finditer(text)]
         
-        return experiences
+        if any(self._is_experience_header(name) for _, name in headers):
+            # Each header opens a section that runs until the next header
+            bounds = headers + [(len(lines), None)]
+            for (start, name), (end, _) in zip(bounds, bounds[1:]):
+                if self._is_experience_header(name):
+                    for i in range(start + 1, end):
+                        mask[i] = True
+            return mask
+        
+        # No recognizable headers: treat lines from 9 before to 5 after an
+        # experience keyword's line as experience, the lines whose context
+        # (5 lines before, the line and 9 after) mentions the keyword
+        section_lines = sorted({line_of(hit.start) for hit in hits.get('experience_section', [])})
+        covered_until = 0
+        for keyword_line in section_lines:
+            start = max(covered_until, keyword_line - 9)
+            end = min(len(lines), keyword_line + 6)
+            for i in range(start, end):
+                mask[i] = True
+            covered_until = max(covered_until, end)
+        return mask
+    
+    @staticmethod
+    def _is_experience_header(name: str) -> bool:
+        """Whether a section header introduces work history"""
+        return any(keyword in name for keyword in ('experience', 'employment', 'work history', 'career'))
+    
+    @staticmethod
+    def _date_range_years(start_part: str, end_part: str) -> Optional[int]:
+        """Number of whole years covered by a date range"""
+        start_year_match = re.search(r'(\d{4})', start_part)
+        end_part = end_part.lower()
+        if 'present' in end_part or 'current' in end_part:
+            end_year = date.today().year
+        else:
+            end_year_match = re.search(r'(\d{4})', end_part)
+            end_year = int(end_year_match.group(1)) if end_year_match else None
+        
+        if start_year_match and end_year:
+            return end_year - int(start_year_match.group(1))
+        return None
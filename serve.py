@@ -0,0 +1,152 @@
+"""Production entry point: the Flask app under gunicorn with preforked, prewarmed workers
+
+The app module is imported once in the master process and warmed up (services,
+compiled patterns, keyword matcher, PDF/DOCX libraries, OpenAI client and
+response models), then forked into SERVE_WORKERS workers of SERVE_THREADS
+threads each, so workers start with that state already in memory and shared
+copy-on-write.
+
+Usage: python serve.py [--workers N] [--threads N] [--bind HOST:PORT] [--timeout SECONDS]
+
+gunicorn runs on Linux and macOS; on Windows use `python app.py`.
+"""
+import argparse
+import os
+import sys
+from typing import Dict, Optional
+
+# LLM calls take seconds, so workers are threaded and the timeout is generous
+DEFAULT_THREADS = 8
+DEFAULT_TIMEOUT = 120
+
+# Job polls land on any worker, so with several workers job status lives in
+# this SQLite file (in the working directory) unless JOB_DB names another
+DEFAULT_JOB_DB = 'jobs.db'
+
+WARM_UP_RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567
+Experience
+Senior Software Engineer | Acme Inc.
+2019 - Present
+- Built Python services on AWS, cutting costs by 30%
+Education
+Bachelor of Science in Computer Science
+"""
+
+
+def default_workers() -> int:
+    return min(2 * (os.cpu_count() or 1) + 1, 8)
+
+
+def server_options(args: argparse.Namespace) -> Dict:
+    """gunicorn settings from the command line, falling back to SERVE_* environment variables"""
+    port = os.getenv('PORT', '5000')
+    return {
+        'bind': args.bind or os.getenv('SERVE_BIND') or f'0.0.0.0:{port}',
+        'workers': args.workers or int(os.getenv('SERVE_WORKERS') or default_workers()),
+        'threads': args.threads or int(os.getenv('SERVE_THREADS') or DEFAULT_THREADS),
+        'worker_class': 'gthread',
+        'timeout': args.timeout or int(os.getenv('SERVE_TIMEOUT') or DEFAULT_TIMEOUT),
+        'graceful_timeout': int(os.getenv('SERVE_GRACEFUL_TIMEOUT') or 30),
+        'keepalive': int(os.getenv('SERVE_KEEPALIVE') or 5),
+        # Recycle workers now and then to bound memory growth; 0 disables
+        'max_requests': int(os.getenv('SERVE_MAX_REQUESTS') or 0),
+        'max_requests_jitter': int(os.getenv('SERVE_MAX_REQUESTS_JITTER') or 0),
+        'preload_app': True,
+        'post_fork': post_fork,
+        'child_exit': child_exit,
+        'accesslog': os.getenv('SERVE_ACCESS_LOG') or None,
+    }
+
+
+def warm_up(app_module):
+    """Create the services and build lazily created state once before forking; no network calls, no worker pools"""
+    # The parser imports these on first use; load them here so workers share them
+    import docx
+    import numpy
+    import PyPDF2
+    from openai.types.chat import ChatCompletion
+    from fallback_analysis import generate_fallback_analysis
+    from metrics import METRICS
+
+    parsed = app_module.get_resume_parser().parse_resume(WARM_UP_RESUME)
+    generate_fallback_analysis(parsed, WARM_UP_RESUME)
+    ai_analyzer = app_module.get_ai_analyzer()
+    ai_analyzer.compact_resume(WARM_UP_RESUME)
+    ai_analyzer.client.chat.completions  # Resource objects are created on first access
+    for create in (app_module.get_static_assets, app_module.get_result_cache, app_module.get_resume_store,
+                   app_module.get_job_matcher):
+        create()
+    if app_module.SEARCH_API_KEY:
+        app_module.get_resume_index()
+    ChatCompletion.model_validate({
+        'id': 'warm-up', 'object': 'chat.completion', 'created': 0, 'model': ai_analyzer.model,
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ''}, 'finish_reason': 'stop'}]
+    })
+    # The warm-up is not traffic
+    METRICS.reset()
+
+
+def post_fork(server, worker):
+    """Per-worker state that must not be inherited: SQLite connections and the job queue's threads"""
+    import app as app_module
+    app_module.get_result_cache().reopen()
+    app_module.get_resume_store().reopen()
+    if app_module.resume_index is not None:
+        app_module.resume_index.reopen()
+    app_module.get_job_queue()
+
+
+def fail_interrupted_jobs(owner: Optional[int] = None):
+    """Mark JOB_DB jobs failed that were left queued or running by the last server run, or by one worker (its pid)"""
+    job_db = os.getenv('JOB_DB')
+    if job_db:
+        from job_queue import fail_unfinished_jobs
+        fail_unfinished_jobs(job_db, owner)
+
+
+def child_exit(server, worker):
+    """Runs in the master: the jobs of a worker that exited stopped with it, so pollers need not wait for them"""
+    fail_interrupted_jobs(worker.pid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the Resume Analyzer API with gunicorn')
+    parser.add_argument('--workers', type=int, help='worker processes (default: SERVE_WORKERS or 2 x CPUs + 1, at most 8)')
+    parser.add_argument('--threads', type=int, help=f'threads per worker (default: SERVE_THREADS or {DEFAULT_THREADS})')
+    parser.add_argument('--bind', help='HOST:PORT (default: SERVE_BIND or 0.0.0.0:$PORT)')
+    parser.add_argument('--timeout', type=int, help=f'seconds before a silent worker is restarted (default: {DEFAULT_TIMEOUT})')
+    args = parser.parse_args()
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError as e:
+        print(f"gunicorn is not available ({e}); on Windows run `python app.py` instead", file=sys.stderr)
+        return 1
+
+    class ResumeAnalyzerServer(BaseApplication):
+        def __init__(self, options: Dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            import app as app_module
+            warm_up(app_module)
+            # No worker runs yet, so every unfinished job was interrupted
+            fail_interrupted_jobs()
+            return app_module.app
+
+    options = server_options(args)
+    if options['workers'] > 1:
+        os.environ.setdefault('JOB_DB', DEFAULT_JOB_DB)
+    print(f"Serving on {options['bind']} with {options['workers']} workers x {options['threads']} threads", file=sys.stderr)
+    ResumeAnalyzerServer(options).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -126,7 +126,8 @@ uploadForm.addEventListener('submit', async (e) => {
     
     try {
         // Upload and analyze resume
-        const response = await fetch(`${API_BASE}/api/analyze`, {
+        // Ask for scores in the same request to avoid a second LLM round trip
+        const response = await fetch(`${API_BASE}/api/analyze?include=scores`, {
             method: 'POST',
             body: formData
         });
@@ -233,26 +234,35 @@ function displayResults(data) {
         recommendationsList.innerHTML = '<li>No specific recommendations at this time</li>';
     }
     
-    // Get and display scores
-    fetchScores(parsed_data.full_text);
+    // Display scores returned with the analysis, or fetch them separately
+    if (data.scores) {
+        updateScores(data.scores);
+    } else {
+        fetchScores(data.resume_id, parsed_data.full_text);
+    }
 }
 
-// Fetch and display scores
-async function fetchScores(resumeText) {
+// Fetch and display scores; the server already has the resume, so only its ID
+// is sent unless the server no longer knows it
+async function fetchScores(resumeId, resumeText) {
     try {
         const jobDescription = document.getElementById('job-description').value;
-        
-        const response = await fetch(`${API_BASE}/api/score`, {
+        const postScore = (resume) => fetch(`${API_BASE}/api/score`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
             body: JSON.stringify({
-                resume_text: resumeText,
+                ...resume,
                 job_description: jobDescription
             })
         });
         
+        let response = await postScore(resumeId ? { resume_id: resumeId } : { resume_text: resumeText });
+        if (response.status === 404 && resumeText) {
+            response = await postScore({ resume_text: resumeText });
+        }
+        
         const scores = await response.json();
         
         if (response.ok) {
@@ -0,0 +1,107 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from collections import namedtuple
+from typing import Dict, Optional
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # Optional: br variants are only built when brotli is installed
+    brotli = None
+
+# Fingerprinted URLs never change content, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Everything else is revalidated with its ETag on every use
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/manifest+json',
+                      'image/svg+xml', 'image/x-icon', 'image/vnd.microsoft.icon')
+MIN_COMPRESS_SIZE = 512
+
+# Pages whose references to other assets (static/<name>) are rewritten to fingerprinted URLs
+HTML_PAGES = ('index.html',)
+_ASSET_REFERENCE = re.compile(r'static/([\w./-]+)')
+
+mimetypes.add_type('application/manifest+json', '.webmanifest')
+
+Asset = namedtuple('Asset', ['body', 'mimetype', 'etag', 'encodings'])  # encodings: {'br'|'gzip': bytes}
+
+
+def fingerprint_name(name: str, etag: str) -> str:
+    """style.css -> style.<first 10 characters of the content hash>.css"""
+    root, extension = os.path.splitext(name)
+    return f'{root}.{etag[:10]}{extension}'
+
+
+class StaticAssets:
+    """Static files loaded into memory once, served with ETags and precompressed variants
+
+    Every file is also reachable under a fingerprinted name that embeds its
+    content hash (see fingerprint_name); those responses are cached as
+    immutable, and HTML_PAGES link to them. Files are read at startup, so
+    changes show up after a restart.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._assets: Dict[str, Asset] = {}
+        self._fingerprinted: Dict[str, str] = {}  # fingerprinted name -> name
+        self.urls: Dict[str, str] = {}  # name -> fingerprinted name
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, directory).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    self._add(name, f.read())
+
+        for name in HTML_PAGES:
+            if name in self._assets:
+                html = self._assets[name].body.decode('utf-8')
+                html = _ASSET_REFERENCE.sub(lambda match: 'static/' + self.urls.get(match.group(1), match.group(1)), html)
+                self._add(name, html.encode('utf-8'))
+
+    def _add(self, name: str, body: bytes):
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        encodings = {}
+        if len(body) >= MIN_COMPRESS_SIZE and mimetype.startswith(COMPRESSIBLE_TYPES):
+            if brotli is not None:
+                encodings['br'] = brotli.compress(body, quality=11)
+            encodings['gzip'] = gzip.compress(body, compresslevel=9, mtime=0)
+            encodings = {encoding: data for encoding, data in encodings.items() if len(data) < len(body)}
+        if name in self.urls:
+            del self._fingerprinted[self.urls[name]]
+        self._assets[name] = Asset(body, mimetype, etag, encodings)
+        self.urls[name] = fingerprint_name(name, etag)
+        self._fingerprinted[self.urls[name]] = name
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._assets or name in self._fingerprinted
+
+    def response(self, name: str) -> Optional[Response]:
+        """Response for an asset by name or fingerprinted name, honoring If-None-Match and
+        Accept-Encoding; None if there is no such asset"""
+        immutable = name in self._fingerprinted
+        asset = self._assets.get(self._fingerprinted.get(name, name))
+        if asset is None:
+            return None
+
+        # Each encoding is a different representation, so it needs its own strong ETag
+        encoding = next((encoding for encoding in ('br', 'gzip')
+                         if encoding in asset.encodings and request.accept_encodings[encoding]), None)
+        etag = f'{asset.etag}-{encoding}' if encoding else asset.etag
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(asset.encodings[encoding] if encoding else asset.body, mimetype=asset.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        if asset.encodings:
+            response.vary.add('Accept-Encoding')
+        return response
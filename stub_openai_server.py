@@ -0,0 +1,222 @@
+"""Local stand-in for the OpenAI chat-completions endpoint
+
+Used by the offline tests and benchmarks so AIAnalyzer can be exercised
+without network access or an API key. Point the analyzer at ``server.base_url``.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+ANALYSIS_REPLY = """Summary:
+Experienced software engineer with a strong backend focus.
+
+Strengths:
+- Solid Python and cloud experience
+- Quantified achievements
+
+Areas for Improvement:
+- Limited leadership examples
+
+Recommendations:
+- Add a projects section
+- Highlight certifications
+"""
+
+SCORE_REPLY = json.dumps({
+    'content_quality': 82,
+    'format_structure': 78,
+    'skills_match': 80,
+    'experience_level': 76,
+    'overall_score': 79,
+    'explanation': 'Stub scores'
+})
+
+SUGGESTIONS_REPLY = """1. Quantify impact in every bullet point
+2. Add a professional summary
+3. List cloud certifications
+"""
+
+COMBINED_REPLY = json.dumps({
+    'summary': 'Experienced software engineer with a strong backend focus.',
+    'strengths': ['Solid Python and cloud experience', 'Quantified achievements'],
+    'weaknesses': ['Limited leadership examples'],
+    'recommendations': ['Add a projects section', 'Highlight certifications'],
+    'match_score': 72,
+    'scores': json.loads(SCORE_REPLY)
+})
+
+
+def default_reply(messages: List[Dict]) -> str:
+    """Pick a canned reply matching the kind of prompt AIAnalyzer sent"""
+    system = messages[0]['content'].lower() if messages else ''
+    if 'only with json' in system:
+        return COMBINED_REPLY
+    if 'evaluator' in system:
+        return SCORE_REPLY
+    if 'resume writer' in system:
+        return SUGGESTIONS_REPLY
+    return ANALYSIS_REPLY
+
+
+class StubOpenAIServer:
+    """Threaded HTTP server answering POST /v1/chat/completions with canned replies, streamed or not"""
+
+    def __init__(self, latency: float = 0.0, reply: Optional[Callable[[List[Dict]], str]] = None,
+                 host: str = '127.0.0.1', port: int = 0, chunk_delay: float = 0.0,
+                 faults: Iterable[Union[int, str, None]] = (), retry_after: Optional[float] = None,
+                 hang: float = 2.0):
+        """latency is slept per request, chunk_delay between streamed chunks;
+        reply maps the request messages to the reply text
+
+        faults are injected into the first requests, one per request in order:
+        an HTTP status (429, 500...) answered with an error body, 'timeout' to
+        stall for hang seconds before answering, or None for a normal reply.
+        Error responses carry a Retry-After header when retry_after is set.
+        """
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.reply = reply or default_reply
+        self.faults = list(faults)
+        self.retry_after = retry_after
+        self.hang = hang
+        self.request_count = 0
+        self.max_concurrent = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self) -> 'StubOpenAIServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def completion_body(self, request: Dict) -> Dict:
+        """Chat-completion response body for a request"""
+        content = self.reply(request.get('messages', []))
+        return {
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': self.usage(request, content)
+        }
+
+    @staticmethod
+    def usage(request: Dict, content: str) -> Dict:
+        """Token usage estimated at 4 characters per token"""
+        prompt_tokens = sum(len(message.get('content') or '') for message in request.get('messages', [])) // 4
+        completion_tokens = len(content) // 4
+        return {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens}
+
+    def stream_chunks(self, request: Dict) -> List[str]:
+        """Serialized chat.completion.chunk objects streaming the reply a few characters at a time"""
+        content = self.reply(request.get('messages', []))
+        pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+        chunks = []
+        for index, piece in enumerate(pieces + [None]):
+            chunks.append(json.dumps({
+                'id': 'chatcmpl-stub',
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': request.get('model', 'stub'),
+                'choices': [{
+                    'index': 0,
+                    'delta': {'role': 'assistant', 'content': piece} if index == 0 else ({'content': piece} if piece else {}),
+                    'finish_reason': None if piece else 'stop'
+                }]
+            }))
+        return chunks
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are separate writes; with Nagle on, every reply waits out a delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                with server._lock:
+                    server.request_count += 1
+                    server._in_flight += 1
+                    server.max_concurrent = max(server.max_concurrent, server._in_flight)
+                    fault = server.faults.pop(0) if server.faults else None
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    if fault == 'timeout':
+                        time.sleep(server.hang)
+                    if isinstance(fault, int):
+                        self._send_error(fault)
+                    elif request.get('stream'):
+                        self._send_stream(server.stream_chunks(request))
+                    else:
+                        self._send_json(200, server.completion_body(request))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client gave up on a stalled request
+                finally:
+                    with server._lock:
+                        server._in_flight -= 1
+
+            def _send_json(self, status: int, body: Dict):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_error(self, status: int):
+                payload = json.dumps({'error': {'message': f'Injected {status}', 'type': 'stub_error', 'code': status}}).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if server.retry_after is not None:
+                    self.send_header('Retry-After', str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_stream(self, chunks):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for chunk in chunks + ['[DONE]']:
+                    payload = f'data: {chunk}\n\n'.encode('utf-8')
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(payload), payload))
+                    self.wfile.flush()
+                    if server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+                self.wfile.write(b'0\r\n\r\n')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
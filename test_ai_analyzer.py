@@ -0,0 +1,126 @@
+"""Offline tests for AIAnalyzer / AsyncAIAnalyzer against the local stub server"""
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from ai_analyzer import AIAnalyzer, AnalysisStreamParser, AsyncAIAnalyzer
+from result_cache import ResultCache
+from stub_openai_server import ANALYSIS_REPLY, StubOpenAIServer
+
+RESUME = "Jane Doe\nSoftware Engineer | Acme Inc.\n2019 - Present\n- Built Python services"
+
+
+def test_sync_analyzer_against_stub():
+    """The blocking analyzer parses the stub's canned replies"""
+    with StubOpenAIServer() as server:
+        analyzer = AIAnalyzer(api_key='test-key', base_url=server.base_url)
+        analysis = analyzer.analyze_resume(RESUME)
+        scores = analyzer.score_resume(RESUME)
+    assert analysis['strengths'] == ['Solid Python and cloud experience', 'Quantified achievements']
+    assert scores['overall_score'] == 79
+
+
+def test_analyze_all_runs_requests_concurrently():
+    """analysis, scores and suggestions overlap instead of running back to back"""
+    latency = 0.3
+
+    async def run(base_url):
+        async with AsyncAIAnalyzer(api_key='test-key', base_url=base_url) as analyzer:
+            start = time.perf_counter()
+            result = await analyzer.analyze_all(RESUME, 'Python developer')
+            return result, time.perf_counter() - start
+
+    with StubOpenAIServer(latency=latency) as server:
+        result, elapsed = asyncio.run(run(server.base_url))
+        assert server.max_concurrent == 3
+
+    assert elapsed < latency * 2
+    assert result['analysis']['recommendations'] == ['Add a projects section', 'Highlight certifications']
+    assert result['scores']['skills_match'] == 80
+    assert result['suggestions']['count'] == 3
+
+
+def test_async_errors_become_error_results():
+    """An unreachable endpoint yields the same error dicts as the sync analyzer"""
+    async def run():
+        analyzer = AsyncAIAnalyzer(api_key='test-key', base_url='http://127.0.0.1:9/v1')
+        analyzer.client = analyzer.client.with_options(max_retries=0)
+        try:
+            return await analyzer.analyze_all(RESUME)
+        finally:
+            await analyzer.close()
+
+    result = asyncio.run(run())
+    assert result['analysis']['error'].startswith('AI analysis failed')
+    assert result['scores']['overall_score'] == 0
+    assert result['suggestions']['suggestions'] == []
+
+
+def test_analyze_and_score_single_round_trip():
+    """The combined prompt returns analysis and scores from one request"""
+    with StubOpenAIServer() as server:
+        analyzer = AIAnalyzer(api_key='test-key', base_url=server.base_url)
+        result = analyzer.analyze_and_score(RESUME, 'Python developer')
+        assert server.request_count == 1
+    assert result['weaknesses'] == ['Limited leadership examples']
+    assert result['scores']['overall_score'] == 79
+
+
+def test_combined_response_falls_back_to_text_parsing():
+    """Non-JSON replies still produce an analysis, without scores"""
+    result = AIAnalyzer(api_key='test-key')._parse_combined_response(ANALYSIS_REPLY)
+    assert result['recommendations'] == ['Add a projects section', 'Highlight certifications']
+    assert result['scores'] is None
+
+
+def test_analyze_endpoint_include_scores(monkeypatch):
+    """/api/analyze?include=scores answers with analysis and scores at once"""
+    with StubOpenAIServer() as server:
+        monkeypatch.setattr(app_module, 'ai_analyzer', AIAnalyzer(api_key='test-key', base_url=server.base_url))
+        monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+        with open('test_resume.pdf', 'rb') as f:
+            response = app_module.app.test_client().post(
+                '/api/analyze?include=scores', data={'resume': (f, 'test_resume.pdf')}
+            )
+        assert server.request_count == 1
+
+    data = response.get_json()
+    assert data['ai_analysis']['strengths'] == ['Solid Python and cloud experience', 'Quantified achievements']
+    assert 'scores' not in data['ai_analysis']
+    assert data['scores']['skills_match'] == 80
+
+
+def test_stream_parser_matches_batch_parser_for_any_chunking():
+    """Feeding the reply in arbitrary chunks gives the same result as parsing it whole"""
+    expected = AIAnalyzer(api_key='test-key')._parse_analysis_response(ANALYSIS_REPLY)
+    for size in (1, 7, 64):
+        parser = AnalysisStreamParser()
+        for i in range(0, len(ANALYSIS_REPLY), size):
+            parser.feed(ANALYSIS_REPLY[i:i + size])
+        assert parser.finish() == expected
+
+
+def test_analyze_stream_endpoint_sends_parsed_data_first(monkeypatch):
+    """/api/analyze/stream emits parsed data, then sections, then the final analysis"""
+    with StubOpenAIServer() as server:
+        monkeypatch.setattr(app_module, 'ai_analyzer', AIAnalyzer(api_key='test-key', base_url=server.base_url))
+        monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+        with open('test_resume.pdf', 'rb') as f:
+            response = app_module.app.test_client().post(
+                '/api/analyze/stream', data={'resume': (f, 'test_resume.pdf')}
+            )
+        body = response.get_data(as_text=True)
+
+    assert response.mimetype == 'text/event-stream'
+    events = [block.split('\n', 1) for block in body.strip().split('\n\n')]
+    names = [name[len('event: '):] for name, _ in events]
+    assert names[0] == 'parsed' and names[-2:] == ['analysis', 'done']
+    assert 'token' in names
+    sections = [json.loads(data[len('data: '):]) for name, data in events if name == 'event: section']
+    assert {'section': 'weaknesses', 'text': 'Limited leadership examples'} in sections
+    final = json.loads(events[-2][1][len('data: '):])
+    assert final['strengths'] == ['Solid Python and cloud experience', 'Quantified achievements']
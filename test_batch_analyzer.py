@@ -0,0 +1,186 @@
+"""Offline tests for batch analysis against the local stub server"""
+import io
+import json
+import os
+import zipfile
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from ai_analyzer import AIAnalyzer
+from batch_analyzer import BatchAnalyzer, iter_uploads, measure_uploads
+from result_cache import ResultCache
+from stub_openai_server import COMBINED_REPLY, StubOpenAIServer
+
+
+def scored_reply(messages):
+    """Score the detailed resume higher than the short one"""
+    reply = json.loads(COMBINED_REPLY)
+    reply['scores']['overall_score'] = 91 if 'SARAH' in messages[-1]['content'] else 64
+    return json.dumps(reply)
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_batch_ranks_results_and_isolates_failures():
+    """Valid resumes are ranked by score, broken ones carry their own error"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('nested/short.pdf', read('test_resume.pdf'))
+        zf.writestr('__MACOSX/._short.pdf', b'junk')
+    uploads = [
+        ('short.pdf', read('test_resume.pdf')),
+        ('corrupt.pdf', b'%PDF-1.4 not really a pdf'),
+        ('detailed.pdf', read('test_detailed_resume.pdf')),
+        ('notes.txt', b'plain text'),
+        ('bundle.zip', archive.getvalue()),
+    ]
+
+    with StubOpenAIServer(reply=scored_reply) as server:
+        analyzer = AIAnalyzer(api_key='test-key', base_url=server.base_url)
+        batch = BatchAnalyzer(analyzer, app_module.generate_fallback_analysis, parse_workers=2, llm_concurrency=3)
+        try:
+            results = batch.analyze(uploads, 'Senior Python engineer')
+        finally:
+            batch.close()
+        assert server.request_count == 3
+
+    assert [(r['filename'], r['rank']) for r in results] == [
+        ('detailed.pdf', 1), ('short.pdf', 2), ('nested/short.pdf', 3), ('corrupt.pdf', None), ('notes.txt', None)
+    ]
+    assert results[0]['scores']['overall_score'] == 91
+    assert 'full_text' not in results[0]['parsed_data']
+    assert results[3]['error'].startswith('Error reading resume')
+    assert results[4]['error'].startswith('Invalid file type')
+
+
+def archive_with_unreadable_members():
+    """A zip of four resumes whose second member is marked encrypted and whose third has corrupt deflate data"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('first.pdf', read('test_resume.pdf'))
+        zf.writestr('locked.pdf', read('test_resume.pdf'))
+        zf.writestr('corrupt.pdf', read('test_resume.pdf'))
+        zf.writestr('last.pdf', read('test_detailed_resume.pdf'))
+        members = {member.filename: member for member in zf.infolist()}
+    data = bytearray(archive.getvalue())
+    # The encryption flag is in both the local header and the central directory entry
+    data[members['locked.pdf'].header_offset + 6] |= 0x1
+    data[data.rfind(b'PK\x01\x02', 0, data.rfind(b'locked.pdf')) + 8] |= 0x1
+    corrupt_data = members['corrupt.pdf'].header_offset + 30 + len('corrupt.pdf')
+    data[corrupt_data:corrupt_data + 4] = b'\xff\xff\xff\xff'
+    return bytes(data)
+
+
+def test_unreadable_zip_members_fail_alone():
+    """An encrypted or corrupt member is reported by itself and the members around it are analyzed"""
+    archive = archive_with_unreadable_members()
+    assert [(name, data is not None) for name, data in iter_uploads([('bundle.zip', archive)])] == [
+        ('first.pdf', True), ('locked.pdf', False), ('corrupt.pdf', False), ('last.pdf', True)
+    ]
+
+    batch = BatchAnalyzer(None, app_module.generate_fallback_analysis, parse_workers=1)
+    try:
+        results = {result['filename']: result for result in batch.analyze([('bundle.zip', archive)])}
+    finally:
+        batch.close()
+    assert set(results) == {'first.pdf', 'locked.pdf', 'corrupt.pdf', 'last.pdf'}
+    assert 'error' not in results['first.pdf'] and 'error' not in results['last.pdf']
+    assert results['locked.pdf']['error'] == results['corrupt.pdf']['error'] == 'File is corrupt or too large to process'
+
+
+class CountingFile(io.BytesIO):
+    """In-memory file that counts the bytes read from it"""
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_uploads_are_read_from_files_only_when_reached():
+    """Measuring reads only zip directories, and iterating reads each file as it is reached"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('inner.pdf', read('test_detailed_resume.pdf'))
+    pdf, bundle = CountingFile(read('test_resume.pdf')), CountingFile(archive.getvalue())
+    uploads = [('a.pdf', pdf), ('bundle.zip', bundle)]
+
+    assert measure_uploads(uploads) == (2, len(read('test_detailed_resume.pdf')))
+    assert pdf.bytes_read == 0 and bundle.bytes_read < len(read('test_detailed_resume.pdf'))
+
+    items = iter_uploads(uploads)
+    assert next(items) == ('a.pdf', read('test_resume.pdf'))
+    assert bundle.bytes_read < len(read('test_detailed_resume.pdf'))
+    assert next(items) == ('inner.pdf', read('test_detailed_resume.pdf'))
+    assert not bundle.closed
+
+
+def test_batch_endpoint_uses_cache_and_fallback(monkeypatch):
+    """The endpoint accepts many files; AI failures fall back per resume"""
+    class FailingAnalyzer:
+        model = 'test-model'
+
+        def analyze_and_score(self, resume_text, job_description=""):
+            return {'error': 'AI analysis failed: rate limited', 'strengths': [], 'weaknesses': [], 'recommendations': []}
+
+    monkeypatch.setattr(app_module, 'batch_analyzer', BatchAnalyzer(
+        FailingAnalyzer(), app_module.generate_fallback_analysis, parse_workers=0, cache=ResultCache()
+    ))
+    response = app_module.app.test_client().post('/api/analyze/batch', data={
+        'resumes': [(io.BytesIO(read('test_resume.pdf')), 'a.pdf'), (io.BytesIO(read('test_detailed_resume.pdf')), 'b.pdf')],
+        'job_description': 'Python developer'
+    })
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert (data['count'], data['succeeded'], data['failed']) == (2, 2, 0)
+    assert all(result['ai_analysis']['strengths'] for result in data['results'])
+    assert all(result['scores'] is None for result in data['results'])
+
+
+def test_batch_endpoint_streams_ndjson(monkeypatch):
+    """?format=ndjson sends one line per resume, in upload order, as each finishes"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('d.pdf', read('test_resume.pdf'))
+    monkeypatch.setattr(app_module, 'batch_analyzer', BatchAnalyzer(None, app_module.generate_fallback_analysis, parse_workers=0))
+    response = app_module.app.test_client().post('/api/analyze/batch?format=ndjson', data={
+        'resumes': [(io.BytesIO(read('test_detailed_resume.pdf')), 'b.pdf'), (io.BytesIO(b'junk'), 'c.docx'),
+                    (io.BytesIO(read('test_resume.pdf')), 'a.pdf'), (io.BytesIO(archive.getvalue()), 'bundle.zip')],
+        'job_description': 'Python developer'
+    })
+
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['filename'] for line in lines] == ['b.pdf', 'c.docx', 'a.pdf', 'd.pdf']
+    assert 'error' not in lines[3]
+    assert 'error' in lines[1] and lines[0]['scores']['overall_score'] > lines[2]['scores']['overall_score']
+
+
+def test_batch_limits_count_zip_members_and_unzipped_size(monkeypatch):
+    """Files inside zip archives count against BATCH_MAX_FILES, and the unzipped total is capped, before unpacking"""
+    many, large = io.BytesIO(), io.BytesIO()
+    with zipfile.ZipFile(many, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for number in range(5):
+            zf.writestr(f'{number}.pdf', b'x')
+        zf.writestr('docs/', b'')
+    with zipfile.ZipFile(large, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('big.pdf', b'\0' * (2 * 1024 * 1024))
+    assert measure_uploads([('a.pdf', b'x'), ('many.zip', many.getvalue()), ('bad.zip', b'junk')]) == (7, 5)
+    assert measure_uploads([('large.zip', large.getvalue())]) == (1, 2 * 1024 * 1024)
+
+    monkeypatch.setattr(app_module, 'BATCH_MAX_FILES', 4)
+    monkeypatch.setattr(app_module, 'BATCH_MAX_UNZIPPED_MB', 1)
+    monkeypatch.setattr(app_module, 'batch_analyzer', None)
+    client = app_module.app.test_client()
+    too_many = client.post('/api/analyze/batch', data={'resumes': [(io.BytesIO(many.getvalue()), 'many.zip')]})
+    too_large = client.post('/api/analyze/batch?format=ndjson', data={'resumes': [(io.BytesIO(large.getvalue()), 'large.zip')]})
+
+    assert too_many.status_code == 400 and 'zip archives' in too_many.get_json()['error']
+    assert too_large.status_code == 400 and 'unzipped' in too_large.get_json()['error']
+    assert app_module.batch_analyzer is None
@@ -0,0 +1,24 @@
+"""Offline tests for local scoring of feature matrices"""
+from bulk_scoring import rank_resumes, score_components, score_feature_matrix
+from resume_parser import ResumeParser
+
+
+def sample_texts():
+    parser = ResumeParser()
+    return [parser.extract_text('test_resume.pdf'), parser.extract_text('test_detailed_resume.pdf')]
+
+
+def test_scores_are_bounded_and_rank_detailed_resume_first():
+    """The detailed resume outranks the short one, with or without a job description"""
+    texts = sample_texts()
+    scores = score_feature_matrix(ResumeParser().featurize_batch(texts))
+    assert ((scores >= 0) & (scores <= 100)).all()
+    assert [index for index, _ in rank_resumes(texts, 'Senior Python engineer with AWS')] == [1, 0]
+
+
+def test_job_match_only_applies_when_description_names_skills():
+    """Skills named in the job description add a coverage component"""
+    matrix = ResumeParser().featurize_batch(sample_texts())
+    assert 'job_match' not in score_components(matrix, 'Friendly self-starter')
+    coverage = score_components(matrix, 'Python, Kubernetes and Rust')['job_match']
+    assert coverage[1] == 1.0
@@ -0,0 +1,43 @@
+"""Offline tests for the rule-based fallback analysis"""
+from fallback_analysis import RULES, Rule, apply_rules, count_digits, extract_features, generate_fallback_analysis
+from resume_parser import ResumeParser
+
+
+def test_features_are_computed_once_from_text_and_parsed_data():
+    """Keyword groups count distinct substrings; digits and percent signs are counted"""
+    text = "PROFESSIONAL EXPERIENCE\nLed and developed APIs, improved uptime by 40% in 2023\n"
+    features = extract_features({'email': 'cool123@example.com', 'skills': ['Python', 'Excel']}, text)
+    assert features['action_verbs'] == 3
+    assert features['experience_terms'] is True
+    assert (features['digit_count'], features['percent_count']) == (6, 1)
+    assert (features['skills_count'], features['tech_skills_count']) == (2, 1)
+    assert features['unprofessional_email'] is True
+
+
+def test_digits_include_non_ascii_digits():
+    """Digits are whatever str.isdigit() accepts, such as Arabic-Indic digits and superscripts"""
+    for text in ['Grew sales 40% in 2023', 'Grew sales ٤٠% in ٢٠٢٣', 'x² + 10³', '']:
+        assert count_digits(text) == sum(char.isdigit() for char in text)
+
+
+def test_first_matching_rule_in_a_group_wins():
+    """Groups behave like if/elif chains and messages are formatted with the features"""
+    rules = [[
+        Rule(lambda f: f['word_count'] > 10, strengths=["Long ({word_count} words)"]),
+        Rule(lambda f: True, weaknesses=["Short ({word_count} words)"]),
+    ]]
+    assert apply_rules({'word_count': 20}, rules) == {
+        'strengths': ['Long (20 words)'], 'weaknesses': [], 'recommendations': []
+    }
+    assert apply_rules({'word_count': 3}, rules)['weaknesses'] == ['Short (3 words)']
+
+
+def test_fallback_analysis_for_sample_resume():
+    """The sample resume gets findings for its structured experience and formatting"""
+    parser = ResumeParser()
+    text = parser.extract_text('test_detailed_resume.pdf')
+    analysis = generate_fallback_analysis(parser.parse_resume(text), text)
+    assert len(RULES) > 20
+    assert "Bullet points used effectively for readability and scanning" in analysis['strengths']
+    assert any(strength.startswith('Strong work history with') for strength in analysis['strengths'])
+    assert analysis['summary'].startswith(f"Comprehensive resume analysis completed. Identified {len(analysis['strengths'])} key strengths")
@@ -0,0 +1,59 @@
+"""Offline tests for the local BM25 job-description matcher"""
+import os
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from jd_matcher import BM25Index, extract_terms
+
+JOB = "Looking for a Python engineer with Kubernetes, machine learning and GraphQL experience"
+
+
+def test_terms_drop_stop_words_and_keep_skill_phrases():
+    """Boilerplate words are dropped and multi-word skills become single terms"""
+    assert extract_terms(JOB) == ['python', 'engineer', 'kubernetes', 'machine', 'learning', 'graphql', 'machine learning']
+
+
+def test_incremental_index_search_and_eviction():
+    """Resumes are added one at a time, rare terms weigh more and the oldest are evicted"""
+    index = BM25Index(max_documents=3)
+    assert index.add('a', "Python developer, Django and SQL")
+    assert index.add('b', "Python and Kubernetes platform engineer")
+    assert not index.add('a', "duplicate")
+    assert index.idf('kubernetes') > index.idf('python')
+    assert [doc_id for doc_id, _ in index.search('kubernetes python')] == ['b', 'a']
+
+    index.add('c', "Java developer")
+    index.add('d', "Go developer")
+    assert len(index) == 3 and 'a' not in index
+    assert index.search('django') == []
+
+
+def test_match_reports_matched_and_missing_keywords():
+    """Scores grow with coverage; missing keywords are listed"""
+    index = BM25Index()
+    index.add('other', "Java developer with SQL")
+    strong = index.match("Python engineer. Kubernetes, GraphQL, machine learning pipelines", JOB)
+    weak = index.match("Python developer", JOB)
+    assert strong['score'] > weak['score'] > 0
+    assert set(strong['matched_keywords']) == set(extract_terms(JOB))
+    assert weak['matched_keywords'] == ['python']
+    assert 'kubernetes' in weak['missing_keywords']
+    assert index.match("anything", "")['score'] == 0.0
+
+
+def test_score_endpoint_local_mode_skips_the_llm(monkeypatch):
+    """?mode=local answers from the index without calling the AI"""
+    def fail(*args, **kwargs):
+        raise AssertionError('LLM should not be called')
+
+    monkeypatch.setattr(app_module, 'job_matcher', BM25Index())
+    monkeypatch.setattr(app_module.get_ai_analyzer(), 'score_resume', fail)
+    client = app_module.app.test_client()
+    response = client.post('/api/score?mode=local', json={'resume_text': 'Python and Kubernetes', 'job_description': JOB})
+    assert response.status_code == 200
+    assert set(response.get_json()['job_match']['matched_keywords']) == {'kubernetes', 'python'}
+    assert len(app_module.job_matcher) == 1
+
+    response = client.post('/api/score?mode=local', json={'resume_text': 'Python'})
+    assert response.status_code == 400
@@ -0,0 +1,110 @@
+"""Offline tests for the background analysis job queue"""
+import os
+import threading
+import time
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from ai_analyzer import AIAnalyzer
+from job_queue import JobQueue, SQLiteJobStore, fail_unfinished_jobs
+from result_cache import ResultCache
+from stub_openai_server import StubOpenAIServer
+
+
+def wait_for(queue, job_id, timeout=10):
+    """Poll a job until it finishes"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in ('completed', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def test_submit_returns_before_pipeline_finishes():
+    """Jobs are queued immediately and report progress while running"""
+    release = threading.Event()
+
+    def pipeline(payload, progress):
+        progress('working', 0.5)
+        release.wait(5)
+        return {'echo': payload['value']}
+
+    queue = JobQueue(pipeline, workers=1)
+    job_id = queue.submit({'value': 42})
+    time.sleep(0.05)
+    job = queue.get(job_id)
+    assert (job['status'], job['stage'], job['progress']) == ('running', 'working', 0.5)
+
+    release.set()
+    job = wait_for(queue, job_id)
+    assert job['status'] == 'completed' and job['result'] == {'echo': 42}
+    queue.shutdown()
+
+
+def test_sqlite_store_persists_results_and_failures(tmp_path):
+    """Finished jobs survive a restart; unfinished ones are marked interrupted once recovered"""
+    db_path = str(tmp_path / 'jobs.db')
+
+    def pipeline(payload, progress):
+        if payload.get('fail'):
+            raise ValueError('corrupt PDF')
+        return {'ok': True}
+
+    queue = JobQueue(pipeline, store=SQLiteJobStore(db_path))
+    done_id = queue.submit({})
+    failed_id = queue.submit({'fail': True})
+    wait_for(queue, done_id)
+    wait_for(queue, failed_id)
+    queue.shutdown()
+    stuck_id = 'stuck'
+    queue.store.create({'id': stuck_id, 'status': 'running', 'progress': 0.4, 'created_at': time.time()})
+
+    restarted = SQLiteJobStore(db_path)
+    assert restarted.get(done_id)['result'] == {'ok': True}
+    assert restarted.get(failed_id)['error'] == 'corrupt PDF'
+    assert 'owner' not in restarted.get(done_id)
+    assert restarted.get(stuck_id)['status'] == 'running'
+    assert fail_unfinished_jobs(db_path) == 1
+    assert restarted.get(stuck_id)['status'] == 'failed'
+
+
+def test_opening_a_store_leaves_other_processes_jobs_running(tmp_path):
+    """Another worker opening the shared file doesn't fail jobs; recovery is limited to the exited process"""
+    db_path = str(tmp_path / 'jobs.db')
+    release = threading.Event()
+    queue = JobQueue(lambda payload, progress: release.wait(5) and {'ok': True}, store=SQLiteJobStore(db_path))
+    job_id = queue.submit({})
+    time.sleep(0.05)
+
+    SQLiteJobStore(db_path)
+    assert fail_unfinished_jobs(db_path, owner=os.getpid() + 1) == 0
+    assert queue.get(job_id)['status'] == 'running'
+    release.set()
+    assert wait_for(queue, job_id)['status'] == 'completed'
+    queue.shutdown()
+
+
+def test_jobs_endpoints_run_the_analysis_pipeline(monkeypatch):
+    """POST /api/jobs answers 202 at once and GET returns the analysis when done"""
+    with StubOpenAIServer(latency=0.2) as server:
+        monkeypatch.setattr(app_module, 'ai_analyzer', AIAnalyzer(api_key='test-key', base_url=server.base_url))
+        monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+        monkeypatch.setattr(app_module, 'job_queue', JobQueue(app_module.run_analysis_job, workers=2))
+        client = app_module.app.test_client()
+
+        with open('test_resume.pdf', 'rb') as f:
+            started = time.perf_counter()
+            response = client.post('/api/jobs', data={'resume': (f, 'test_resume.pdf')})
+            assert time.perf_counter() - started < 0.2
+        assert response.status_code == 202
+        job_id = response.get_json()['job_id']
+
+        job = wait_for(app_module.job_queue, job_id)
+        polled = client.get(f'/api/jobs/{job_id}').get_json()
+
+    assert job['status'] == 'completed'
+    assert polled['result']['ai_analysis']['weaknesses'] == ['Limited leadership examples']
+    assert client.get('/api/jobs/unknown').status_code == 404
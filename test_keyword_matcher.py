@@ -0,0 +1,37 @@
+"""Offline tests for the shared keyword matcher used by ResumeParser"""
+from keyword_matcher import KeywordMatcher
+from resume_parser import ResumeParser
+
+
+def test_word_boundaries():
+    """Keywords only match as whole words, including symbol-terminated ones"""
+    matcher = KeywordMatcher({'skill': ['ai', 'java', 'c++', 'node.js']})
+    hits = matcher.find_all("Maintained JavaScript and C++ services on Node.js with AI")
+    assert [hit.keyword for hit in hits] == ['c++', 'node.js', 'ai']
+
+
+def test_overlapping_hits_and_offsets():
+    """Overlapping keywords are all reported with offsets into the original text"""
+    matcher = KeywordMatcher({'skill': ['rest api', 'machine learning'], 'tech': ['api']})
+    text = "Built REST  API for Machine\nLearning"
+    hits = matcher.find_all(text)
+    assert [(hit.keyword, hit.category) for hit in hits] == [
+        ('rest api', 'skill'), ('api', 'tech'), ('machine learning', 'skill')
+    ]
+    assert text[hits[0].start:hits[0].end] == 'REST  API'
+
+
+def test_keyword_in_several_categories():
+    """A keyword registered under two categories yields one hit per category"""
+    matcher = KeywordMatcher({'education': ['associate'], 'job_title': ['associate']})
+    grouped = matcher.group_by_category("Associate Engineer")
+    assert set(grouped) == {'education', 'job_title'}
+
+
+def test_parser_skills_and_education():
+    """ResumeParser uses the shared matcher for skills and education lines"""
+    parser = ResumeParser()
+    text = "Maintained Python apps\nBachelor of Science\nUniversity of Technology\n"
+    data = parser.parse_resume(text)
+    assert data['skills'] == ['Python']
+    assert data['education'] == ['Bachelor of Science', 'University of Technology']
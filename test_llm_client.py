@@ -0,0 +1,97 @@
+"""Offline tests for LLM retries, circuit breaker and concurrency limit against the fault-injecting stub"""
+import os
+import threading
+import time
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from ai_analyzer import AIAnalyzer
+from llm_client import CircuitBreaker, ResilientLLM
+from result_cache import ResultCache
+from stub_openai_server import StubOpenAIServer
+
+RESUME = "Jane Doe\nSoftware Engineer | Acme Inc.\n2019 - Present\n- Built Python services"
+
+
+def make_analyzer(server, **llm_options):
+    llm_options.setdefault('base_delay', 0.01)
+    return AIAnalyzer(api_key='test-key', base_url=server.base_url, timeout=0.3, llm=ResilientLLM(**llm_options))
+
+
+def test_retries_429_500_and_timeouts():
+    """Transient failures are retried until the stub answers normally"""
+    with StubOpenAIServer(faults=[429, 500, 'timeout'], hang=1.0) as server:
+        scores = make_analyzer(server).score_resume(RESUME)
+        assert server.request_count == 4
+    assert scores['overall_score'] == 79
+    assert 'error' not in scores
+
+
+def test_retry_after_is_honored():
+    """A 429 with Retry-After waits at least that long before retrying"""
+    with StubOpenAIServer(faults=[429], retry_after=0.3) as server:
+        started = time.perf_counter()
+        scores = make_analyzer(server).score_resume(RESUME)
+        elapsed = time.perf_counter() - started
+    assert scores['overall_score'] == 79
+    assert elapsed >= 0.3
+
+
+def test_client_errors_are_not_retried():
+    """A 400 fails at once and does not count against the upstream's health"""
+    with StubOpenAIServer(faults=[400]) as server:
+        analyzer = make_analyzer(server)
+        scores = analyzer.score_resume(RESUME)
+        assert server.request_count == 1
+    assert scores['error'].startswith('Scoring failed')
+    assert analyzer.llm.breaker.state == 'closed'
+
+
+def test_circuit_opens_then_recovers():
+    """Repeated failures open the circuit, which refuses calls until the reset timeout passes"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    with StubOpenAIServer(faults=[503] * 4) as server:
+        analyzer = make_analyzer(server, max_retries=1, breaker=breaker)
+        analyzer.analyze_resume(RESUME)
+        analyzer.analyze_resume(RESUME)
+        assert breaker.state == 'open'
+
+        refused = analyzer.analyze_resume(RESUME)
+        assert server.request_count == 4
+        assert 'circuit breaker is open' in refused['error']
+
+        time.sleep(0.25)
+        assert breaker.state == 'half_open'
+        recovered = analyzer.analyze_resume(RESUME)
+        assert server.request_count == 5
+    assert recovered['strengths'] and breaker.state == 'closed'
+
+
+def test_semaphore_caps_in_flight_requests():
+    """No more than max_concurrency requests reach the API at once"""
+    with StubOpenAIServer(latency=0.1) as server:
+        analyzer = make_analyzer(server, max_concurrency=2)
+        threads = [threading.Thread(target=analyzer.score_resume, args=(RESUME,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert server.request_count == 6
+        assert server.max_concurrent == 2
+
+
+def test_open_circuit_falls_back_without_calling_the_api(monkeypatch):
+    """/api/analyze returns the rule-based analysis immediately while the circuit is open"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    with StubOpenAIServer() as server:
+        monkeypatch.setattr(app_module, 'ai_analyzer', make_analyzer(server, breaker=breaker))
+        monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+        client = app_module.app.test_client()
+        with open('test_resume.pdf', 'rb') as f:
+            response = client.post('/api/analyze', data={'resume': (f, 'test_resume.pdf')})
+        assert server.request_count == 0
+    analysis = response.get_json()['ai_analysis']
+    assert analysis['strengths'] or analysis['weaknesses'] or analysis['recommendations']
+    assert client.get('/api/health').get_json()['llm']['circuit']['state'] == 'open'
@@ -0,0 +1,55 @@
+"""Offline tests for stage timers, /api/metrics and the Server-Timing header"""
+import os
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from ai_analyzer import AIAnalyzer
+from metrics import MetricsRegistry
+from result_cache import ResultCache
+from stub_openai_server import StubOpenAIServer
+
+
+def test_registry_renders_prometheus_text():
+    """Counters and cumulative histogram buckets in the text exposition format"""
+    registry = MetricsRegistry()
+    registry.counter('jobs_total', 'Jobs').inc(2, status='done')
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+    lines = registry.render().splitlines()
+    assert '# TYPE jobs_total counter' in lines
+    assert 'jobs_total{status="done"} 2' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'latency_seconds_count 3' in lines
+
+
+def test_analyze_reports_stage_timings_and_metrics(monkeypatch):
+    """/api/analyze times each stage in Server-Timing and the counters reach /api/metrics"""
+    with StubOpenAIServer() as server:
+        monkeypatch.setattr(app_module, 'ai_analyzer', AIAnalyzer(api_key='test-key', base_url=server.base_url))
+        monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+        client = app_module.app.test_client()
+        # The second upload is answered from the result cache
+        responses = []
+        for _ in range(2):
+            with open('test_resume.pdf', 'rb') as f:
+                responses.append(client.post('/api/analyze', data={'resume': (f, 'test_resume.pdf')}))
+        assert [response.status_code for response in responses] == [200, 200]
+        timing = responses[0].headers['Server-Timing']
+
+    stages = [entry.split(';')[0] for entry in timing.split(', ')]
+    assert stages == ['upload', 'extract_text', 'parse_resume', 'llm', 'total']
+
+    metrics = client.get('/api/metrics')
+    assert metrics.mimetype == 'text/plain'
+    text = metrics.get_data(as_text=True)
+    assert 'resume_analyzer_http_requests_total{method="POST",route="/api/analyze",status="200"}' in text
+    assert 'resume_analyzer_stage_seconds_count{stage="llm"}' in text
+    assert 'resume_analyzer_cache_lookups_total{result="memory_hit"}' in text
+    assert 'resume_analyzer_llm_requests_total{outcome="success"}' in text
+    prompt_tokens = [line for line in text.splitlines() if line.startswith('resume_analyzer_llm_tokens_total{type="prompt"}')]
+    assert float(prompt_tokens[0].split()[-1]) > 0
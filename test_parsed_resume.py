@@ -0,0 +1,65 @@
+"""Offline tests for the slotted parse result model and its binary form"""
+import os
+import sqlite3
+
+import pytest
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from parsed_resume import ParsedResume
+from result_cache import ResultCache
+from resume_parser import ResumeParser
+
+with open('test_resume.txt', encoding='utf-8') as f:
+    TEXT = f.read()
+
+
+def test_parse_matches_parse_resume_and_round_trips():
+    """parse() carries the same data as the parse_resume dict, through bytes and back"""
+    parser = ResumeParser()
+    parsed = parser.parse(TEXT)
+    assert parsed.to_dict() == parser.parse_resume(TEXT)
+    assert ParsedResume.from_dict(parsed.to_dict()) == parsed
+    assert not hasattr(parsed, '__dict__') and not hasattr(parsed.work_experience[0], '__dict__')
+
+    data = parsed.to_bytes(full_text=False)
+    restored = ParsedResume.from_bytes(data)
+    assert restored.full_text is None and 'full_text' not in restored.to_dict()
+    assert restored.to_dict() == parsed.to_dict(full_text=False)
+    assert len(data) < len(TEXT)
+    # Skill names are shared between resumes
+    assert restored.skills[0] is parser.parse(TEXT).skills[0]
+
+    with pytest.raises(ValueError):
+        ParsedResume.from_bytes(b'\x00' + data[1:])
+
+
+def test_cache_disk_tier_is_binary_and_skips_old_rows(tmp_path):
+    """Entries are stored compactly; rows in the old JSON format read as misses"""
+    db_path = str(tmp_path / 'cache.db')
+    ResultCache(db_path=db_path).set('key', {'parsed_data': b'\x01raw', 'scores': None})
+    with sqlite3.connect(db_path) as db:
+        db.execute("INSERT INTO results VALUES ('old', '{\"v\": 1}', 1e12)")
+    restarted = ResultCache(db_path=db_path)
+    assert restarted.get('key') == {'parsed_data': b'\x01raw', 'scores': None}
+    assert restarted.get('old') is None
+
+
+def test_analyze_can_omit_full_text(monkeypatch):
+    """?omit=full_text replaces the resume text with its hash, on fresh and cached results"""
+    monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+    monkeypatch.setattr(app_module.get_ai_analyzer(), 'analyze_resume', lambda resume_text, job_description="": {
+        'summary': 'ok', 'strengths': ['x'], 'weaknesses': [], 'recommendations': []
+    })
+    client = app_module.app.test_client()
+    responses = []
+    for query in ('?omit=full_text', '', '?omit=full_text'):
+        with open('test_resume.pdf', 'rb') as f:
+            responses.append(client.post('/api/analyze' + query, data={'resume': (f, 'test_resume.pdf')}).get_json())
+
+    full = responses[1]['parsed_data']
+    for response in (responses[0], responses[2]):
+        assert 'full_text' not in response['parsed_data']
+        assert response['parsed_data']['text_hash'] == app_module.resume_key(full['full_text'])
+        assert response['parsed_data']['skills'] == full['skills']
@@ -0,0 +1,73 @@
+"""Offline tests for prompt compaction"""
+from ai_analyzer import AIAnalyzer
+from prompt_compactor import TRUNCATION_MARKER, compact_resume, estimate_tokens, truncate_sections
+from stub_openai_server import StubOpenAIServer, default_reply
+
+PAGE = """Jane Doe | jane@example.com
+Experience
+Senior Engineer, Acme Corp   2019 - Present
+-   Built    Python services
+Page {page} of 2
+"""
+
+RESUME = PAGE.format(page=1) + """Skills
+Python, Kubernetes, SQL
+-   Built    Python services
+Interests
+Chess, hiking, long-distance running, photography and amateur astronomy
+""" + PAGE.format(page=2).replace('Experience\n', '')
+
+
+def test_cleanup_removes_noise_but_keeps_content():
+    """Whitespace runs, page numbers and repeated page headers or duplicate lines disappear"""
+    text, stats = compact_resume(RESUME, max_tokens=None)
+    lines = text.split('\n')
+    assert lines.count('Jane Doe | jane@example.com') == 1
+    assert lines.count('- Built Python services') == 1
+    assert 'Senior Engineer, Acme Corp 2019 - Present' in lines
+    assert not any(line.startswith('Page') for line in lines)
+    assert stats['tokens_saved'] == stats['original_tokens'] - estimate_tokens(text) > 0
+    assert not stats['truncated']
+
+
+def test_budget_cuts_lowest_priority_sections_first():
+    """Interests go before skills and experience; the contact line always stays"""
+    full, _ = compact_resume(RESUME, max_tokens=None)
+    text, stats = compact_resume(RESUME, max_tokens=estimate_tokens(full) - 5)
+    assert stats['truncated'] and stats['compacted_tokens'] <= estimate_tokens(full) - 5
+    assert text.startswith('Jane Doe | jane@example.com\nExperience')
+    assert 'Python, Kubernetes, SQL' in text
+    assert 'astronomy' not in text
+    assert text.endswith(TRUNCATION_MARKER)
+
+
+def test_single_long_line_is_cut_to_budget():
+    """Text without line breaks is shortened rather than dropped"""
+    text, stats = compact_resume('word ' * 2000, max_tokens=100)
+    assert text.startswith('word word') and stats['compacted_tokens'] <= 100
+
+
+def test_dropped_section_leaves_its_budget_to_later_sections():
+    """A section with no room for any of its lines costs nothing, not even its marker"""
+    lines = ['Jane Doe', 'Skills', 'Python, Kubernetes, SQL, Terraform, PostgreSQL', 'Awards']
+    marker_cost = estimate_tokens(TRUNCATION_MARKER + '\n')
+    awards_cost = estimate_tokens('Awards\n')
+    assert awards_cost <= marker_cost
+    kept, truncated = truncate_sections(lines, estimate_tokens('Jane Doe\n') + awards_cost)
+    assert truncated and kept == ['Jane Doe', 'Awards']
+
+
+def test_analyzer_sends_compacted_resume():
+    """Prompts carry the compacted text and results report the tokens saved"""
+    prompts = []
+
+    def reply(messages):
+        prompts.append(messages[-1]['content'])
+        return default_reply(messages)
+
+    with StubOpenAIServer(reply=reply) as server:
+        analyzer = AIAnalyzer(api_key='test-key', base_url=server.base_url)
+        scores = analyzer.score_resume(RESUME)
+    assert 'Page 1 of 2' not in prompts[0] and prompts[0].count('jane@example.com') == 1
+    assert scores['overall_score'] == 79
+    assert scores['prompt_compaction']['tokens_saved'] > 0
@@ -0,0 +1,130 @@
+"""Offline tests for the content-hash result cache"""
+import os
+import sqlite3
+import time
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+import result_cache
+from result_cache import ResultCache, make_cache_key
+
+
+def test_key_depends_on_content_job_and_model():
+    """Any change in bytes, job description or model gives a new key"""
+    base = make_cache_key(b'resume', 'python dev', 'gpt-3.5-turbo')
+    assert base == make_cache_key(b'resume', 'python dev', 'gpt-3.5-turbo')
+    assert base != make_cache_key(b'resume!', 'python dev', 'gpt-3.5-turbo')
+    assert base != make_cache_key(b'resume', 'java dev', 'gpt-3.5-turbo')
+    assert base != make_cache_key(b'resume', 'python dev', 'gpt-4')
+    assert base != make_cache_key(b'resume', 'python dev', 'gpt-3.5-turbo', kind='score')
+
+
+def test_lru_eviction_and_ttl():
+    """Least recently used entries are evicted and expired entries miss"""
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.set('a', {'v': 1})
+    cache.set('b', {'v': 2})
+    assert cache.get('a') == {'v': 1}
+    cache.set('c', {'v': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 1}
+
+    short = ResultCache(ttl_seconds=0.01)
+    short.set('a', {'v': 1})
+    time.sleep(0.02)
+    assert short.get('a') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 1, 1)
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    """A fresh cache on the same database file serves earlier results"""
+    db_path = str(tmp_path / 'cache.db')
+    ResultCache(db_path=db_path).set('key', {'summary': 'ok'})
+    restarted = ResultCache(db_path=db_path)
+    assert 'key' in restarted and 'other' not in restarted
+    assert restarted.get('key') == {'summary': 'ok'}
+    assert restarted.stats()['disk_hits'] == 1 and restarted.stats()['misses'] == 0
+
+
+def test_sqlite_tier_prunes_expired_rows_and_caps_its_size(tmp_path, monkeypatch):
+    """Every DISK_PRUNE_INTERVAL writes, expired rows go and only the max_disk_entries latest rows stay"""
+    monkeypatch.setattr(result_cache, 'DISK_PRUNE_INTERVAL', 5)
+    db_path = str(tmp_path / 'cache.db')
+    ResultCache(db_path=db_path, ttl_seconds=0.01).set('stale', {'v': 0})
+    time.sleep(0.02)
+
+    cache = ResultCache(max_entries=1, db_path=db_path, max_disk_entries=3)
+    stale = ResultCache(db_path=db_path, ttl_seconds=0.01)
+    stale.set('expiring', {'v': -1})
+    time.sleep(0.02)
+    for number in range(4):
+        cache.set(str(number), {'v': number})
+    assert disk_keys(db_path) == {'0', '1', '2', '3', 'expiring'}
+
+    cache.set('4', {'v': 4})
+    assert disk_keys(db_path) == {'2', '3', '4'}
+    assert cache.stats()['disk_evictions'] == 2
+    assert cache.get('4') == {'v': 4} and cache.get('0') is None
+
+
+def disk_keys(db_path):
+    with sqlite3.connect(db_path) as db:
+        return {key for key, in db.execute('SELECT key FROM results')}
+
+
+def test_analyze_endpoint_reuses_cached_result(monkeypatch):
+    """A second upload of the same PDF skips extraction and the LLM"""
+    calls = []
+
+    def fake_analyze(resume_text, job_description=""):
+        calls.append(resume_text)
+        return {'summary': 'Solid', 'strengths': ['Python'], 'weaknesses': [], 'recommendations': []}
+
+    monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+    monkeypatch.setattr(app_module.get_ai_analyzer(), 'analyze_resume', fake_analyze)
+    client = app_module.app.test_client()
+
+    for _ in range(2):
+        with open('test_resume.pdf', 'rb') as f:
+            response = client.post('/api/analyze', data={'resume': (f, 'test_resume.pdf'), 'job_description': 'dev'})
+        assert response.status_code == 200
+        assert response.get_json()['ai_analysis']['summary'] == 'Solid'
+        assert response.get_json()['job_match']['indexed_resumes'] >= 1
+
+    assert len(calls) == 1
+    cache_stats = client.get('/api/health').get_json()['cache']
+    assert (cache_stats['hits'], cache_stats['misses']) == (1, 1)
+
+
+def test_score_and_suggestions_by_resume_id(monkeypatch):
+    """/api/analyze returns a resume_id that stands in for the text, compacted once, in later requests"""
+    monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+    monkeypatch.setattr(app_module, 'resume_store', ResultCache(max_entries=1, lookups=app_module.RESUME_STORE_LOOKUPS))
+    analyzer = app_module.get_ai_analyzer()
+    seen = []
+    monkeypatch.setattr(analyzer, 'analyze_resume', lambda resume_text, job_description="": {
+        'summary': 'ok', 'strengths': ['x'], 'weaknesses': [], 'recommendations': []
+    })
+    monkeypatch.setattr(analyzer, 'score_resume', lambda resume_text, job_description="", compacted=None:
+                        seen.append(compacted) or {'overall_score': 80})
+    monkeypatch.setattr(analyzer, 'get_suggestions', lambda resume_text, job_description="", compacted=None:
+                        seen.append(compacted) or {'suggestions': []})
+    client = app_module.app.test_client()
+
+    with open('test_resume.pdf', 'rb') as f:
+        analyzed = client.post('/api/analyze?omit=full_text', data={'resume': (f, 'test_resume.pdf')}).get_json()
+    resume_id = analyzed['resume_id']
+    assert resume_id == analyzed['parsed_data']['text_hash']
+
+    assert client.post('/api/score', json={'resume_id': resume_id}).get_json() == {'overall_score': 80}
+    assert client.post('/api/suggestions', json={'resume_id': resume_id}).status_code == 200
+    assert len(seen) == 2 and seen[0] == seen[1] and 'full_text' not in analyzed['parsed_data']
+    stored = app_module.resume_store.get(resume_id)
+    assert 'parsed_data' not in stored
+    assert seen[0] == (stored['prompt_text'], stored['prompt_compaction'])
+    assert seen[0] == analyzer.compact_resume(stored['resume_text'])
+
+    assert client.post('/api/score', json={'resume_id': 'unknown'}).status_code == 404
+    assert client.post('/api/suggestions', json={}).status_code == 400
@@ -0,0 +1,79 @@
+"""Offline tests for the command-line batch analyzer"""
+import json
+import shutil
+
+from batch_analyzer import BatchAnalyzer
+from fallback_analysis import generate_fallback_analysis
+from resume_analyzer import load_processed, main, run_batch
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_batch_writes_jsonl_and_resumes(tmp_path):
+    """Every resume gets one line; a rerun skips what is already in the output and retries failures"""
+    resumes = tmp_path / 'resumes'
+    (resumes / 'nested').mkdir(parents=True)
+    shutil.copy('test_resume.pdf', resumes / 'short.pdf')
+    shutil.copy('test_detailed_resume.pdf', resumes / 'nested' / 'detailed.pdf')
+    shutil.copy('test_resume.pdf', resumes / 'copy.pdf')
+    (resumes / 'broken.docx').write_bytes(b'not a docx')
+    (resumes / 'notes.txt').write_text('ignored')
+    jd = tmp_path / 'jd.txt'
+    jd.write_text('Senior Python engineer with AWS and Docker')
+    out = tmp_path / 'results.jsonl'
+
+    assert main(['batch', str(resumes), '--jd', str(jd), '--workers', '0', '--out', str(out)]) == 0
+    lines = read_lines(out)
+    assert [line['filename'] for line in lines] == ['broken.docx', 'copy.pdf', 'nested/detailed.pdf']
+    assert lines[0]['error'].startswith('Error reading resume')
+    detailed = lines[2]
+    assert 0 < detailed['scores']['overall_score'] <= 100
+    assert detailed['ai_analysis']['strengths'] and 'full_text' not in detailed['parsed_data']
+
+    # An interrupted write leaves half a line; it is dropped and the resume analyzed again
+    with open(out, 'rb+') as f:
+        f.truncate(out.stat().st_size - 10)
+    assert load_processed(str(out)) == {lines[1]['content_hash']}
+    progress = run_batch(str(resumes), str(out), jd.read_text(), BatchAnalyzer(None, generate_fallback_analysis, parse_workers=0))
+    assert (progress.analyzed, progress.skipped) == (2, 2)
+    assert [line['content_hash'] for line in read_lines(out)] == [line['content_hash'] for line in lines[:2] + lines[::2]]
+
+
+class FlakyAnalyzer:
+    """AI analyzer whose first call fails, like an LLM timeout"""
+    model = 'test-model'
+
+    def __init__(self):
+        self.calls = 0
+
+    def analyze_and_score(self, resume_text, job_description=""):
+        self.calls += 1
+        if self.calls == 1:
+            return {'error': 'AI analysis failed: Request timed out', 'strengths': [], 'weaknesses': [], 'recommendations': []}
+        return {'summary': 'ok', 'strengths': ['Python'], 'weaknesses': [], 'recommendations': [],
+                'scores': {'overall_score': 75}}
+
+
+def test_rerun_retries_results_whose_ai_call_failed(tmp_path):
+    """A transient AI failure is written with the fallback and an ai_error, then retried by the next run"""
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    shutil.copy('test_resume.pdf', resumes / 'short.pdf')
+    out = tmp_path / 'results.jsonl'
+    batch = BatchAnalyzer(FlakyAnalyzer(), generate_fallback_analysis, parse_workers=0)
+
+    run_batch(str(resumes), str(out), batch=batch)
+    failed, = read_lines(out)
+    assert failed['ai_error'].endswith('timed out') and failed['ai_analysis']['strengths'] and failed['scores'] is None
+
+    progress = run_batch(str(resumes), str(out), batch=batch)
+    assert (progress.analyzed, progress.skipped) == (1, 0)
+    retried = read_lines(out)[1]
+    assert retried['content_hash'] == failed['content_hash'] and 'ai_error' not in retried
+    assert retried['scores'] == {'overall_score': 75}
+
+    progress = run_batch(str(resumes), str(out), batch=batch)
+    assert (progress.analyzed, progress.skipped) == (0, 1)
@@ -0,0 +1,136 @@
+"""Offline tests for the persistent resume search index"""
+import json
+import os
+
+import pytest
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from resume_index import ResumeIndex, skill_query_to_fts
+
+
+def resume(skills, years, titles=(), education=()):
+    return {
+        'email': 'jane@example.com',
+        'skills': skills,
+        'experience_years': years,
+        'education': list(education),
+        'work_experience': [{'title_line': title, 'date_range': '2019 - 2021', 'duration_years': 2} for title in titles]
+    }
+
+
+def test_skill_query_translation():
+    """Skills become exact FTS tokens; malformed queries are rejected"""
+    assert skill_query_to_fts('kubernetes AND (c++ OR "Machine Learning") NOT java') == (
+        'skills : ("kubernetes" AND ( "cplusplus" OR "machine_learning" ) NOT "java")'
+    )
+    for query in ['AND python', 'python OR', '(python', 'python)', '()']:
+        with pytest.raises(ValueError):
+            skill_query_to_fts(query)
+
+
+def test_boolean_queries_filters_and_ranking(tmp_path):
+    """Matches are ranked by experience, filtered by years, and survive a restart"""
+    db_path = str(tmp_path / 'index.db')
+    index = ResumeIndex(db_path)
+    index.add('junior', 'junior.pdf', resume(['Python', 'Docker'], 1, titles=['Data Analyst | Acme']))
+    index.add('senior', 'senior.pdf', resume(['Python', 'Kubernetes', 'C++'], 8, education=['MSc Physics']))
+    index.add('java', 'java.pdf', resume(['Java', 'Kubernetes'], 12))
+
+    assert [r['id'] for r in index.search('python')] == ['senior', 'junior']
+    assert [r['id'] for r in index.search('kubernetes NOT java')] == ['senior']
+    assert [r['id'] for r in index.search('c++ OR docker', min_years=5)] == ['senior']
+    assert [r['id'] for r in index.search('kubernetes', max_years=10)] == ['senior']
+    assert [r['id'] for r in index.search(text='analyst')] == ['junior']
+    assert [r['id'] for r in index.search(min_years=5, limit=1)] == ['java']
+
+    index.add('junior', 'junior.pdf', resume(['Go'], 2))
+    restarted = ResumeIndex(db_path)
+    assert len(restarted) == 3
+    assert [r['id'] for r in restarted.search('python')] == ['senior']
+    assert restarted.search('physics') == []
+    assert restarted.search(text='physics')[0]['skills'] == ['Python', 'Kubernetes', 'C++']
+
+
+SEARCH_AUTH = {'Authorization': 'Bearer search-key'}
+
+
+def stub_analysis(monkeypatch):
+    monkeypatch.setattr(app_module.get_ai_analyzer(), 'analyze_resume', lambda resume_text, job_description="": {
+        'summary': 'ok', 'strengths': ['x'], 'weaknesses': [], 'recommendations': []
+    })
+    monkeypatch.setattr(app_module, 'result_cache', app_module.ResultCache())
+
+
+def test_analyzed_resumes_are_searchable(monkeypatch):
+    """With SEARCH_API_KEY set, /api/analyze indexes the parsed resume and /api/search finds it, without emails"""
+    monkeypatch.setattr(app_module, 'SEARCH_API_KEY', 'search-key')
+    monkeypatch.setattr(app_module, 'resume_index', ResumeIndex())
+    stub_analysis(monkeypatch)
+    client = app_module.app.test_client()
+    with open('test_detailed_resume.pdf', 'rb') as f:
+        assert client.post('/api/analyze', data={'resume': (f, 'sarah.pdf')}).status_code == 200
+
+    found = client.get('/api/search?skills=python AND docker&min_years=1', headers=SEARCH_AUTH).get_json()
+    assert found['count'] == 1 and found['results'][0]['filename'] == 'sarah.pdf'
+    assert 'email' not in found['results'][0]
+    assert client.get('/api/search?skills=python AND cobol', headers=SEARCH_AUTH).get_json()['count'] == 0
+    assert client.get('/api/search?skills=python AND', headers=SEARCH_AUTH).status_code == 400
+    assert client.get('/api/search?skills=python').status_code == 401
+    assert client.get('/api/search?skills=python', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+
+
+def test_search_is_off_without_a_key_and_indexing_never_fails_analysis(monkeypatch, caplog):
+    """By default nothing is indexed and search answers 404; an index error doesn't fail /api/analyze"""
+    class BrokenIndex:
+        def add(self, *args):
+            raise Exception('no such module: fts5')
+
+    monkeypatch.setattr(app_module, 'SEARCH_API_KEY', None)
+    monkeypatch.setattr(app_module, 'resume_index', BrokenIndex())
+    stub_analysis(monkeypatch)
+    client = app_module.app.test_client()
+    with open('test_resume.pdf', 'rb') as f:
+        assert client.post('/api/analyze', data={'resume': (f, 'a.pdf')}).status_code == 200
+    assert client.get('/api/search?skills=python', headers=SEARCH_AUTH).status_code == 404
+
+    monkeypatch.setattr(app_module, 'SEARCH_API_KEY', 'search-key')
+    errors = app_module.INDEX_ERRORS.value()
+    with open('test_detailed_resume.pdf', 'rb') as f:
+        assert client.post('/api/analyze', data={'resume': (f, 'b.pdf')}).status_code == 200
+    assert app_module.INDEX_ERRORS.value() == errors + 1
+    failure, = [record for record in caplog.records if record.name == 'app']
+    assert failure.getMessage() == 'Indexing resume failed' and 'fts5' in str(failure.exc_info[1])
+
+
+def test_files_from_earlier_versions_lose_their_emails(tmp_path):
+    """Opening an index file that stored email addresses clears them"""
+    import sqlite3
+    db_path = str(tmp_path / 'index.db')
+    db = sqlite3.connect(db_path)
+    db.execute('CREATE TABLE resumes (rowid INTEGER PRIMARY KEY, id TEXT UNIQUE, filename TEXT, email TEXT, '
+               'experience_years INTEGER, skills TEXT, education TEXT, work_experience TEXT, indexed_at REAL)')
+    db.execute("INSERT INTO resumes (id, email) VALUES ('a', 'jane@example.com')")
+    db.commit()
+    db.close()
+
+    ResumeIndex(db_path)
+    assert sqlite3.connect(db_path).execute('SELECT email FROM resumes').fetchall() == [(None,)]
+
+
+def test_search_streams_every_match_as_ndjson(monkeypatch):
+    """iter_search pages through all matches in search order; ?format=ndjson streams them"""
+    index = ResumeIndex()
+    index.add_many((f'r{i}', f'r{i}.pdf', resume(['Python'] + (['Go'] if i % 3 == 0 else []), i % 11)) for i in range(250))
+    assert [r['id'] for r in index.iter_search(skills='go', page_size=7)] == [r['id'] for r in index.search(skills='go', limit=1000)]
+    assert [r['id'] for r in index.iter_search(min_years=4, page_size=10)] == [r['id'] for r in index.search(min_years=4, limit=1000)]
+
+    monkeypatch.setattr(app_module, 'SEARCH_API_KEY', 'search-key')
+    monkeypatch.setattr(app_module, 'resume_index', index)
+    response = app_module.app.test_client().get('/api/search?skills=python&format=ndjson', headers=SEARCH_AUTH)
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 250 and lines[0]['experience_years'] == 10
+    response = app_module.app.test_client().get('/api/search?skills=python&limit=3', headers={**SEARCH_AUTH, 'Accept': 'application/x-ndjson'})
+    assert len(response.get_data(as_text=True).splitlines()) == 3
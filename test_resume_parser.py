@@ -0,0 +1,188 @@
+"""Offline tests for ResumeParser work experience extraction"""
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import PyPDF2
+
+import resume_parser
+from resume_parser import FEATURE_INDEX, FEATURE_NAMES, PDF_PAGES_TIMED_OUT, ResumeParser
+
+RESUME = """JANE DOE
+PROFESSIONAL SUMMARY
+Senior Software Engineer with 6 years of experience
+PROFESSIONAL EXPERIENCE
+Senior Software Engineer | Tech Solutions Inc.
+June 2021 - Present
+• Led migration to AWS
+• Mentored 3 junior developers
+Software Engineer | Digital Innovations Corp. | 2018 - 2021
+- Built RESTful APIs
+EDUCATION
+Bachelor of Science in Computer Science
+CERTIFICATIONS
+• AWS Certified Solutions Architect - Associate (2023)
+"""
+
+
+def test_entries_come_from_experience_section_only():
+    """Header segmentation ignores title words in the summary and bullets"""
+    entries = ResumeParser()._extract_work_experience(RESUME)
+    assert [entry['title_line'] for entry in entries] == [
+        'Senior Software Engineer | Tech Solutions Inc.',
+        'Software Engineer | Digital Innovations Corp. | 2018 - 2021',
+    ]
+
+
+def test_dates_and_bullets_are_assigned_by_offset():
+    """Date ranges on the same or next line and bullets up to the next entry"""
+    first, second = ResumeParser()._extract_work_experience(RESUME)
+    assert first['date_range'] == 'June 2021 - Present'
+    assert first['bullet_points'] == 2
+    assert second['date_range'] == '2018 - 2021'
+    assert second['duration_years'] == 3
+    # Bullets in the following CERTIFICATIONS section are not counted
+    assert second['bullet_points'] == 1
+
+
+def test_without_headers_falls_back_to_keyword_window():
+    """Resumes without section headers still yield entries near experience keywords"""
+    text = "Work history at a glance\nData Analyst | Acme LLC\n2019 - 2020\n"
+    entries = ResumeParser()._extract_work_experience(text)
+    assert entries[0]['title_line'] == 'Data Analyst | Acme LLC'
+    assert entries[0]['duration_years'] == 1
+
+
+def test_keyword_window_runs_from_9_lines_before_to_5_after():
+    """The fallback window's edges: entries 9 lines above and 5 below the keyword count, one further does not"""
+    lines = (['Data Analyst | Too Early LLC', 'Data Analyst | First LLC'] + ['lorem ipsum'] * 8
+             + ['Work history at a glance'] + ['lorem ipsum'] * 4
+             + ['Data Analyst | Last LLC', 'Data Analyst | Too Late LLC'])
+    entries = ResumeParser()._extract_work_experience('\n'.join(lines))
+    assert [entry['title_line'] for entry in entries] == ['Data Analyst | First LLC', 'Data Analyst | Last LLC']
+
+
+class ForwardOnlyStream:
+    """Minimal non-seekable binary stream, like a raw socket body"""
+
+    def __init__(self, data):
+        self._data = data
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self._data)
+        chunk, self._data = self._data[:size], self._data[size:]
+        return chunk
+
+
+def test_extract_text_from_stream_matches_path_extraction():
+    """Bytes, seekable and forward-only streams give the same text as a path"""
+    parser = ResumeParser()
+    expected = parser.extract_text('test_resume.pdf')
+    with open('test_resume.pdf', 'rb') as f:
+        data = f.read()
+        assert parser.extract_text_from_stream(f, 'resume.PDF') == expected
+    assert parser.extract_text_from_stream(data, 'test_resume.pdf') == expected
+    assert parser.extract_text_from_stream(ForwardOnlyStream(data), 'test_resume.pdf') == expected
+
+
+def repeated_pdf(path, copies):
+    """A PDF made of the pages of path repeated copies times"""
+    writer = PyPDF2.PdfWriter()
+    for _ in range(copies):
+        for page in PyPDF2.PdfReader(path).pages:
+            writer.add_page(page)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def test_parallel_pdf_extraction_matches_serial_and_caps_pages():
+    """Worker processes give the same text as in-process extraction, up to the page cap"""
+    data = repeated_pdf('test_resume.pdf', 6)
+    serial = ResumeParser().extract_text_from_stream(data, 'long.pdf')
+    parallel_parser = ResumeParser(page_workers=2)
+    try:
+        assert parallel_parser.extract_text_from_stream(data, 'long.pdf') == serial
+    finally:
+        parallel_parser.close()
+
+    page_count = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+    one_copy = ResumeParser().extract_text('test_resume.pdf')
+    capped = ResumeParser(max_pdf_pages=page_count // 6).extract_text_from_stream(data, 'long.pdf')
+    assert capped == one_copy
+
+
+def test_page_timeout_returns_empty_pages():
+    """Pages not extracted in time are left empty and counted instead of failing the upload"""
+    data = repeated_pdf('test_resume.pdf', 4)
+    page_count = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+    parser = ResumeParser(page_workers=2, page_timeout=0.000001)
+    before = PDF_PAGES_TIMED_OUT.value()
+    try:
+        text = parser.extract_text_from_stream(data, 'long.pdf')
+        assert text.strip() == ''
+        assert PDF_PAGES_TIMED_OUT.value() - before == page_count
+    finally:
+        parser.close()
+
+
+def test_concurrent_extractions_share_the_pool_through_timeouts():
+    """Threads extracting at once with a tight page timeout all get full-length results and no errors"""
+    data = repeated_pdf('test_resume.pdf', 40)
+    page_count = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+    parser = ResumeParser(page_workers=2, max_pdf_pages=None, page_timeout=0.02)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            texts = list(threads.map(lambda _: parser.extract_text_from_stream(data, 'long.pdf'), range(8)))
+        assert all(text.count('\n') >= page_count for text in texts)
+    finally:
+        parser.close()
+    assert parser._page_pool is None and not parser._pool_users
+
+
+class FakePool:
+    def __init__(self, processes):
+        self.terminated = False
+
+    def terminate(self):
+        self.terminated = True
+
+
+class InlineThread:
+    def __init__(self, target, daemon):
+        self.start = target
+
+
+def test_stuck_pool_is_replaced_but_stopped_only_after_its_last_user(monkeypatch):
+    """One call's timeout retires the pool for later calls without killing it under calls still using it"""
+    monkeypatch.setattr(resume_parser.multiprocessing, 'Pool', FakePool)
+    monkeypatch.setattr(resume_parser.threading, 'Thread', InlineThread)
+    parser = ResumeParser(page_workers=2)
+    first, second = parser._acquire_page_pool(), parser._acquire_page_pool()
+    assert first is second
+
+    parser._release_page_pool(first, stuck=True)
+    replacement = parser._acquire_page_pool()
+    assert replacement is not first and not first.terminated
+
+    parser._release_page_pool(second, stuck=False)
+    assert first.terminated and not replacement.terminated
+    parser._release_page_pool(replacement, stuck=False)
+    assert not replacement.terminated
+    parser.close()
+    assert replacement.terminated
+
+
+def test_featurize_batch_counts_vocabulary_and_summary_features():
+    """One row per text, with skill tokens, bigrams and summary counts in fixed columns"""
+    texts = ["Led a team of 5. Built a REST API in C++ and Node.js; CI/CD cut costs 40%", ""]
+    matrix = ResumeParser().featurize_batch(texts)
+    row = dict(zip(FEATURE_NAMES, matrix[0]))
+    assert matrix.shape == (2, len(FEATURE_NAMES))
+    assert {name for name, value in row.items() if name.startswith('skill:') and value} == {
+        'skill:rest api', 'skill:c++', 'skill:node.js', 'skill:ci/cd'
+    }
+    assert (row['skill_count'], row['action_verb_count']) == (4, 2)
+    assert (row['number_count'], row['percent_count'], row['word_count']) == (2, 1, 17)
+    assert not matrix[1].any()
+    assert matrix[:, FEATURE_INDEX['has_email']].tolist() == [0, 0]
@@ -0,0 +1,116 @@
+"""Offline tests for the production server setup"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import requests
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+import serve
+from job_queue import SQLiteJobStore
+from metrics import METRICS
+from result_cache import ResultCache
+from resume_index import ResumeIndex
+from stub_openai_server import StubOpenAIServer
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_server_options_from_environment(monkeypatch):
+    """SERVE_* variables configure gunicorn unless overridden on the command line"""
+    monkeypatch.setenv('SERVE_WORKERS', '3')
+    monkeypatch.setenv('SERVE_THREADS', '2')
+    monkeypatch.setenv('PORT', '8123')
+    monkeypatch.delenv('SERVE_BIND', raising=False)
+    args = argparse.Namespace(workers=None, threads=4, bind=None, timeout=None)
+    options = serve.server_options(args)
+    assert (options['workers'], options['threads'], options['bind']) == (3, 4, '0.0.0.0:8123')
+    assert options['preload_app'] and options['worker_class'] == 'gthread'
+    assert options['timeout'] == serve.DEFAULT_TIMEOUT
+
+
+def test_warm_up_leaves_no_metrics_behind():
+    """Warming up before fork exercises the pipeline without counting as traffic"""
+    serve.warm_up(app_module)
+    assert 'resume_analyzer_stage_seconds_count' not in METRICS.render()
+
+
+def test_post_fork_reconnects_sqlite(monkeypatch, tmp_path):
+    """Workers get their own SQLite connections to the shared files"""
+    cache = ResultCache(db_path=str(tmp_path / 'cache.db'))
+    index = ResumeIndex(str(tmp_path / 'index.db'))
+    cache.set('key', {'v': 1})
+    index.add('a', 'a.pdf', {'skills': ['Python']})
+    inherited = (cache._db, index._db)
+    monkeypatch.setattr(app_module, 'result_cache', cache)
+    monkeypatch.setattr(app_module, 'resume_index', index)
+
+    serve.post_fork(server=None, worker=None)
+    assert (cache._db, index._db) != inherited
+    cache._entries.clear()
+    assert cache.get('key') == {'v': 1}
+    assert index.search(skills='python')[0]['id'] == 'a'
+
+
+def test_child_exit_fails_only_the_exited_workers_jobs(monkeypatch, tmp_path):
+    """The master marks the jobs of a worker that exited as interrupted and leaves other workers' jobs alone"""
+    monkeypatch.setenv('JOB_DB', str(tmp_path / 'jobs.db'))
+    store = SQLiteJobStore(str(tmp_path / 'jobs.db'))
+    store.create({'id': 'job', 'status': 'running', 'created_at': 0})
+
+    serve.child_exit(server=None, worker=SimpleNamespace(pid=os.getpid() + 1))
+    assert store.get('job')['status'] == 'running'
+    serve.child_exit(server=None, worker=SimpleNamespace(pid=os.getpid()))
+    assert store.get('job')['status'] == 'failed'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_jobs_can_be_polled_on_any_worker(tmp_path):
+    """With several workers, a job queued on one worker is visible to all of them until it completes"""
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    with StubOpenAIServer(latency=0.3) as llm:
+        env = dict(os.environ, OPENAI_API_KEY='test-key', OPENAI_BASE_URL=llm.base_url,
+                   SERVE_WORKERS='4', SERVE_BIND=f'127.0.0.1:{port}')
+        env.pop('JOB_DB', None)
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'serve.py')], cwd=tmp_path, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + 30
+            while True:
+                try:
+                    requests.get(f'{base}/api/health', timeout=1)
+                    break
+                except requests.ConnectionError:
+                    assert time.time() < deadline, 'serve.py did not start'
+                    time.sleep(0.2)
+
+            with open(os.path.join(ROOT, 'test_resume.pdf'), 'rb') as f:
+                response = requests.post(f'{base}/api/jobs', files={'resume': ('test_resume.pdf', f)})
+            assert response.status_code == 202
+            status_url = base + response.json()['status_url']
+
+            # A new connection per poll, so polls are spread over the workers
+            statuses = []
+            while not statuses or statuses[-1] not in ('completed', 'failed'):
+                assert len(statuses) < 200, 'job did not finish'
+                poll = requests.get(status_url, headers={'Connection': 'close'})
+                assert poll.status_code == 200
+                statuses.append(poll.json()['status'])
+                time.sleep(0.02)
+        finally:
+            server.terminate()
+            server.wait(10)
+    assert statuses[-1] == 'completed'
+    assert os.path.exists(tmp_path / 'jobs.db')
@@ -0,0 +1,39 @@
+"""Offline tests for the app's cold start: heavy dependencies load on first use"""
+import json
+import os
+import subprocess
+import sys
+
+import app as app_module
+
+LAZY_MODULES = ('openai', 'httpx', 'PyPDF2', 'docx', 'numpy')
+
+
+def run_fresh(code: str):
+    """Run code in a new interpreter and return what it prints as JSON"""
+    env = dict(os.environ, OPENAI_API_KEY='test-key')
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                     env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_app_defers_heavy_dependencies():
+    """Importing the app and serving a health check loads no SDK or document libraries"""
+    result = run_fresh(f"""
+import json, sys
+import app
+status = app.create_app().test_client().get('/api/health').status_code
+print(json.dumps({{'status': status, 'analyzer': app.ai_analyzer is not None,
+                  'loaded': [name for name in {LAZY_MODULES!r} if name in sys.modules]}}))
+""")
+    assert result == {'status': 200, 'analyzer': False, 'loaded': []}
+
+
+def test_create_app_builds_independent_apps_on_shared_services():
+    """Every factory call returns a new Flask app with all routes registered"""
+    first, second = app_module.create_app(), app_module.create_app()
+    assert first is not second
+    rules = {rule.rule for rule in first.url_map.iter_rules()}
+    assert {'/api/health', '/api/analyze', '/api/search'} <= rules
+    assert app_module.get_result_cache() is app_module.get_result_cache()
+    assert second.test_client().get('/api/metrics').status_code == 200
@@ -0,0 +1,42 @@
+"""Offline tests for in-memory static asset serving"""
+import gzip
+import os
+import re
+
+os.environ.setdefault('OPENAI_API_KEY', 'test-key')
+
+import app as app_module
+from static_assets import IMMUTABLE_CACHE_CONTROL
+
+client = app_module.app.test_client()
+
+
+def test_index_links_fingerprinted_assets():
+    """The page is revalidated by ETag and points at content-hashed CSS and JS"""
+    response = client.get('/')
+    assert response.status_code == 200 and response.headers['Cache-Control'] == 'no-cache'
+    html = response.get_data(as_text=True)
+    assert re.search(r'href="static/style\.[0-9a-f]{10}\.css"', html)
+    assert re.search(r'src="static/script\.[0-9a-f]{10}\.js"', html)
+    assert client.get('/', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def test_fingerprinted_asset_is_immutable_and_compressed():
+    """Fingerprinted files are cached for good and served gzip-encoded when accepted"""
+    url = '/' + re.search(r'static/style\.\w+\.css', client.get('/').get_data(as_text=True)).group(0)
+    plain = client.get(url)
+    compressed = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert plain.headers['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': compressed.headers['ETag']}).status_code == 304
+
+
+def test_only_static_files_are_served():
+    """Source files and secrets in the project root are not reachable"""
+    assert client.get('/static/script.js').status_code == 200
+    assert client.get('/favicon.ico').status_code == 200
+    for path in ('/app.py', '/.env', '/requirements.txt', '/static/../app.py'):
+        assert client.get(path).status_code == 404